@@ -0,0 +1,118 @@
+# app/benchmarks/login.py
+"""Rendimiento de la verificación de claves del login, sin base de datos ni HTTP.
+
+Compara bcrypt ejecutado dentro del event loop (como antes) con el pool de
+``PasswordHasher``: inicios de sesión por segundo, por núcleo usado y el mayor
+retraso que sufre el event loop mientras tanto.
+
+Uso:
+    python -m app.benchmarks.login [--logins 64] [--concurrencia 16] [--workers 2] [--rounds 12]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+from passlib.context import CryptContext
+from app.services.password_service import PasswordHasher, PasswordPoolSaturated
+
+CLAVE = 'Secreto123!'
+
+class LoopLagProbe:
+    """Mide cuánto se atrasa un temporizador de 10 ms del event loop."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.maximo = 0.0
+        self._inicio = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            self._inicio = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self._record()
+
+    def _record(self) -> None:
+        self.maximo = max(self.maximo, time.perf_counter() - self._inicio - self.interval)
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        # El último temporizador puede estar atrasado sin haberse ejecutado todavía
+        self._record()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+async def _burst(verify, logins: int, concurrencia: int) -> Dict:
+    semaforo = asyncio.Semaphore(concurrencia)
+    rechazadas = 0
+
+    async def one() -> None:
+        nonlocal rechazadas
+        async with semaforo:
+            try:
+                await verify()
+            except PasswordPoolSaturated:
+                rechazadas += 1
+
+    probe = LoopLagProbe()
+    probe.start()
+    await asyncio.sleep(0)
+    inicio = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(logins)])
+    elapsed = time.perf_counter() - inicio
+    await probe.stop()
+    return {
+        'segundos': elapsed,
+        'logins_s': (logins - rechazadas) / elapsed,
+        'lag_maximo_ms': probe.maximo * 1000,
+        'rechazadas': rechazadas,
+    }
+
+async def run_benchmark(logins: int, concurrencia: int, workers: int, rounds: int) -> List[Dict]:
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+    hashed = context.hash(CLAVE)
+    resultados = []
+
+    async def inline() -> None:
+        context.verify(CLAVE, hashed)
+
+    res = await _burst(inline, logins, concurrencia)
+    resultados.append({'modo': 'en el event loop', 'nucleos': 1, **res})
+
+    hasher = PasswordHasher(workers=workers, queue_size=max(concurrencia, 1))
+    try:
+        # Calentar el pool para no medir el arranque de los procesos
+        await asyncio.gather(*[hasher.verify(CLAVE, hashed) for _ in range(max(workers, 1))])
+        res = await _burst(lambda: hasher.verify(CLAVE, hashed), logins, concurrencia)
+    finally:
+        hasher.shutdown()
+    nucleos = min(max(workers, 1), os.cpu_count() or 1)
+    resultados.append({'modo': f'pool de {workers} procesos', 'nucleos': nucleos, **res})
+    return resultados
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.login", description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64, help="Verificaciones de clave a ejecutar")
+    parser.add_argument("--concurrencia", type=int, default=16, help="Inicios de sesión simultáneos")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Procesos del pool de bcrypt")
+    parser.add_argument("--rounds", type=int, default=12, help="Costo de bcrypt")
+    args = parser.parse_args(argv)
+
+    resultados = asyncio.run(run_benchmark(args.logins, args.concurrencia, args.workers, args.rounds))
+    print(f"{args.logins} logins, concurrencia {args.concurrencia}, bcrypt costo {args.rounds}, {os.cpu_count()} CPU")
+    for r in resultados:
+        print(
+            f"- {r['modo']}: {r['logins_s']:.1f} logins/s ({r['logins_s'] / r['nucleos']:.1f} por núcleo), "
+            f"lag máximo del loop {r['lag_maximo_ms']:.0f} ms, rechazadas {r['rechazadas']}"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# app/benchmarks/token_codec.py
+"""Operaciones por segundo de firma y verificación de JWT para cada backend y algoritmo.
+
+Compara también la llamada directa a cada librería con la clave sin preparar
+(como se hacía antes en cada petición) contra el codec con la clave preparada.
+Las claves RSA/EC son efímeras, generadas para la medición.
+
+Uso:
+    python -m app.benchmarks.token_codec [--n 2000] [--algoritmos HS512 RS256 ES256]
+"""
+import argparse
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import jwt as pyjwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwt as jose_jwt
+from app.services.token_codec import BACKENDS, build_codec
+
+# HS512 pide al menos 64 bytes de secreto
+SECRETO = 'clave-de-prueba-para-el-benchmark-de-tokens-' * 2
+
+def _keys(algorithm: str) -> Tuple[str, str]:
+    """Par (clave de firma, clave de verificación) en el formato que reciben ambas librerías."""
+    if algorithm.startswith('HS'):
+        return SECRETO, SECRETO
+    if algorithm.startswith('ES'):
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+def _ops_per_second(func: Callable[[], object], n: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(n):
+        func()
+    return n / (time.perf_counter() - inicio)
+
+def run_benchmark(n: int, algoritmos: List[str]) -> List[Dict]:
+    claims = {
+        'id': 1,
+        'username': '40000001',
+        'nombres': 'Nombre',
+        'iat': int(time.time()),
+        'exp': int(time.time()) + 3600,
+    }
+    directos = {
+        'jose': (jose_jwt.encode, lambda token, key, alg: jose_jwt.decode(token, key, algorithms=[alg])),
+        'pyjwt': (pyjwt.encode, lambda token, key, alg: pyjwt.decode(token, key, algorithms=[alg])),
+    }
+    resultados = []
+    for algorithm in algoritmos:
+        signing_key, verifying_key = _keys(algorithm)
+        for backend in BACKENDS:
+            codec = build_codec(backend, algorithm, secret_key=SECRETO, private_key=signing_key, public_key=verifying_key)
+            token = codec.encode(claims)
+            encode, decode = directos[backend]
+            resultados.append({
+                'algoritmo': algorithm,
+                'backend': backend,
+                'encode_directo': _ops_per_second(lambda: encode(claims, signing_key, algorithm=algorithm), n),
+                'encode_codec': _ops_per_second(lambda: codec.encode(claims), n),
+                'decode_directo': _ops_per_second(lambda: decode(token, verifying_key, algorithm), n),
+                'decode_codec': _ops_per_second(lambda: codec.decode(token), n),
+            })
+    return resultados
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.benchmarks.token_codec", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("--n", type=int, default=2000, help="Operaciones por medición")
+    parser.add_argument(
+        "--algoritmos", nargs="+", default=['HS512', 'RS256', 'ES256'], help="Algoritmos a medir"
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{args.n} operaciones por medición (ops/s; directo = clave sin preparar en cada llamada)")
+    print(f"{'algoritmo':<10}{'backend':<8}{'encode directo':>16}{'encode codec':>14}{'decode directo':>16}{'decode codec':>14}")
+    for r in run_benchmark(args.n, args.algoritmos):
+        print(
+            f"{r['algoritmo']:<10}{r['backend']:<8}{r['encode_directo']:>16.0f}{r['encode_codec']:>14.0f}"
+            f"{r['decode_directo']:>16.0f}{r['decode_codec']:>14.0f}"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
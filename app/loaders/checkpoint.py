@@ -0,0 +1,55 @@
+# app/loaders/checkpoint.py
+import json
+import logging
+from datetime import datetime
+from typing import Dict
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.models.importacion import ImportacionArchivo
+
+logger = logging.getLogger('data_loader')
+
+class ImportCheckpoint:
+    """Punto de reanudación de la importación de un archivo.
+
+    Se guarda en el registro de ``griemvc_importacion`` del hash del archivo, en la
+    misma transacción que el lote confirmado, de modo que nunca indica filas que
+    no llegaron a la base.
+    """
+
+    def __init__(self, file_hash: str):
+        self.file_hash = file_hash
+
+    def restore(self, db: Session, stats: Dict) -> int:
+        """Carga en ``stats`` las estadísticas guardadas y retorna la última fila confirmada (0 si no hay)."""
+        row = db.execute(
+            select(ImportacionArchivo.i_num_ult_fila, ImportacionArchivo.v_des_checkpoint)
+            .where(ImportacionArchivo.v_hash_archivo == self.file_hash)
+        ).first()
+        if not row or not row.i_num_ult_fila:
+            return 0
+
+        guardadas = json.loads(row.v_des_checkpoint or '{}')
+        for key in ('procesados', 'actualizados', 'omitidos'):
+            stats[key] = guardadas.get(key, 0)
+        stats['errores'] = list(guardadas.get('errores', []))
+        logger.info(f"Reanudando la importación desde la fila {row.i_num_ult_fila + 1}")
+        return row.i_num_ult_fila
+
+    def save(self, db: Session, ultima_fila: int, stats: Dict) -> None:
+        """Registra el avance en la transacción en curso; se confirma con el lote."""
+        db.execute(
+            update(ImportacionArchivo)
+            .where(ImportacionArchivo.v_hash_archivo == self.file_hash)
+            .values(
+                i_num_ult_fila=ultima_fila,
+                v_des_checkpoint=json.dumps({
+                    'procesados': stats['procesados'],
+                    'actualizados': stats['actualizados'],
+                    'omitidos': stats['omitidos'],
+                    'errores': stats['errores'],
+                }, ensure_ascii=False),
+                t_fec_checkpoint=datetime.now()
+            )
+            .execution_options(synchronize_session=False)
+        )
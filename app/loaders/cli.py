@@ -0,0 +1,163 @@
+# app/loaders/cli.py
+"""Importación del Excel de RR. HH. desde la línea de comandos, sin pasar por la API.
+
+Uso:
+    python -m app.loaders.cli archivo.xlsx [otro.xlsx ...] [--workers 4] [--dry-run]
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import Dict, List, Optional
+from app.loaders.excel_reader import CHUNK_SIZE, count_excel_rows, excel_inputs
+from app.loaders.parallel import PARTITION_WORKERS
+from app.loaders.reconciliation import MODOS_RECONCILIACION
+
+class ProgressPrinter:
+    """Muestra en una sola línea de la terminal las filas leídas, la velocidad y el tiempo restante."""
+
+    def __init__(self, total_filas: Optional[int], stream=sys.stderr):
+        self.total_filas = total_filas
+        self.stream = stream
+        self.inicio = time.monotonic()
+
+    def __call__(self, stats: Dict, filas_leidas: int) -> None:
+        elapsed = time.monotonic() - self.inicio
+        rate = filas_leidas / elapsed if elapsed > 0 else 0.0
+        avance = f"{filas_leidas}"
+        eta = ""
+        if self.total_filas:
+            avance += f"/{self.total_filas} ({min(filas_leidas / self.total_filas, 1):.0%})"
+            if rate:
+                eta = f" - ETA {max(self.total_filas - filas_leidas, 0) / rate:.0f}s"
+        self.stream.write(
+            f"\rFilas {avance} - {rate:.0f} filas/s - procesados {stats['procesados']}, "
+            f"actualizados {stats['actualizados']}, omitidos {stats['omitidos']}, "
+            f"errores {len(stats['errores'])}{eta}   "
+        )
+        self.stream.flush()
+
+    def finish(self) -> None:
+        self.stream.write("\n")
+        self.stream.flush()
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.loaders.cli",
+        description="Importa uno o más archivos Excel de RR. HH. directamente en la base de datos."
+    )
+    parser.add_argument("archivos", nargs="+", help="Archivos .xlsx o .xls a importar")
+    parser.add_argument("--batch-size", type=int, help="Filas por lote confirmado (por defecto 1000)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Filas leídas por bloque")
+    parser.add_argument(
+        "--workers", type=int, default=PARTITION_WORKERS,
+        help="Procesos de carga en paralelo (particiones por documento)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Validar y contar sin escribir en la base")
+    parser.add_argument("--upsert", action="store_true", help="Actualizar las personas existentes que cambiaron")
+    parser.add_argument("--staging", action="store_true", help="Usar el motor de tabla de staging")
+    parser.add_argument("--todas-las-hojas", action="store_true", help="Importar todas las hojas de cada libro")
+    parser.add_argument(
+        "--reconciliar", choices=MODOS_RECONCILIACION,
+        help="Tratar los archivos como el extracto completo: contar (preview) o desactivar (aplicar) "
+             "los trabajadores activos que no figuran"
+    )
+    parser.add_argument("--json", action="store_true", help="Imprimir las estadísticas finales como JSON")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar el log detallado del cargador")
+    return parser
+
+def _count_rows(entradas: List[Dict]) -> Optional[int]:
+    try:
+        conteos = [count_excel_rows(entrada['ruta'], entrada['hoja']) for entrada in entradas]
+    except Exception:
+        return None
+    return None if any(conteo is None for conteo in conteos) else sum(conteos)
+
+def print_summary(stats: Dict, dry_run: bool, stream=sys.stdout) -> None:
+    titulo = "Simulación de importación" if dry_run else "Importación finalizada"
+    lineas = [
+        f"{titulo}:",
+        f"- {'A insertar' if dry_run else 'Procesados'}: {stats['procesados']}",
+        f"- {'A actualizar' if dry_run else 'Actualizados'}: {stats['actualizados']}",
+        f"- Omitidos: {stats['omitidos']}",
+        f"- Errores: {len(stats['errores'])}",
+    ]
+    for sub in stats.get('archivos', []):
+        hoja = f" [{sub['hoja']}]" if sub['hoja'] else ""
+        lineas.append(
+            f"  {sub['nombre']}{hoja}: {sub['filas']} filas, procesados {sub['procesados']}, "
+            f"actualizados {sub['actualizados']}, omitidos {sub['omitidos']}, errores {len(sub['errores'])}"
+        )
+    if stats.get('error_fatal'):
+        lineas.append(f"- Importación interrumpida: {stats['error_fatal']}")
+    lineas.extend(f"  {error}" for error in stats['errores'][:10])
+    if len(stats['errores']) > 10:
+        lineas.append(f"  ...y {len(stats['errores']) - 10} errores más")
+    reconciliacion = stats.get('reconciliacion')
+    if reconciliacion:
+        lineas.append(
+            f"- Reconciliación: {reconciliacion['a_desactivar']} de {reconciliacion['activos']} "
+            f"trabajadores activos no figuran en el extracto, desactivados {reconciliacion['desactivados']}"
+        )
+        if reconciliacion['ejemplos']:
+            lineas.append(f"  Documentos: {', '.join(reconciliacion['ejemplos'])}")
+        if reconciliacion['motivo']:
+            lineas.append(f"  No aplicada: {reconciliacion['motivo']}")
+    perfil = stats.get('perfil')
+    if perfil:
+        lineas.append(f"- Duración: {perfil['duracion_segundos']}s ({perfil['filas_por_segundo']} filas/s)")
+    stream.write("\n".join(lineas) + "\n")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ejecuta la importación. Retorna 0 si no hubo errores y 1 en caso contrario."""
+    args = build_parser().parse_args(argv)
+    # Importar el cargador solo al ejecutar: crea el engine de la base de datos
+    from app.loaders.load_data import BATCH_SIZE, process_excel, process_excel_batch
+
+    batch_size = args.batch_size or BATCH_SIZE
+    if not args.verbose:
+        # El log detallado se mezclaría con la línea de progreso
+        logging.getLogger('data_loader').setLevel(logging.WARNING)
+
+    entradas = excel_inputs(args.archivos, todas_las_hojas=args.todas_las_hojas)
+    progress = ProgressPrinter(_count_rows(entradas))
+    try:
+        if len(entradas) == 1 and not args.todas_las_hojas:
+            stats = process_excel(
+                args.archivos[0],
+                batch_size=batch_size,
+                chunk_size=args.chunk_size,
+                progress_callback=progress,
+                upsert=args.upsert,
+                staging=args.staging,
+                workers=args.workers,
+                dry_run=args.dry_run,
+                reconcile=args.reconciliar
+            )
+        else:
+            if args.staging:
+                logging.getLogger('data_loader').warning(
+                    "El motor de staging no admite varias entradas; se usará la carga por lotes"
+                )
+            stats = process_excel_batch(
+                entradas,
+                batch_size=batch_size,
+                chunk_size=args.chunk_size,
+                progress_callback=progress,
+                upsert=args.upsert,
+                workers=args.workers,
+                dry_run=args.dry_run,
+                reconcile=args.reconciliar
+            )
+    finally:
+        progress.finish()
+
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False, indent=2, default=str))
+    else:
+        print_summary(stats, args.dry_run)
+    return 1 if stats['errores'] or stats.get('error_fatal') else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
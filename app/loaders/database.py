@@ -1,36 +1,33 @@
 # app/loaders/database.py
-from typing import Generator
-from sqlalchemy.orm import Session
+from typing import AsyncGenerator, Generator, Optional
 from app.models.base import Base
-from sqlalchemy import create_engine, URL
+from app.loaders.engine_factory import create_app_async_engine, create_app_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-# Crear el objeto URL para SQL Server
-url_object = URL.create(
-    "mssql+pyodbc",  # dialecto
-    host="DESKTOP-7AMS20K",  # tu servidor
-    database="GRiesgosDB",   # tu base de datos
-    query={  # parámetros adicionales
-        "driver": "ODBC Driver 17 for SQL Server",
-        "TrustedConnection": "yes",
-    },
-)
-
-# Crear el engine usando el objeto URL
-engine = create_engine(
-    url_object,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_pre_ping=True
-)
+
+# Engine según DATABASE_URL (SQL Server local por defecto) y el pool configurado en el entorno
+engine = create_app_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
 
+# Engine asíncrono de las rutas de la API. Se crea al primer uso: el CLI y los
+# cargadores importan este módulo sin necesitar el driver asíncrono instalado.
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_app_async_engine()
+    return _async_engine
+
+def AsyncSessionLocal() -> AsyncSession:
+    # Sin expirar al confirmar: los objetos se serializan después del commit sin volver a consultar
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(get_async_engine(), autoflush=True, expire_on_commit=False)
+    return _async_session_factory()
+
 def get_db() -> Generator:
     db = SessionLocal()
     try:
@@ -38,6 +35,10 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def init_db():
     #Base.metadata.drop_all(bind=engine) # Eliminar tablas
-    Base.metadata.create_all(bind=engine, checkfirst=True) # Crear tablas nuevamente
\ No newline at end of file
+    Base.metadata.create_all(bind=engine, checkfirst=True) # Crear tablas nuevamente
@@ -0,0 +1,142 @@
+# app/loaders/engine_factory.py
+import os
+import sqlite3
+import weakref
+from typing import Dict, Optional, Union
+from sqlalchemy import URL, create_engine, event, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool, QueuePool
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Servidor por defecto si no se define DATABASE_URL
+DEFAULT_URL = URL.create(
+    "mssql+pyodbc",
+    host="DESKTOP-7AMS20K",
+    database="GRiesgosDB",
+    query={
+        "driver": "ODBC Driver 17 for SQL Server",
+        "TrustedConnection": "yes",
+    },
+)
+
+# Driver asíncrono equivalente a cada dialecto
+ASYNC_DRIVERS = {
+    'mssql': 'mssql+aioodbc',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+}
+# Base en memoria compartida por todas las conexiones del proceso
+SQLITE_MEMORY_DATABASE = 'file:griesgos'
+SQLITE_MEMORY_QUERY = {'mode': 'memory', 'cache': 'shared', 'uri': 'true'}
+
+# Conexiones que mantienen viva la base en memoria aunque el pool cierre las suyas
+_memory_anchors: Dict[str, sqlite3.Connection] = {}
+# Sentencia BEGIN de cada engine SQLite; se cambia con set_sqlite_begin
+_sqlite_begin: "weakref.WeakKeyDictionary[Engine, str]" = weakref.WeakKeyDictionary()
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.getenv(name, '1' if default else '0') == '1'
+
+def database_url() -> URL:
+    """URL de la base según ``DATABASE_URL``; ``sqlite://`` usa una base en memoria compartida."""
+    raw = os.getenv('DATABASE_URL')
+    url = make_url(raw) if raw else DEFAULT_URL
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        url = url.set(database=SQLITE_MEMORY_DATABASE, query={**url.query, **SQLITE_MEMORY_QUERY})
+    return url
+
+def async_database_url(url: Optional[URL] = None) -> URL:
+    """URL para el engine asíncrono: ``ASYNC_DATABASE_URL`` o la misma base con el driver asíncrono."""
+    raw = os.getenv('ASYNC_DATABASE_URL')
+    if raw:
+        return make_url(raw)
+    url = url or database_url()
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name())
+    if drivername is None:
+        raise ValueError(f"No hay driver asíncrono conocido para {url.drivername}; defina ASYNC_DATABASE_URL")
+    return url.set(drivername=drivername)
+
+def engine_options(url: URL) -> Dict:
+    """Opciones del engine según el dialecto: pool desde el entorno y la vía rápida de inserción masiva."""
+    options = {
+        'pool_pre_ping': _env_flag('DB_POOL_PRE_PING', True),
+        'echo': _env_flag('DB_ECHO', False),
+    }
+    if url.get_backend_name() == 'sqlite':
+        # SQLite elige su propio pool; el timeout espera los bloqueos de otros escritores
+        options['connect_args'] = {'timeout': _env_int('DB_POOL_TIMEOUT', 30)}
+        if url.get_driver_name() == 'aiosqlite':
+            # Cada conexión de aiosqlite tiene su propio hilo, que solo termina al cerrarla
+            options['poolclass'] = NullPool
+        else:
+            options['connect_args']['check_same_thread'] = False
+            if url.query.get('mode') == 'memory':
+                # Conexiones compartidas entre hilos, igual que con una base en archivo
+                options['poolclass'] = QueuePool
+    else:
+        options.update(
+            pool_size=_env_int('DB_POOL_SIZE', 5),
+            max_overflow=_env_int('DB_MAX_OVERFLOW', 10),
+            pool_timeout=_env_int('DB_POOL_TIMEOUT', 30),
+            pool_recycle=_env_int('DB_POOL_RECYCLE', -1),
+        )
+
+    if url.get_backend_name() == 'mssql' and url.get_driver_name() in ('pyodbc', 'aioodbc'):
+        # executemany en un solo viaje con los arreglos de parámetros de ODBC
+        options['fast_executemany'] = _env_flag('DB_FAST_EXECUTEMANY', True)
+    else:
+        # INSERT ... VALUES de varias filas (con RETURNING) en lugar de una sentencia por fila
+        options['use_insertmanyvalues'] = True
+        options['insertmanyvalues_page_size'] = _env_int('DB_INSERTMANYVALUES_PAGE_SIZE', 1000)
+    return options
+
+def _enable_sqlite_savepoints(engine: Engine) -> None:
+    # pysqlite abre y cierra transacciones por su cuenta, lo que rompe SAVEPOINT
+    # (begin_nested); se desactiva y SQLAlchemy emite BEGIN al iniciar cada transacción.
+    # DB_SQLITE_BEGIN=IMMEDIATE toma el bloqueo de escritura al inicio, útil con varios procesos.
+    _sqlite_begin[engine] = f"BEGIN {os.getenv('DB_SQLITE_BEGIN', '')}".strip()
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql(_sqlite_begin.get(conn.engine, "BEGIN"))
+
+def set_sqlite_begin(engine: Engine, statement: str) -> Optional[str]:
+    """Cambia la sentencia BEGIN de un engine SQLite y retorna la anterior (None si no es SQLite)."""
+    if engine not in _sqlite_begin:
+        return None
+    previous, _sqlite_begin[engine] = _sqlite_begin[engine], statement
+    return previous
+
+def is_sqlite_memory(engine: Engine) -> bool:
+    return engine.url.get_backend_name() == 'sqlite' and engine.url.query.get('mode') == 'memory'
+
+def create_app_engine(url: Union[URL, str, None] = None) -> Engine:
+    """Crea el engine síncrono configurado desde el entorno."""
+    url = make_url(url) if url is not None else database_url()
+    engine = create_engine(url, **engine_options(url))
+    if url.get_backend_name() == 'sqlite':
+        _enable_sqlite_savepoints(engine)
+        if url.query.get('mode') == 'memory' and url.database not in _memory_anchors:
+            _memory_anchors[url.database] = sqlite3.connect(
+                f"{url.database}?mode=memory&cache={url.query.get('cache', 'shared')}", uri=True
+            )
+    return engine
+
+def create_app_async_engine(url: Union[URL, str, None] = None) -> AsyncEngine:
+    """Crea el engine asíncrono de la API, por defecto sobre la misma base que el síncrono."""
+    url = make_url(url) if url is not None else async_database_url()
+    engine = create_async_engine(url, **engine_options(url))
+    if url.get_backend_name() == 'sqlite':
+        _enable_sqlite_savepoints(engine.sync_engine)
+    return engine
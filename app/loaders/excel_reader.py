@@ -0,0 +1,216 @@
+# app/loaders/excel_reader.py
+import multiprocessing
+import os
+import queue
+from typing import Dict, Iterator, List, Optional
+import pandas as pd
+from openpyxl import load_workbook
+
+# Filas por bloque entregado al cargador
+CHUNK_SIZE = 5000
+# Procesos que leen hojas o archivos a la vez en las importaciones de varias entradas
+PARSE_WORKERS = int(os.getenv('IMPORT_PARSE_WORKERS', str(min(4, os.cpu_count() or 1))))
+# Bloques que cada proceso de lectura puede tener listos por delante de la carga
+STREAM_QUEUE_CHUNKS = int(os.getenv('IMPORT_STREAM_QUEUE_CHUNKS', '2'))
+
+class MissingColumnsError(ValueError):
+    """Error lanzado cuando la hoja no contiene todas las columnas requeridas."""
+    def __init__(self, missing: List[str]):
+        self.missing = missing
+        super().__init__(f"Columnas faltantes: {', '.join(missing)}")
+
+    def __reduce__(self):
+        # Conservar las columnas al enviar el error entre procesos
+        return (MissingColumnsError, (self.missing,))
+
+class ExcelReadError(Exception):
+    """Error al leer una hoja en el proceso de ``ExcelChunkStream``."""
+
+def _cell_value(value):
+    # Igual que pandas: los números enteros guardados como float se devuelven como int
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and not value.strip():
+        return None
+    return value
+
+def _to_frame(rows: List[list], index: List[int], columns: List[str]) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=columns, index=pd.Index(index), dtype=object)
+
+def _iter_xls_chunks(
+    file_path: str,
+    columns: List[str],
+    chunk_size: int,
+    sheet_name: Optional[str]
+) -> Iterator[pd.DataFrame]:
+    # openpyxl no soporta el formato .xls; se lee solo con las columnas requeridas
+    df = pd.read_excel(
+        file_path,
+        sheet_name=sheet_name or 0,
+        usecols=lambda col: col in columns,
+        dtype=object
+    )
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise MissingColumnsError(missing)
+    df = df[columns]
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+def list_sheets(file_path: str) -> List[str]:
+    """Retorna los nombres de las hojas del libro, en orden."""
+    if file_path.lower().endswith('.xls'):
+        with pd.ExcelFile(file_path) as book:
+            return [str(name) for name in book.sheet_names]
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+def count_excel_rows(file_path: str, sheet_name: Optional[str] = None) -> Optional[int]:
+    """Retorna la cantidad aproximada de filas de datos según la dimensión de la hoja."""
+    if file_path.lower().endswith('.xls'):
+        return None
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        return max(sheet.max_row - 1, 0) if sheet.max_row else None
+    finally:
+        workbook.close()
+
+def iter_excel_chunks(
+    file_path: str,
+    columns: List[str],
+    chunk_size: int = CHUNK_SIZE,
+    sheet_name: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """Lee el Excel en modo streaming y entrega bloques con solo las columnas indicadas.
+
+    El índice de cada bloque es la posición de la fila de datos dentro de la hoja
+    (0 = primera fila bajo la cabecera), igual que con ``pd.read_excel``.
+    """
+    if file_path.lower().endswith('.xls'):
+        yield from _iter_xls_chunks(file_path, columns, chunk_size, sheet_name)
+        return
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+
+        header = next(rows, None) or ()
+        positions = {}
+        for position, name in enumerate(header):
+            if name is not None:
+                positions.setdefault(str(name), position)
+
+        missing = [col for col in columns if col not in positions]
+        if missing:
+            raise MissingColumnsError(missing)
+        selected = [positions[col] for col in columns]
+
+        buffer, index = [], []
+        for row_number, row in enumerate(rows):
+            values = [_cell_value(row[pos]) if pos < len(row) else None for pos in selected]
+            # Omitir filas completamente vacías (p. ej. el rango con formato al final)
+            if all(value is None for value in values):
+                continue
+
+            buffer.append(values)
+            index.append(row_number)
+            if len(buffer) >= chunk_size:
+                yield _to_frame(buffer, index, columns)
+                buffer, index = [], []
+
+        if buffer:
+            yield _to_frame(buffer, index, columns)
+    finally:
+        workbook.close()
+
+def _stream_chunks(
+    chunk_queue,
+    file_path: str,
+    columns: List[str],
+    chunk_size: int,
+    sheet_name: Optional[str]
+) -> None:
+    # Se ejecuta en el proceso de lectura: cada put espera mientras la cola esté llena
+    try:
+        for df in iter_excel_chunks(file_path, columns, chunk_size, sheet_name):
+            chunk_queue.put(('bloque', df))
+        chunk_queue.put(('fin', None))
+    except MissingColumnsError as e:
+        chunk_queue.put(('error', e))
+    except Exception as e:
+        # Solo el mensaje: la excepción original puede no poder enviarse entre procesos
+        chunk_queue.put(('error', ExcelReadError(str(e))))
+
+class ExcelChunkStream:
+    """Lee una hoja en otro proceso y entrega sus bloques a medida que se parsean.
+
+    La cola admite ``max_chunks`` bloques: si la carga va más lenta que la lectura,
+    el proceso espera en lugar de acumular la hoja completa en memoria.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        columns: List[str],
+        chunk_size: int = CHUNK_SIZE,
+        sheet_name: Optional[str] = None,
+        max_chunks: int = STREAM_QUEUE_CHUNKS
+    ):
+        context = multiprocessing.get_context()
+        self._queue = context.Queue(maxsize=max(1, max_chunks))
+        self._process = context.Process(
+            target=_stream_chunks,
+            args=(self._queue, file_path, columns, chunk_size, sheet_name),
+            daemon=True
+        )
+
+    def start(self) -> 'ExcelChunkStream':
+        self._process.start()
+        return self
+
+    def _get(self):
+        while True:
+            try:
+                return self._queue.get(timeout=1)
+            except queue.Empty:
+                if self._process.is_alive():
+                    continue
+                # El proceso pudo terminar justo después de dejar su último mensaje
+                try:
+                    return self._queue.get(timeout=1)
+                except queue.Empty:
+                    raise ExcelReadError("El proceso de lectura terminó sin entregar la hoja completa")
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        while True:
+            tipo, valor = self._get()
+            if tipo == 'fin':
+                return
+            if tipo == 'error':
+                raise valor
+            yield valor
+
+    def close(self) -> None:
+        """Detiene la lectura si la hoja no se consumió completa."""
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process.join()
+        self._queue.close()
+
+def excel_inputs(
+    file_paths: List[str],
+    nombres: Optional[List[str]] = None,
+    todas_las_hojas: bool = False
+) -> List[Dict]:
+    """Arma las entradas de ``load_data.process_excel_batch``: la primera hoja de cada archivo o todas sus hojas."""
+    nombres = nombres or [os.path.basename(file_path) for file_path in file_paths]
+    entradas = []
+    for file_path, nombre in zip(file_paths, nombres):
+        hojas = list_sheets(file_path) if todas_las_hojas else [None]
+        entradas.extend({'ruta': file_path, 'hoja': hoja, 'nombre': nombre} for hoja in hojas)
+    return entradas
@@ -1,14 +1,30 @@
 # app/loaders/load_data.py
 import socket
 import os
+import itertools
+from collections import deque
+import numpy as np
 import pandas as pd
 import logging
 from datetime import datetime
-from typing import Dict
-from app.models.estructura_org import Unidad, Area, Puesto, Categoria
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import select, insert, update, and_
 from app.models.persona import Persona
 from app.models.persona_trabajador import PersonaTrabajador
+from app.loaders.checkpoint import ImportCheckpoint
 from app.loaders.database import SessionLocal
+from app.loaders.excel_reader import (
+    iter_excel_chunks, ExcelChunkStream, ExcelReadError, MissingColumnsError, CHUNK_SIZE, PARSE_WORKERS
+)
+from app.loaders.logging_config import configure_logging, loader_logging
+from app.loaders.master_data import master_data_cache, normalize_names
+from app.loaders.parallel import PartitionedLoader, PARTITION_WORKERS, new_stats, merge_stats, supported_workers
+from app.loaders.profiling import ImportProfiler, profile_phase, write_profile
+from app.loaders.reconciliation import RECONCILIAR_APLICAR, reconcile_snapshot
+from app.loaders.staging import StagingImport
+from app.loaders.validation import (
+    check_null_values, validate_rows, register_rejects, map_master_data, to_records
+)
 
 def get_import_audit_data() -> dict:
     """Retorna los datos de auditoría para el proceso de importación."""
@@ -24,269 +40,873 @@ def get_import_audit_data() -> dict:
         'v_ip_mod': None
     }
 
-def setup_logger():
-    # Crear la ruta absoluta para el directorio de logs
-    log_dir = os.path.join('C:\Griesgosapi\logs')
-    log_file = os.path.join(log_dir, 'data_loader.log')
-    
-    # Asegurar que el directorio existe
-    os.makedirs(log_dir, exist_ok=True)
-    
-    logger = logging.getLogger('data_loader')
-    logger.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    
-    handlers = [
-        logging.FileHandler('data_loader.log'),
-        logging.StreamHandler()
-    ]
-    
-    for handler in handlers:
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-    
-    return logger
-
-logger = setup_logger()
-
-def check_null_values(df: pd.DataFrame, required_cols: list) -> None:
-    """Verifica valores nulos en columnas requeridas y los registra en el log."""
-    for col in required_cols:
-        null_rows = df[df[col].isna()]
-        if not null_rows.empty:
-            logger.warning(f"Columna {col} tiene {len(null_rows)} valores nulos:")
-            for idx, row in null_rows.iterrows():
-                logger.warning(f"----------> ID Persona: {row.get('ID de persona', 'No ID')} en fila {idx + 1}")
-
-def get_or_create_master_data(db: SessionLocal, df: pd.DataFrame) -> Dict:
-    """Crea o recupera datos maestros (unidades, áreas, puestos, categorías)."""
-    master_data = {'unidad': {}, 'area': {}, 'puesto': {}, 'categoria': {}}
-    model_map = {
-        'unidad': (Unidad, 'Subdivisión de personal (Nombre de Subdivisión de personal)'),
-        'categoria': (Categoria, 'Área de personal (Picklist Label)'),
-        'puesto': (Puesto, 'Position Posición (Label)'),
-        'area': (Area, 'Position Centro de costo (Código de centro de costos)')
-    }
-    
-    audit_data = get_import_audit_data()
-    
-    # Primero procesamos las unidades
-    try:
-        unidad_model, unidad_column = model_map['unidad']
-        unique_unidades = df[unidad_column].dropna().unique()
-        
-        for value in unique_unidades:
-            name = str(value).strip()
-            if not name:
+logger = configure_logging()
+
+# Tamaño de lote para las inserciones masivas
+BATCH_SIZE = 1000
+# SQL Server admite como máximo 2100 parámetros por sentencia
+IN_CHUNK_SIZE = 1000
+
+PERSONA_COLUMNS = ['v_num_documento', 'v_des_nombres', 'v_des_apellidos', 'v_cod_empresa']
+TRABAJADOR_COLUMNS = ['i_cod_unidad', 'i_cod_categoria', 'i_cod_puesto', 'i_cod_area', 't_fec_ingreso']
+# Columnas que determinan si un trabajador existente cambió
+FINGERPRINT_COLUMNS = PERSONA_COLUMNS[1:] + TRABAJADOR_COLUMNS
+
+# Acción que corresponde a cada fila validada según lo que ya existe en la base
+ACCION_NUEVO = 'nuevo'
+ACCION_CAMBIO = 'cambio'
+ACCION_OMITIDO = 'omitido'
+
+def get_or_create_master_data(db: SessionLocal, df: pd.DataFrame, create: bool = True) -> Dict:
+    """Crea o recupera datos maestros (unidades, áreas, puestos, categorías).
+
+    Usa una consulta y una inserción masiva por tipo de dato, apoyadas en la caché
+    de proceso ``master_data_cache``. Con ``create=False`` solo los recupera.
+    """
+    return master_data_cache.resolve(db, df, get_import_audit_data(), create)
+
+def load_rows(db: SessionLocal, df: pd.DataFrame, master_data: Dict, audit_data: dict, stats: Dict) -> None:
+    """Carga las filas una por una, consultando y confirmando cada persona.
+
+    Cada fila se inserta en su propio SAVEPOINT, de modo que un error solo descarta
+    esa fila y no las pendientes de confirmar.
+    """
+    pendientes = []
+
+    def commit_pending():
+        try:
+            db.commit()
+            stats['procesados'] += len(pendientes)
+        except Exception as e:
+            db.rollback()
+            for fila in pendientes:
+                stats['errores'].append(f"Error en fila {fila}: {str(e)}")
+            logger.error(f"Error confirmando {len(pendientes)} registros: {str(e)}")
+        pendientes.clear()
+
+    # Procesar cada fila del Excel
+    for idx, row in df.iterrows():
+        savepoint = None
+        try:
+            # Validar documento
+            if pd.isna(row['Numero documento']):
+                raise ValueError("Número de documento es nulo")
+
+            documento = str(row['Numero documento']).strip()
+
+            # Verificar si la persona ya existe
+            existing_persona = db.query(Persona).filter(
+                Persona.v_num_documento == documento
+            ).first()
+
+            if existing_persona:
+                logger.warning("Personas que ya existen - Omitiendo", extra={'muestra': documento})
+                stats['omitidos'] += 1
                 continue
 
-            unidad = db.query(unidad_model).filter(unidad_model.v_des_nombre == name).first()
-            if not unidad:
-                unidad = unidad_model(
-                    v_des_nombre=name,
-                    **audit_data
+            savepoint = db.begin_nested()
+
+            # Crear nueva persona
+            new_persona = Persona(
+                v_num_documento=documento,
+                v_des_nombres=str(row['Nombres']).strip(),
+                v_des_apellidos=str(row['Primer apellido']).strip(),
+                v_cod_empresa=str(row['ID de persona']).zfill(8),
+                **audit_data
+            )
+
+            db.add(new_persona)
+            db.flush()
+
+            # Procesar fecha de ingreso
+            fecha_ingreso = None
+            if pd.notna(row['Fecha de ingreso']):
+                try:
+                    fecha_ingreso = pd.to_datetime(row['Fecha de ingreso'])
+                except Exception as e:
+                    logger.warning("Fechas de ingreso con error", extra={'muestra': f"{documento}: {str(e)}"})
+
+            # Crear registro de trabajador
+            new_trabajador = PersonaTrabajador(
+                i_cod_persona=new_persona.i_cod_persona,
+                i_cod_unidad=master_data['unidad'].get(
+                    str(row['Subdivisión de personal (Nombre de Subdivisión de personal)']).strip()
+                ),
+                i_cod_categoria=master_data['categoria'].get(
+                    str(row['Área de personal (Picklist Label)']).strip()
+                ),
+                i_cod_puesto=master_data['puesto'].get(
+                    str(row['Position Posición (Label)']).strip()
+                ),
+                i_cod_area=master_data['area'].get(
+                    str(row['Position Centro de costo (Código de centro de costos)']).strip()
+                ),
+                t_fec_ingreso=fecha_ingreso or datetime.now(),
+                **audit_data
+            )
+
+            db.add(new_trabajador)
+            savepoint.commit()
+            pendientes.append(idx + 1)
+
+            # Commit cada 100 registros
+            if len(pendientes) == 100:
+                commit_pending()
+                logger.info(f"Procesados {stats['procesados']} registros")
+
+        except Exception as e:
+            stats['errores'].append(f"Error en fila {idx + 1}: {str(e)}")
+            logger.error("Filas con error", extra={'muestra': f"fila {idx + 1}: {str(e)}"})
+            # Descartar solo los cambios de esta fila
+            if savepoint is not None and savepoint.is_active:
+                savepoint.rollback()
+            continue
+
+    if pendientes:
+        commit_pending()
+
+def fetch_existing_documents(db: SessionLocal, documentos: List[str], chunk_size: int = IN_CHUNK_SIZE) -> Set[str]:
+    """Obtiene los documentos ya registrados mediante consultas IN por bloques."""
+    existentes = set()
+    for start in range(0, len(documentos), chunk_size):
+        chunk = documentos[start:start + chunk_size]
+        existentes.update(
+            db.execute(
+                select(Persona.v_num_documento).where(Persona.v_num_documento.in_(chunk))
+            ).scalars()
+        )
+    return existentes
+
+def fetch_existing_workers(db: SessionLocal, documentos: List[str], chunk_size: int = IN_CHUNK_SIZE) -> Dict[str, tuple]:
+    """Obtiene, por documento, el código de persona, el del trabajador activo y su huella."""
+    existentes = {}
+    for start in range(0, len(documentos), chunk_size):
+        chunk = documentos[start:start + chunk_size]
+        rows = db.execute(
+            select(
+                Persona.v_num_documento,
+                Persona.i_cod_persona,
+                PersonaTrabajador.i_cod_trabajador,
+                PersonaTrabajador.v_huella_registro
+            )
+            .outerjoin(
+                PersonaTrabajador,
+                and_(
+                    PersonaTrabajador.i_cod_persona == Persona.i_cod_persona,
+                    PersonaTrabajador.i_est_registro == 1
                 )
-                db.add(unidad)
-                db.flush()
-            
-            master_data['unidad'][name] = unidad.i_cod_unidad
-        
-        db.commit()
-        logger.info(f"Procesadas unidades: {len(unique_unidades)} registros")
-        
-    except Exception as e:
-        logger.error(f"Error procesando unidades: {str(e)}")
-        db.rollback()
-        return master_data
+            )
+            .where(Persona.v_num_documento.in_(chunk))
+        )
+        existentes.update({documento: tuple(values) for documento, *values in rows})
+    return existentes
+
+def compute_fingerprints(frame: pd.DataFrame) -> pd.Series:
+    """Calcula la huella (hash de 64 bits en hexadecimal) de las columnas relevantes de cada fila."""
+    values = frame[FINGERPRINT_COLUMNS].astype('string')
+    # Solo la fecha: la hora no es relevante y las fechas vacías no deben cambiar la huella
+    values['t_fec_ingreso'] = (
+        pd.to_datetime(frame['t_fec_ingreso']).dt.strftime('%Y-%m-%d').astype('string')
+    )
+    hashes = pd.util.hash_pandas_object(values.fillna(''), index=False)
+    return hashes.map('{:016x}'.format)
+
+def get_update_audit_data(audit_data: dict) -> dict:
+    """Retorna los campos de auditoría de modificación a partir de los de registro."""
+    return {
+        'v_usu_mod': audit_data['v_usu_reg'],
+        't_fec_mod': datetime.now(),
+        'v_host_mod': audit_data['v_host_reg'],
+        'v_ip_mod': audit_data['v_ip_reg'],
+    }
+
+def _trabajador_values(row: dict) -> dict:
+    values = {col: row[col] for col in TRABAJADOR_COLUMNS}
+    values['v_huella_registro'] = row['v_huella_registro']
+    return values
 
-    # Luego procesamos el resto de entidades
-    for data_type, (model, column) in model_map.items():
-        if data_type == 'unidad':  # Ya procesado
+def insert_batch(
+    db: SessionLocal,
+    rows: List[dict],
+    audit_data: dict,
+    profiler: Optional[ImportProfiler] = None
+) -> None:
+    """Inserta un lote de personas y sus registros de trabajador."""
+    # Insertar personas recuperando los códigos generados en una sola operación
+    with profile_phase(profiler, 'insercion_persona', len(rows)):
+        result = db.execute(
+            insert(Persona).returning(Persona.i_cod_persona, Persona.v_num_documento),
+            [{**{col: row[col] for col in PERSONA_COLUMNS}, **audit_data} for row in rows]
+        )
+        persona_ids = {documento: cod_persona for cod_persona, documento in result}
+
+    # Insertar trabajadores con executemany
+    with profile_phase(profiler, 'insercion_trabajador', len(rows)):
+        db.execute(
+            insert(PersonaTrabajador),
+            [
+                {
+                    **_trabajador_values(row),
+                    'i_cod_persona': persona_ids[row['v_num_documento']],
+                    't_fec_ingreso': row['t_fec_ingreso'] or datetime.now(),
+                    **audit_data
+                }
+                for row in rows
+            ]
+        )
+
+def update_batch(
+    db: SessionLocal,
+    rows: List[dict],
+    audit_data: dict,
+    profiler: Optional[ImportProfiler] = None
+) -> None:
+    """Actualiza por clave primaria un lote de personas y trabajadores con cambios."""
+    mod_data = get_update_audit_data(audit_data)
+    with profile_phase(profiler, 'insercion_persona', len(rows)):
+        db.execute(
+            update(Persona),
+            [
+                {
+                    'i_cod_persona': row['i_cod_persona'],
+                    **{col: row[col] for col in PERSONA_COLUMNS if col != 'v_num_documento'},
+                    **mod_data
+                }
+                for row in rows
+            ]
+        )
+
+    updates, inserts = [], []
+    for row in rows:
+        values = _trabajador_values(row)
+        if row['i_cod_trabajador'] is None:
+            # La persona existe pero no tiene registro de trabajador activo
+            values['t_fec_ingreso'] = values['t_fec_ingreso'] or datetime.now()
+            inserts.append({**values, 'i_cod_persona': row['i_cod_persona'], **audit_data})
             continue
-            
+        if values['t_fec_ingreso'] is None:
+            # Sin fecha en el archivo se conserva la registrada
+            del values['t_fec_ingreso']
+        updates.append({**values, 'i_cod_trabajador': row['i_cod_trabajador'], **mod_data})
+
+    with profile_phase(profiler, 'insercion_trabajador', len(rows)):
+        if updates:
+            db.execute(update(PersonaTrabajador), updates)
+        if inserts:
+            db.execute(insert(PersonaTrabajador), inserts)
+
+def classify_rows(
+    db: SessionLocal,
+    rows: pd.DataFrame,
+    upsert: bool = False,
+    profiler: Optional[ImportProfiler] = None
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """Calcula la huella de cada fila y decide si se inserta, se actualiza o se omite.
+
+    Retorna una copia de ``rows`` con la huella (y, con ``upsert``, los códigos de la
+    persona y el trabajador existentes) y la acción que corresponde a cada fila.
+    """
+    with profile_phase(profiler, 'validacion'):
+        rows = rows.copy()
+        rows['v_huella_registro'] = compute_fingerprints(rows) if len(rows) else pd.Series(dtype=object)
+
+    documentos = rows['v_num_documento'].tolist()
+    with profile_phase(profiler, 'consulta_existentes', len(documentos)):
+        if upsert:
+            existentes = fetch_existing_workers(db, documentos)
+        else:
+            existentes = dict.fromkeys(fetch_existing_documents(db, documentos))
+    logger.info(f"Documentos ya registrados: {len(existentes)} de {len(documentos)}")
+
+    es_existente = rows['v_num_documento'].isin(existentes.keys())
+    accion = pd.Series(ACCION_NUEVO, index=rows.index, dtype=object)
+
+    if upsert:
+        info = rows.loc[es_existente, 'v_num_documento'].map(existentes)
+        rows['i_cod_persona'] = info.str[0].reindex(rows.index).astype('Int64')
+        rows['i_cod_trabajador'] = info.str[1].reindex(rows.index).astype('Int64')
+        sin_cambios = (rows.loc[es_existente, 'v_huella_registro'] == info.str[2]).reindex(
+            rows.index, fill_value=False
+        )
+        accion[es_existente] = ACCION_CAMBIO
+        accion[sin_cambios] = ACCION_OMITIDO
+    else:
+        accion[es_existente] = ACCION_OMITIDO
+        if es_existente.any():
+            logger.warning(f"{int(es_existente.sum())} personas ya existen - Omitiendo")
+
+    return rows, accion
+
+def preview_rows(
+    db: SessionLocal,
+    rows: pd.DataFrame,
+    stats: Dict,
+    upsert: bool = False,
+    profiler: Optional[ImportProfiler] = None
+) -> None:
+    """Simula ``load_rows_bulk`` sin escribir: cuenta las filas que se insertarían, actualizarían u omitirían."""
+    _, accion = classify_rows(db, rows, upsert, profiler)
+    stats['procesados'] += int((accion == ACCION_NUEVO).sum())
+    stats['actualizados'] += int((accion == ACCION_CAMBIO).sum())
+    stats['omitidos'] += int((accion == ACCION_OMITIDO).sum())
+
+def load_rows_bulk(
+    db: SessionLocal,
+    rows: pd.DataFrame,
+    audit_data: dict,
+    stats: Dict,
+    batch_size: int = BATCH_SIZE,
+    upsert: bool = False,
+    profiler: Optional[ImportProfiler] = None,
+    rechazadas: Optional[pd.DataFrame] = None,
+    checkpoint: Optional[ImportCheckpoint] = None
+) -> None:
+    """Carga por lotes las filas validadas: una verificación de existencia por bloques e inserciones masivas.
+
+    ``rows`` es la salida de ``validate_rows`` con los códigos de datos maestros ya
+    asignados. Con ``upsert=True`` las personas existentes cuya huella cambió se
+    actualizan en lotes.
+
+    Cada lote abarca un tramo contiguo de filas del archivo con hasta ``batch_size``
+    filas a escribir. Si se indican ``rechazadas`` (también de ``validate_rows``), se
+    registran junto con el lote que las contiene; con ``checkpoint``, cada lote guarda
+    en su misma transacción la última fila confirmada y las estadísticas.
+    """
+    rows, accion = classify_rows(db, rows, upsert, profiler)
+
+    def apply_isolated(batch: List[dict], operation) -> int:
+        # Aplica el lote dentro de un SAVEPOINT; si falla, lo divide en dos y reintenta
+        # cada mitad hasta aislar las filas que provocan el error.
         try:
-            unique_values = df[column].dropna().unique()
-            for value in unique_values:
-                try:
-                    name = str(value).strip()
-                    if not name:
-                        continue
-
-                    item = db.query(model).filter(model.v_des_nombre == name).first()
-                    if not item:
-                        # Para áreas, necesitamos asignar una unidad
-                        if data_type == 'area':
-                            # Obtener la unidad correspondiente de la misma fila
-                            unidad_name = df[df[column] == value][model_map['unidad'][1]].iloc[0]
-                            unidad_id = master_data['unidad'].get(str(unidad_name).strip())
-                            
-                            item = model(
-                                v_des_nombre=name,
-                                i_cod_unidad=unidad_id,  # Asignar la unidad correspondiente
-                                **audit_data
-                            )
-                        else:
-                            item = model(
-                                v_des_nombre=name,
-                                **audit_data
-                            )
-                        
-                        db.add(item)
-                        db.flush()
-
-                    id_field = f'i_cod_{data_type}'
-                    master_data[data_type][name] = getattr(item, id_field)
-                    
-                except Exception as e:
-                    logger.error(f"Error procesando {data_type} '{name}': {str(e)}")
-            
-            db.commit()
-            logger.info(f"Procesados datos maestros de {data_type}: {len(unique_values)} registros")
-            
+            with db.begin_nested():
+                operation(db, batch, audit_data, profiler)
+            return len(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                stats['errores'].append(f"Error en fila {batch[0]['fila']}: {str(e)}")
+                logger.error("Filas con error", extra={'muestra': f"fila {batch[0]['fila']}: {str(e)}"})
+                return 0
+            middle = len(batch) // 2
+            return apply_isolated(batch[:middle], operation) + apply_isolated(batch[middle:], operation)
+
+    # Cortar los lotes cada ``batch_size`` filas a escribir, respetando el orden del archivo
+    escrituras = np.flatnonzero((accion != ACCION_OMITIDO).to_numpy())
+    limites = [int(pos) + 1 for pos in escrituras[batch_size - 1::batch_size]]
+    if not limites or limites[-1] < len(rows):
+        limites.append(len(rows))
+
+    filas_finales = [int(frame['fila'].max()) for frame in (rows, rechazadas) if frame is not None and len(frame)]
+    if not filas_finales:
+        return
+    ultima_fila = 0
+    inicio = 0
+
+    for fin in limites:
+        lote = rows.iloc[inicio:fin]
+        acciones = accion.iloc[inicio:fin]
+        inicio = fin
+        # El último lote también cubre las filas rechazadas posteriores a la última válida
+        hasta = max(filas_finales) if fin == len(rows) else int(lote['fila'].iloc[-1])
+
+        if rechazadas is not None:
+            register_rejects(
+                rechazadas[(rechazadas['fila'] > ultima_fila) & (rechazadas['fila'] <= hasta)], stats
+            )
+        stats['omitidos'] += int((acciones == ACCION_OMITIDO).sum())
+
+        nuevos = to_records(lote[acciones == ACCION_NUEVO])
+        cambios = to_records(lote[acciones == ACCION_CAMBIO])
+        procesados = apply_isolated(nuevos, insert_batch) if nuevos else 0
+        actualizados = apply_isolated(cambios, update_batch) if cambios else 0
+
+        try:
+            if checkpoint is not None:
+                checkpoint.save(db, hasta, {
+                    **stats,
+                    'procesados': stats['procesados'] + procesados,
+                    'actualizados': stats['actualizados'] + actualizados,
+                })
+            with profile_phase(profiler, 'commit', len(nuevos) + len(cambios)):
+                db.commit()
         except Exception as e:
-            logger.error(f"Error en procesamiento de {data_type}: {str(e)}")
             db.rollback()
-            
-    return master_data
-
-def process_excel(file_path: str) -> None:
-    """Procesa el archivo Excel y carga los datos en la base de datos."""
-    required_cols = [
-        'ID de persona', 'Numero documento', 'Nombres', 'Primer apellido',
-        'Fecha de ingreso', 'Subdivisión de personal (Nombre de Subdivisión de personal)',
-        'Área de personal (Picklist Label)', 'Position Posición (Label)',
-        'Position Centro de costo (Código de centro de costos)'
-    ]
-    
-    stats = {
-        'procesados': 0,
-        'omitidos': 0,
-        'errores': [],
-    }
+            for row in nuevos + cambios:
+                stats['errores'].append(f"Error en fila {row['fila']}: {str(e)}")
+            logger.error(f"Error confirmando lote de {len(nuevos) + len(cambios)} registros: {str(e)}")
+            ultima_fila = hasta
+            continue
+        # Solo se cuentan las filas efectivamente confirmadas
+        stats['procesados'] += procesados
+        stats['actualizados'] += actualizados
+        ultima_fila = hasta
+        if nuevos or cambios:
+            logger.info(f"Procesados {stats['procesados']} registros, actualizados {stats['actualizados']}")
+
+def load_chunks_staging(
+    db: SessionLocal,
+    chunks: Iterable[pd.DataFrame],
+    required_cols: List[str],
+    audit_data: dict,
+    stats: Dict,
+    progress_callback: Optional[Callable[[Dict, int], None]] = None,
+    profiler: Optional[ImportProfiler] = None,
+    documentos: Optional[Set[str]] = None
+) -> int:
+    """Carga los bloques mediante una tabla de staging y un INSERT ... SELECT por tabla destino.
+
+    Toda la carga ocurre en una única transacción. Retorna la cantidad de filas leídas.
+    Si se indica ``documentos``, acumula en él los documentos presentes en el archivo.
+    """
+    vistos = set()
+    total_filas = 0
+    with StagingImport(db.connection(), audit_data) as staging:
+        for df in chunks:
+            total_filas += len(df)
+            with profile_phase(profiler, 'validacion', len(df)):
+                check_null_values(df, required_cols)
+                if documentos is not None:
+                    documentos.update(normalize_names(df['Numero documento']).dropna())
+                limpias, rechazadas = validate_rows(df, vistos)
+                register_rejects(rechazadas, stats)
+            with profile_phase(profiler, 'copia_staging', len(limpias)):
+                staging.copy(limpias)
+            if progress_callback:
+                progress_callback(stats, total_filas)
+
+        staging.merge(stats, profiler)
+    with profile_phase(profiler, 'commit', total_filas):
+        db.commit()
+    return total_filas
+
+REQUIRED_COLUMNS = [
+    'ID de persona', 'Numero documento', 'Nombres', 'Primer apellido',
+    'Fecha de ingreso', 'Subdivisión de personal (Nombre de Subdivisión de personal)',
+    'Área de personal (Picklist Label)', 'Position Posición (Label)',
+    'Position Centro de costo (Código de centro de costos)'
+]
+
+class ImportPipeline:
+    """Valida y carga los bloques leídos del Excel con el motor elegido.
+
+    Conserva entre bloques los datos maestros resueltos y los documentos aceptados,
+    de modo que un documento repetido en otro bloque, hoja o archivo se omite.
+    ``documentos`` reúne todos los documentos del extracto, incluidos los de filas
+    rechazadas, para la reconciliación. Con ``dry_run=True`` no escribe nada: cuenta lo que se insertaría, actualizaría
+    u omitiría.
+    """
+
+    def __init__(
+        self,
+        db: SessionLocal,
+        audit_data: dict,
+        profiler: ImportProfiler,
+        bulk: bool = True,
+        batch_size: int = BATCH_SIZE,
+        upsert: bool = False,
+        parallel: Optional[PartitionedLoader] = None,
+        checkpoint: Optional[ImportCheckpoint] = None,
+        dry_run: bool = False
+    ):
+        self.db = db
+        self.audit_data = audit_data
+        self.profiler = profiler
+        self.bulk = bulk
+        self.batch_size = batch_size
+        self.upsert = upsert
+        self.parallel = parallel
+        self.checkpoint = checkpoint
+        self.dry_run = dry_run
+        self.master_data = {'unidad': {}, 'area': {}, 'puesto': {}, 'categoria': {}}
+        self.vistos = set()
+        self.documentos: Set[str] = set()
+
+    def _register_documents(self, df: pd.DataFrame) -> None:
+        self.documentos.update(normalize_names(df['Numero documento']).dropna())
+
+    def skip_committed(self, df: pd.DataFrame, ultima_fila: int) -> pd.DataFrame:
+        """Descarta las filas confirmadas en una ejecución anterior (hasta ``ultima_fila``)."""
+        if not ultima_fila or df.index[0] >= ultima_fila:
+            return df
+        # Solo se registran sus documentos para detectar repetidos en el resto del archivo
+        confirmadas = df.index < ultima_fila
+        with self.profiler.phase('validacion', int(confirmadas.sum())):
+            validate_rows(df[confirmadas], self.vistos)
+            self._register_documents(df[confirmadas])
+        return df[~confirmadas]
+
+    def load(self, df: pd.DataFrame, stats: Dict) -> None:
+        """Valida y carga un bloque, acumulando el resultado en ``stats``."""
+        with self.profiler.phase('validacion', len(df)):
+            check_null_values(df, REQUIRED_COLUMNS)
+            self._register_documents(df)
+
+        # Procesar datos maestros del bloque
+        with self.profiler.phase('datos_maestros', len(df)):
+            for data_type, values in get_or_create_master_data(self.db, df, not self.dry_run).items():
+                self.master_data[data_type].update(values)
+
+        if not self.bulk and not self.dry_run:
+            with self.profiler.phase('carga_por_fila', len(df)):
+                load_rows(self.db, df, self.master_data, self.audit_data, stats)
+            return
+
+        # Validar y normalizar el bloque antes de insertarlo
+        with self.profiler.phase('validacion'):
+            limpias, rechazadas = validate_rows(df, self.vistos)
+            rows = map_master_data(limpias, self.master_data)
+        if self.dry_run:
+            register_rejects(rechazadas, stats)
+            preview_rows(self.db, rows, stats, self.upsert, self.profiler)
+        elif self.parallel is not None:
+            register_rejects(rechazadas, stats)
+            with self.profiler.phase('carga_paralela', len(rows)):
+                self.parallel.submit(rows, stats)
+                self.parallel.collect_finished()
+        else:
+            # Los rechazos se registran con el lote que los contiene
+            load_rows_bulk(
+                self.db, rows, self.audit_data, stats, self.batch_size, self.upsert,
+                self.profiler, rechazadas, self.checkpoint
+            )
+
+    def finish(self) -> None:
+        """Espera las cargas en paralelo pendientes y confirma la transacción final."""
+        if self.parallel is not None:
+            with self.profiler.phase('carga_paralela'):
+                self.parallel.finish()
+        if self.dry_run:
+            self.db.rollback()
+            return
+        with self.profiler.phase('commit'):
+            self.db.commit()
+
+    def reconcile(self, modo: str) -> Dict:
+        """Reconcilia los trabajadores activos con los documentos del extracto.
+
+        Solo desactiva con ``modo='aplicar'`` y fuera de la simulación; si no, retorna la vista previa.
+        """
+        with self.profiler.phase('reconciliacion', len(self.documentos)):
+            return reconcile_snapshot(
+                self.db, self.documentos, get_update_audit_data(self.audit_data),
+                aplicar=modo == RECONCILIAR_APLICAR and not self.dry_run
+            )
+
+def log_import_summary(stats: Dict) -> None:
+    """Registra en el log las estadísticas finales de la importación."""
+    # Resumir primero los mensajes repetidos acumulados durante la carga
+    loader_logging.flush_repeated()
+    logger.info(f"""
+Resumen de importación:
+- Registros procesados exitosamente: {stats['procesados']}
+- Registros actualizados: {stats['actualizados']}
+- Registros omitidos: {stats['omitidos']}
+- Errores encontrados: {len(stats['errores'])}
+            """)
+
+    if stats['errores']:
+        logger.warning("Primeros 10 errores encontrados:")
+        for error in stats['errores'][:10]:
+            logger.error(error)
+        if len(stats['errores']) > 10:
+            logger.warning(f"...y {len(stats['errores']) - 10} errores más")
+
+def _finish_profile(profiler: ImportProfiler, stats: Dict, total_filas: int) -> None:
+    profiler.stop()
+    stats['perfil'] = profiler.as_dict(total_filas)
+    stats['perfil']['artefacto'] = write_profile(stats['perfil'])
+    profiler.log_summary(stats['perfil'])
+
+@loader_logging.import_run()
+def process_excel(
+    file_path: str,
+    bulk: bool = True,
+    batch_size: int = BATCH_SIZE,
+    chunk_size: int = CHUNK_SIZE,
+    progress_callback: Optional[Callable[[Dict, int], None]] = None,
+    upsert: bool = False,
+    staging: bool = False,
+    workers: int = PARTITION_WORKERS,
+    file_hash: Optional[str] = None,
+    dry_run: bool = False,
+    reconcile: Optional[str] = None
+) -> Dict:
+    """Procesa el archivo Excel y carga los datos en la base de datos.
+
+    El archivo se lee por bloques de ``chunk_size`` filas y cada bloque se carga
+    en cuanto se lee. Con ``bulk=True`` las filas se cargan por lotes; con
+    ``bulk=False`` se usa la carga fila por fila original.
+
+    Con ``upsert=True`` las personas existentes no se omiten: se compara la huella
+    de sus columnas relevantes con la guardada y solo se actualizan las que cambiaron.
+
+    Con ``staging=True`` las filas validadas se copian a una tabla temporal y la base
+    crea datos maestros, personas y trabajadores con un INSERT ... SELECT por tabla.
+
+    Con ``workers > 1`` las filas validadas se reparten por hash del documento entre
+    ``workers`` procesos, cada uno con su propia conexión. Los datos maestros se
+    resuelven una sola vez en este proceso antes de repartir las filas.
+
+    Si se indica ``file_hash`` y el archivo está registrado en ``griemvc_importacion``,
+    la carga por lotes en un solo proceso guarda un punto de reanudación con cada lote
+    confirmado; al volver a procesar el archivo se continúa desde la última fila
+    confirmada, restaurando sus estadísticas y sin volver a consultar las filas previas.
+
+    Con ``dry_run=True`` el archivo se lee y valida sin escribir en la base: las
+    estadísticas indican lo que se insertaría (procesados), actualizaría u omitiría.
+
+    Con ``reconcile`` el archivo se trata como el extracto completo de trabajadores:
+    tras la carga, los trabajadores activos cuyo documento no figura en él se cuentan
+    (``'preview'``) o se desactivan en un único UPDATE (``'aplicar'``, salvo en
+    simulación). El resultado queda en ``stats['reconciliacion']``; si la carga falla
+    no se reconcilia.
+
+    Si se indica ``progress_callback``, se invoca tras cada bloque con las
+    estadísticas acumuladas y la cantidad de filas leídas.
+
+    Cada ejecución mide tiempo, filas por segundo y pico de memoria por fase; el
+    perfil se retorna en ``stats['perfil']`` y se guarda como JSON en ``PROFILE_DIR``.
+
+    Si el archivo no se pudo leer o la carga se interrumpió, ``stats['error_fatal']``
+    describe el motivo; si no, es None.
+    """
+    stats = new_stats()
+    stats['error_fatal'] = None
+    profiler = ImportProfiler(os.path.basename(file_path)).start()
+    total_filas = 0
+
+    if upsert and not bulk:
+        logger.warning("El modo upsert requiere la carga por lotes; se usará bulk=True")
+        bulk = True
+    if upsert and staging:
+        logger.warning("El motor de staging no admite el modo upsert; se usará la carga por lotes")
+        staging = False
+    if workers > 1 and (staging or not bulk):
+        logger.warning("La carga en paralelo solo está disponible para la carga por lotes; se usará un proceso")
+        workers = 1
+    workers = supported_workers(workers)
+    if dry_run:
+        # La simulación solo consulta: se usa la validación de la carga por lotes
+        bulk, staging, workers, file_hash = True, False, 1, None
     
     try:
         logger.info(f"Iniciando procesamiento de {file_path}")
         
-        # Leer Excel
+        # Leer Excel por bloques, solo con las columnas requeridas
+        chunks = profiler.track('lectura', iter_excel_chunks(file_path, REQUIRED_COLUMNS, chunk_size))
         try:
-            df = pd.read_excel(file_path)
-            logger.info(f"Excel leído correctamente: {len(df)} filas encontradas")
+            first_chunk = next(chunks, None)
+        except MissingColumnsError as e:
+            logger.critical(str(e))
+            stats['error_fatal'] = str(e)
+            return stats
         except Exception as e:
             logger.critical(f"Error al leer Excel: {str(e)}")
-            return
-            
-        # Verificar columnas requeridas
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        if missing_cols:
-            logger.critical(f"Columnas faltantes: {', '.join(missing_cols)}")
-            return
-            
-        check_null_values(df, required_cols)
+            stats['error_fatal'] = f"Error al leer Excel: {str(e)}"
+            return stats
+
+        if first_chunk is None:
+            logger.warning("El archivo no contiene filas de datos")
+            return stats
         
         db = SessionLocal()
         audit_data = get_import_audit_data()
+        parallel = None
+        checkpoint = None
+        ultima_fila = 0
         
         try:
-            # Procesar datos maestros
-            master_data = get_or_create_master_data(db, df)
-            
-            # Procesar cada fila del Excel
-            for idx, row in df.iterrows():
-                try:
-                    # Validar documento
-                    if pd.isna(row['Numero documento']):
-                        raise ValueError("Número de documento es nulo")
-                    
-                    documento = str(row['Numero documento']).strip()
-                    
-                    # Verificar si la persona ya existe
-                    existing_persona = db.query(Persona).filter(
-                        Persona.v_num_documento == documento
-                    ).first()
-                    
-                    if existing_persona:
-                        logger.warning(f"Persona con documento {documento} ya existe - Omitiendo")
-                        stats['omitidos'] += 1
-                        continue
-                    
-                    # Crear nueva persona
-                    new_persona = Persona(
-                        v_num_documento=documento,
-                        v_des_nombres=str(row['Nombres']).strip(),
-                        v_des_apellidos=str(row['Primer apellido']).strip(),
-                        v_cod_empresa=str(row['ID de persona']).zfill(8),
-                        **audit_data
-                    )
-                    
-                    db.add(new_persona)
-                    db.flush()
-                    
-                    # Procesar fecha de ingreso
-                    fecha_ingreso = None
-                    if pd.notna(row['Fecha de ingreso']):
-                        try:
-                            fecha_ingreso = pd.to_datetime(row['Fecha de ingreso'])
-                        except Exception as e:
-                            logger.warning(f"Error en fecha para documento {documento}: {str(e)}")
-                    
-                    # Crear registro de trabajador
-                    new_trabajador = PersonaTrabajador(
-                        i_cod_persona=new_persona.i_cod_persona,
-                        i_cod_unidad=master_data['unidad'].get(
-                            str(row['Subdivisión de personal (Nombre de Subdivisión de personal)']).strip()
-                        ),
-                        i_cod_categoria=master_data['categoria'].get(
-                            str(row['Área de personal (Picklist Label)']).strip()
-                        ),
-                        i_cod_puesto=master_data['puesto'].get(
-                            str(row['Position Posición (Label)']).strip()
-                        ),
-                        i_cod_area=master_data['area'].get(
-                            str(row['Position Centro de costo (Código de centro de costos)']).strip()
-                        ),
-                        t_fec_ingreso=fecha_ingreso or datetime.now(),
-                        **audit_data
-                    )
-                    
-                    db.add(new_trabajador)
-                    stats['procesados'] += 1
-                    
-                    # Commit cada 100 registros
-                    if stats['procesados'] % 100 == 0:
-                        db.commit()
-                        logger.info(f"Procesados {stats['procesados']} registros")
-                    
-                except Exception as e:
-                    stats['errores'].append(f"Error en fila {idx + 1}: {str(e)}")
-                    logger.error(f"Error procesando fila {idx + 1}: {str(e)}")
-                    db.rollback()
-                    continue
-            
+            if file_hash and bulk and not staging and workers == 1:
+                checkpoint = ImportCheckpoint(file_hash)
+                ultima_fila = checkpoint.restore(db, stats)
+                # Cerrar la lectura antes de cargar: los datos maestros se confirman en
+                # otra sesión y en SQLite esperarían el bloqueo que retiene esta transacción
+                db.commit()
+
+            if workers > 1:
+                parallel = PartitionedLoader(
+                    workers, audit_data, stats, batch_size, upsert, profiler
+                ).start()
+
+            pipeline = ImportPipeline(
+                db, audit_data, profiler, bulk, batch_size, upsert, parallel, checkpoint, dry_run
+            )
+            if staging:
+                total_filas = load_chunks_staging(
+                    db, itertools.chain([first_chunk], chunks), REQUIRED_COLUMNS,
+                    audit_data, stats, progress_callback, profiler, pipeline.documentos
+                )
+
+            for df in ([] if staging else itertools.chain([first_chunk], chunks)):
+                total_filas += len(df)
+                df = pipeline.skip_committed(df, ultima_fila)
+                if not df.empty:
+                    pipeline.load(df, stats)
+
+                if progress_callback:
+                    progress_callback(stats, total_filas)
+
             # Commit final
-            db.commit()
+            pipeline.finish()
+            logger.info(f"Excel leído correctamente: {total_filas} filas encontradas")
+            if reconcile:
+                stats['reconciliacion'] = pipeline.reconcile(reconcile)
             logger.info("Procesamiento completado exitosamente")
             
         except Exception as e:
             logger.critical(f"Error en el procesamiento: {str(e)}")
+            stats['error_fatal'] = f"Error en el procesamiento: {str(e)}"
             db.rollback()
         
         finally:
             # Registrar estadísticas finales
-            logger.info(f"""
-Resumen de importación:
-- Registros procesados exitosamente: {stats['procesados']}
-- Registros omitidos: {stats['omitidos']}
-- Errores encontrados: {len(stats['errores'])}
-            """)
-            
-            if stats['errores']:
-                logger.warning("Primeros 10 errores encontrados:")
-                for error in stats['errores'][:10]:
-                    logger.error(error)
-                if len(stats['errores']) > 10:
-                    logger.warning(f"...y {len(stats['errores']) - 10} errores más")
-            
+            log_import_summary(stats)
+            if parallel is not None:
+                parallel.close()
             db.close()
             
     except Exception as e:
-        logger.critical(f"Error fatal en el proceso: {str(e)}")
\ No newline at end of file
+        logger.critical(f"Error fatal en el proceso: {str(e)}")
+        stats['error_fatal'] = f"Error fatal en el proceso: {str(e)}"
+
+    finally:
+        _finish_profile(profiler, stats, total_filas)
+
+    return stats
+
+def _input_label(entrada: Dict) -> str:
+    nombre = entrada.get('nombre') or os.path.basename(entrada['ruta'])
+    return f"{nombre} [{entrada['hoja']}]" if entrada.get('hoja') else nombre
+
+def combine_input_stats(subtotales: List[Dict]) -> Dict:
+    """Suma las estadísticas de cada entrada; los errores se prefijan con el archivo y la hoja."""
+    stats = new_stats()
+    for sub in subtotales:
+        merge_stats(stats, {
+            **sub,
+            'errores': [f"{_input_label(sub)}: {error}" for error in sub['errores']]
+        })
+    return stats
+
+@loader_logging.import_run()
+def process_excel_batch(
+    entradas: List[Dict],
+    batch_size: int = BATCH_SIZE,
+    chunk_size: int = CHUNK_SIZE,
+    progress_callback: Optional[Callable[[Dict, int], None]] = None,
+    upsert: bool = False,
+    workers: int = PARTITION_WORKERS,
+    parse_workers: int = PARSE_WORKERS,
+    dry_run: bool = False,
+    reconcile: Optional[str] = None
+) -> Dict:
+    """Importa varias hojas o archivos en una sola carga.
+
+    Cada entrada es un dict con ``ruta``, ``hoja`` (None para la primera) y ``nombre``
+    (ver ``excel_reader.excel_inputs``). Las entradas se leen en paralelo en hasta ``parse_workers``
+    procesos, que entregan sus bloques por una cola acotada, y se cargan en el orden recibido con un único pipeline por lotes, por lo
+    que un documento repetido en otra entrada se omite. ``stats['archivos']`` contiene
+    las estadísticas de cada entrada; los totales suman todas. ``dry_run`` y ``reconcile``
+    funcionan como en ``process_excel``, considerando el conjunto de entradas como el
+    extracto; no se reconcilia si alguna entrada no se pudo leer.
+    """
+    subtotales = []
+    profiler = ImportProfiler(', '.join(_input_label(entrada) for entrada in entradas)).start()
+    total_filas = 0
+
+    def totales() -> Dict:
+        return combine_input_stats(subtotales)
+
+    db = SessionLocal()
+    audit_data = get_import_audit_data()
+    parallel = None
+    reconciliacion = None
+    error_fatal = None
+    pendientes = deque()
+    try:
+        logger.info(f"Iniciando procesamiento de {len(entradas)} hojas o archivos")
+        workers = supported_workers(workers)
+        if workers > 1 and not dry_run:
+            parallel = PartitionedLoader(
+                workers, audit_data, new_stats(), batch_size, upsert, profiler
+            ).start()
+        pipeline = ImportPipeline(
+            db, audit_data, profiler, True, batch_size, upsert, parallel, dry_run=dry_run
+        )
+
+        def abrir(entrada: Dict) -> ExcelChunkStream:
+            return ExcelChunkStream(
+                entrada['ruta'], REQUIRED_COLUMNS, chunk_size, entrada['hoja']
+            ).start()
+
+        # Mantener como máximo ``parse_workers`` entradas leyéndose por delante de la carga;
+        # cada una retiene a lo sumo los bloques de su cola, no la hoja completa
+        siguientes = iter(entradas)
+        pendientes.extend(
+            (entrada, abrir(entrada)) for entrada in itertools.islice(siguientes, max(1, parse_workers))
+        )
+
+        while pendientes:
+            entrada, stream = pendientes[0]
+            sub = {
+                **new_stats(),
+                'nombre': entrada.get('nombre') or os.path.basename(entrada['ruta']),
+                'hoja': entrada['hoja'],
+                'filas': 0,
+                'error_fatal': None,
+            }
+            subtotales.append(sub)
+            try:
+                logger.info(f"Cargando {_input_label(entrada)}")
+                for df in profiler.track('lectura', stream):
+                    total_filas += len(df)
+                    sub['filas'] += len(df)
+                    pipeline.load(df, sub)
+                    if progress_callback:
+                        progress_callback(totales(), total_filas)
+            except MissingColumnsError as e:
+                logger.critical(f"{_input_label(entrada)}: {str(e)}")
+                sub['errores'].append(str(e))
+                # El archivo de esta entrada queda en ERROR y se puede volver a subir corregido
+                sub['error_fatal'] = str(e)
+            except ExcelReadError as e:
+                logger.critical(f"{_input_label(entrada)}: Error al leer Excel: {str(e)}")
+                sub['errores'].append(f"Error al leer Excel: {str(e)}")
+                sub['error_fatal'] = f"Error al leer Excel: {str(e)}"
+            finally:
+                pendientes.popleft()
+                stream.close()
+
+            if sub['error_fatal'] and reconcile:
+                # Sin esta entrada (o parte de ella) el extracto está incompleto
+                logger.error("Se omite la reconciliación: no se leyeron todas las entradas")
+                reconcile = None
+
+            siguiente = next(siguientes, None)
+            if siguiente is not None:
+                pendientes.append((siguiente, abrir(siguiente)))
+
+        pipeline.finish()
+        logger.info("Procesamiento completado exitosamente")
+        if reconcile:
+            reconciliacion = pipeline.reconcile(reconcile)
+
+    except Exception as e:
+        logger.critical(f"Error en el procesamiento: {str(e)}")
+        error_fatal = f"Error en el procesamiento: {str(e)}"
+        db.rollback()
+
+    finally:
+        for _, stream in pendientes:
+            stream.close()
+        if parallel is not None:
+            parallel.close()
+        db.close()
+        stats = totales()
+        stats['archivos'] = subtotales
+        stats['error_fatal'] = error_fatal
+        if reconciliacion is not None:
+            stats['reconciliacion'] = reconciliacion
+        log_import_summary(stats)
+        _finish_profile(profiler, stats, total_filas)
+
+    return stats
@@ -0,0 +1,159 @@
+# app/loaders/logging_config.py
+import atexit
+import itertools
+import logging
+import multiprocessing.util
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterator, List, Optional, Tuple
+
+LOGGER_NAME = 'data_loader'
+# Directorio del log del cargador
+LOG_DIR = os.getenv('IMPORT_LOG_DIR', os.path.join('data', 'logs'))
+LOG_FILE = 'data_loader.log'
+# Valores de ejemplo que se conservan por cada mensaje repetido
+SAMPLE_SIZE = int(os.getenv('IMPORT_LOG_SAMPLE_SIZE', '5'))
+
+# Importación en curso en este hilo o tarea; separa los conteos de importaciones del mismo proceso
+_import_run: ContextVar[Optional[int]] = ContextVar('import_run', default=None)
+_run_ids = itertools.count(1)
+
+class RepeatedMessageFilter(logging.Filter):
+    """Agrupa los mensajes que se registran con ``extra={'muestra': valor}``.
+
+    En lugar de escribir una línea por registro, cuenta las repeticiones de cada
+    mensaje y guarda algunos valores de ejemplo; ``flush`` escribe una sola línea
+    por mensaje con el total y los ejemplos. Los conteos se llevan por importación
+    (ver ``LoaderLogging.import_run``) y ``flush`` solo escribe los de la actual.
+    """
+
+    def __init__(self, sample_size: int = SAMPLE_SIZE):
+        super().__init__()
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self._grupos: Dict[Tuple[Optional[int], int, str], Tuple[int, List[str]]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        muestra = getattr(record, 'muestra', None)
+        if muestra is None:
+            return True
+        clave = (_import_run.get(), record.levelno, str(record.msg))
+        with self._lock:
+            cantidad, muestras = self._grupos.get(clave, (0, []))
+            if len(muestras) < self.sample_size:
+                muestras.append(str(muestra))
+            self._grupos[clave] = (cantidad + 1, muestras)
+        return False
+
+    def reset(self) -> None:
+        # Tras un fork el hijo no debe repetir los conteos del padre ni heredar su lock
+        self._lock = threading.Lock()
+        self._grupos = {}
+
+    def flush(self, logger: logging.Logger) -> None:
+        run = _import_run.get()
+        with self._lock:
+            grupos = {clave: grupo for clave, grupo in self._grupos.items() if clave[0] == run}
+            for clave in grupos:
+                del self._grupos[clave]
+        for (_, levelno, mensaje), (cantidad, muestras) in grupos.items():
+            logger.log(levelno, f"{mensaje}: {cantidad} veces. Ejemplos: {'; '.join(muestras)}")
+
+class LoaderLogging:
+    """Envía el log del cargador a una cola que escribe un hilo en segundo plano.
+
+    Las escrituras en archivo y consola ya no bloquean la importación. La
+    configuración es idempotente por proceso: al volver a importar el módulo no
+    se agregan handlers, y un proceso hijo creado con fork arma su propia cola.
+    """
+
+    def __init__(self):
+        self.filter = RepeatedMessageFilter()
+        self._handler: Optional[QueueHandler] = None
+        self._listener: Optional[QueueListener] = None
+        self._pid: Optional[int] = None
+
+    def configure(self) -> logging.Logger:
+        logger = logging.getLogger(LOGGER_NAME)
+        if self._pid == os.getpid():
+            return logger
+        if self._handler is not None:
+            # Handler heredado del proceso padre: su hilo no existe en este proceso
+            logger.removeHandler(self._handler)
+
+        os.makedirs(LOG_DIR, exist_ok=True)
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        handlers = [
+            logging.FileHandler(os.path.join(LOG_DIR, LOG_FILE), encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        self._listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        self._handler = QueueHandler(log_queue)
+        self._pid = os.getpid()
+
+        logger.setLevel(logging.INFO)
+        logger.addHandler(self._handler)
+        if self.filter not in logger.filters:
+            logger.addFilter(self.filter)
+        # Evitar que los registros se dupliquen en los handlers del logger raíz
+        logger.propagate = False
+
+        atexit.register(self.stop)
+        # Los procesos de multiprocessing terminan sin ejecutar atexit
+        multiprocessing.util.Finalize(self, self.stop, exitpriority=10)
+        return logger
+
+    def after_fork(self) -> None:
+        # Un hijo de un proceso ya configurado necesita su propio hilo de escritura
+        if self._pid is not None:
+            self.filter.reset()
+            self.configure()
+
+    def flush_repeated(self) -> None:
+        """Escribe el resumen de los mensajes repetidos acumulados hasta ahora por la importación actual."""
+        self.filter.flush(logging.getLogger(LOGGER_NAME))
+
+    @contextmanager
+    def import_run(self) -> Iterator[None]:
+        """Agrupa aparte los mensajes repetidos de una importación; al salir escribe los pendientes.
+
+        Sirve también como decorador. Dos importaciones del mismo proceso (el watcher,
+        el CLI por lotes o hilos distintos) no mezclan sus conteos ni sus ejemplos.
+        """
+        token = _import_run.set(next(_run_ids))
+        try:
+            yield
+        finally:
+            self.flush_repeated()
+            _import_run.reset(token)
+
+    def stop(self) -> None:
+        """Escribe los mensajes pendientes y detiene el hilo de escritura de este proceso."""
+        if self._pid != os.getpid() or self._listener is None:
+            return
+        self.flush_repeated()
+        listener, self._listener = self._listener, None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        logging.getLogger(LOGGER_NAME).removeHandler(self._handler)
+        self._handler = None
+        self._pid = None
+
+loader_logging = LoaderLogging()
+
+def configure_logging() -> logging.Logger:
+    """Configura (una vez por proceso) y retorna el logger del cargador."""
+    return loader_logging.configure()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=loader_logging.after_fork)
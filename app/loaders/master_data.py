@@ -0,0 +1,194 @@
+# app/loaders/master_data.py
+import logging
+import threading
+from typing import Dict, Iterable, Tuple
+import pandas as pd
+from sqlalchemy import select, insert, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.estructura_org import Unidad, Area, Puesto, Categoria
+
+logger = logging.getLogger('data_loader')
+
+# Tipo de dato maestro -> (modelo, columna del Excel). Las unidades van primero
+# porque las áreas las referencian.
+MODEL_MAP = {
+    'unidad': (Unidad, 'Subdivisión de personal (Nombre de Subdivisión de personal)'),
+    'categoria': (Categoria, 'Área de personal (Picklist Label)'),
+    'puesto': (Puesto, 'Position Posición (Label)'),
+    'area': (Area, 'Position Centro de costo (Código de centro de costos)')
+}
+
+# En SQL Server bloquea el rango consultado hasta el commit para que dos
+# importaciones concurrentes no inserten el mismo nombre
+LOCK_HINT = 'WITH (UPDLOCK, HOLDLOCK)'
+
+def normalize_names(series: pd.Series) -> pd.Series:
+    """Convierte los valores a texto sin espacios extremos; los vacíos quedan como nulos."""
+    names = series.astype('string').str.strip()
+    return names.mask(names == '')
+
+def area_unidad_map(df: pd.DataFrame) -> Dict[str, str]:
+    """Retorna la unidad de la primera fila de cada área del DataFrame."""
+    area_col = MODEL_MAP['area'][1]
+    unidad_col = MODEL_MAP['unidad'][1]
+    pairs = pd.DataFrame({
+        'area': normalize_names(df[area_col]),
+        'unidad': normalize_names(df[unidad_col]),
+    }).dropna(subset=['area'])
+    return pairs.groupby('area', sort=False)['unidad'].first().dropna().to_dict()
+
+class MasterDataCache:
+    """Caché por proceso de los mapas nombre -> código de los datos maestros.
+
+    Cada mapa se recarga cuando cambia la firma (cantidad y código máximo) de su
+    tabla, por lo que sigue siendo válido entre importaciones.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._maps: Dict[str, Dict[str, int]] = {data_type: {} for data_type in MODEL_MAP}
+        self._signatures: Dict[str, Tuple] = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            for values in self._maps.values():
+                values.clear()
+            self._signatures.clear()
+
+    def _id_column(self, data_type: str):
+        model, _ = MODEL_MAP[data_type]
+        return getattr(model, f'i_cod_{data_type}')
+
+    def _signature(self, db: Session, data_type: str) -> Tuple:
+        id_col = self._id_column(data_type)
+        return tuple(db.execute(select(func.count(id_col), func.max(id_col))).one())
+
+    def _refresh(self, db: Session, data_type: str) -> None:
+        signature = self._signature(db, data_type)
+        if self._signatures.get(data_type) == signature:
+            return
+
+        model, _ = MODEL_MAP[data_type]
+        id_col = self._id_column(data_type)
+        rows = db.execute(
+            select(model.v_des_nombre, func.min(id_col)).group_by(model.v_des_nombre)
+        ).all()
+        self._maps[data_type] = {name: cod for name, cod in rows}
+        self._signatures[data_type] = signature
+
+    def _create_missing(
+        self,
+        db: Session,
+        data_type: str,
+        names: Iterable[str],
+        audit_data: dict,
+        area_unidades: Dict[str, str]
+    ) -> int:
+        model, _ = MODEL_MAP[data_type]
+        id_col = self._id_column(data_type)
+        values = self._maps[data_type]
+        missing = [name for name in names if name not in values]
+        if not missing:
+            return 0
+
+        # Releer con bloqueo: otra importación pudo crearlos desde la última recarga
+        existing = db.execute(
+            select(model.v_des_nombre, func.min(id_col))
+            .where(model.v_des_nombre.in_(missing))
+            .group_by(model.v_des_nombre)
+            .with_hint(model, LOCK_HINT, 'mssql')
+        ).all()
+        values.update({name: cod for name, cod in existing})
+        missing = [name for name in missing if name not in values]
+        if not missing:
+            return 0
+
+        rows = []
+        for name in missing:
+            row = {'v_des_nombre': name, **audit_data}
+            if data_type == 'area':
+                # Para áreas, asignar la unidad de su primera fila en el archivo
+                unidad_id = self._maps['unidad'].get(area_unidades.get(name))
+                if unidad_id is None:
+                    logger.error("Áreas sin unidad asociada", extra={'muestra': name})
+                    continue
+                row['i_cod_unidad'] = unidad_id
+            rows.append(row)
+
+        if rows:
+            created = db.execute(insert(model).returning(model.v_des_nombre, id_col), rows)
+            values.update({name: cod for name, cod in created})
+        return len(rows)
+
+    def resolve(
+        self,
+        db: Session,
+        df: pd.DataFrame,
+        audit_data: dict,
+        create: bool = True
+    ) -> Dict[str, Dict[str, int]]:
+        """Retorna los códigos de los datos maestros del DataFrame, creando los que falten.
+
+        Trabaja en una sesión propia sobre el mismo motor que ``db``, de modo que
+        confirmar los datos maestros no confirma ni descarta la transacción del llamador.
+        Con ``create=False`` (simulación) solo se consultan: los nombres nuevos quedan sin
+        código y no se escribe nada.
+        """
+        names = {
+            data_type: normalize_names(df[column]).dropna().unique().tolist()
+            for data_type, (_, column) in MODEL_MAP.items()
+        }
+        area_unidades = area_unidad_map(df)
+        master_data = {data_type: {} for data_type in MODEL_MAP}
+
+        def resolve_type(session: Session, data_type: str) -> int:
+            self._refresh(session, data_type)
+            if create:
+                created = self._create_missing(
+                    session, data_type, names[data_type], audit_data, area_unidades
+                )
+            else:
+                created = 0
+                faltantes = sum(name not in self._maps[data_type] for name in names[data_type])
+                if faltantes:
+                    logger.info(f"Datos maestros de {data_type} por crear: {faltantes}")
+            # Terminar la transacción por tipo para no retener bloqueos ni lecturas
+            session.commit()
+            return created
+
+        with self._lock, Session(bind=db.get_bind()) as session:
+            for data_type in MODEL_MAP:
+                try:
+                    try:
+                        created = resolve_type(session, data_type)
+                    except IntegrityError:
+                        # Otra importación insertó el mismo nombre después de la relectura
+                        # (el índice único lo rechaza): se recarga y se intenta una vez más
+                        session.rollback()
+                        self._signatures.pop(data_type, None)
+                        created = resolve_type(session, data_type)
+                    if created:
+                        # Recargar en la siguiente llamada para incluir inserciones concurrentes
+                        self._signatures.pop(data_type, None)
+                    logger.info(
+                        f"Procesados datos maestros de {data_type}: "
+                        f"{len(names[data_type])} registros ({created} nuevos)"
+                    )
+                except Exception as e:
+                    logger.error(f"Error en procesamiento de {data_type}: {str(e)}")
+                    session.rollback()
+                    # Forzar la recarga completa en la siguiente llamada
+                    self._signatures.pop(data_type, None)
+                    self._maps[data_type] = {}
+                    continue
+
+                values = self._maps[data_type]
+                master_data[data_type] = {
+                    name: values[name] for name in names[data_type] if name in values
+                }
+
+        return master_data
+
+# Caché compartida por todas las importaciones del proceso
+master_data_cache = MasterDataCache()
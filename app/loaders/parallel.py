@@ -0,0 +1,169 @@
+# app/loaders/parallel.py
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.loaders.profiling import ImportProfiler
+
+logger = logging.getLogger('data_loader')
+
+# Cantidad de procesos de carga por defecto para las importaciones particionadas
+PARTITION_WORKERS = int(os.getenv('IMPORT_PARTITION_WORKERS', '1'))
+# Con BEGIN diferido, los procesos que escriben en el mismo archivo SQLite se bloquean
+# entre sí al confirmar; IMMEDIATE toma el bloqueo de escritura al iniciar y los ordena
+SQLITE_PARALLEL_BEGIN = 'BEGIN IMMEDIATE'
+
+def new_stats() -> Dict:
+    return {'procesados': 0, 'actualizados': 0, 'omitidos': 0, 'errores': []}
+
+def merge_stats(target: Dict, source: Dict) -> None:
+    """Suma en ``target`` las estadísticas de otra carga."""
+    for key in ('procesados', 'actualizados', 'omitidos'):
+        target[key] += source[key]
+    target['errores'].extend(source['errores'])
+
+def partition_index(documentos: pd.Series, partitions: int) -> np.ndarray:
+    """Asigna cada documento a una partición según su hash; un documento siempre cae en la misma."""
+    hashes = pd.util.hash_pandas_object(documentos.astype('string'), index=False).to_numpy()
+    return (hashes % np.uint64(partitions)).astype(np.int64)
+
+def supported_workers(workers: int) -> int:
+    """Procesos de carga admitidos por la base configurada."""
+    from app.loaders.database import engine
+    from app.loaders.engine_factory import is_sqlite_memory
+    if workers > 1 and is_sqlite_memory(engine):
+        logger.warning("La base SQLite en memoria no se comparte entre procesos; se usará un proceso")
+        return 1
+    return workers
+
+def _sqlite_parallel_begin() -> Optional[str]:
+    from app.loaders.database import engine
+    if engine.url.get_backend_name() == 'sqlite' and not os.getenv('DB_SQLITE_BEGIN'):
+        return SQLITE_PARALLEL_BEGIN
+    return None
+
+def _init_partition_worker(begin: Optional[str] = None):
+    # El proceso hijo no debe reutilizar las conexiones heredadas del padre
+    from app.loaders.database import engine
+    from app.loaders.engine_factory import set_sqlite_begin
+    engine.dispose(close=False)
+    if begin:
+        set_sqlite_begin(engine, begin)
+
+def _load_partition(rows: pd.DataFrame, audit_data: dict, batch_size: int, upsert: bool) -> Tuple[Dict, Dict]:
+    """Carga una porción de una partición con su propia sesión y retorna sus estadísticas y perfil."""
+    from app.loaders.database import SessionLocal
+    from app.loaders.load_data import load_rows_bulk
+    from app.loaders.logging_config import loader_logging
+
+    stats = new_stats()
+    profiler = ImportProfiler().start()
+    db = SessionLocal()
+    try:
+        load_rows_bulk(db, rows, audit_data, stats, batch_size, upsert, profiler)
+    finally:
+        db.close()
+        profiler.stop()
+        loader_logging.flush_repeated()
+    return stats, profiler.as_dict(len(rows))
+
+class PartitionedLoader:
+    """Carga las filas validadas en paralelo, particionadas por hash del documento.
+
+    Cada partición tiene su propio proceso y, por lo tanto, su propia conexión.
+    Las filas deben llegar con los códigos de datos maestros ya asignados, de
+    modo que los procesos no consultan ni crean datos maestros. Como mucho se
+    mantienen ``max_pending`` porciones en vuelo por partición.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        audit_data: dict,
+        stats: Dict,
+        batch_size: int,
+        upsert: bool = False,
+        profiler: Optional[ImportProfiler] = None,
+        max_pending: int = 2
+    ):
+        self.workers = workers
+        self.audit_data = audit_data
+        self.stats = stats
+        self.batch_size = batch_size
+        self.upsert = upsert
+        self.profiler = profiler
+        self.max_pending = max_pending
+        self._executors: List[ProcessPoolExecutor] = []
+        self._pending: Dict[Future, Tuple[int, List[int], Dict]] = {}
+        self._previous_begin: Optional[str] = None
+
+    def start(self) -> 'PartitionedLoader':
+        from app.loaders.database import engine
+        from app.loaders.engine_factory import set_sqlite_begin
+        begin = _sqlite_parallel_begin()
+        if begin:
+            # El proceso principal también escribe (datos maestros, checkpoint): usa el mismo modo
+            self._previous_begin = set_sqlite_begin(engine, begin)
+        self._executors = [
+            ProcessPoolExecutor(max_workers=1, initializer=_init_partition_worker, initargs=(begin,))
+            for _ in range(self.workers)
+        ]
+        return self
+
+    def close(self) -> None:
+        for executor in self._executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+        self._executors = []
+        self._pending.clear()
+        if self._previous_begin is not None:
+            from app.loaders.database import engine
+            from app.loaders.engine_factory import set_sqlite_begin
+            set_sqlite_begin(engine, self._previous_begin)
+            self._previous_begin = None
+
+    def _collect(self, done) -> None:
+        for future in done:
+            partition, filas, target = self._pending.pop(future)
+            try:
+                stats, profile = future.result()
+            except Exception as e:
+                # Sin las estadísticas de la porción, todas sus filas se reportan como error
+                logger.error(f"Error en la partición {partition}: {str(e)}")
+                target['errores'].extend(f"Error en fila {fila}: {str(e)}" for fila in filas)
+                continue
+            merge_stats(target, stats)
+            if self.profiler is not None:
+                self.profiler.merge_partition(str(partition), profile)
+
+    def submit(self, rows: pd.DataFrame, stats: Optional[Dict] = None) -> None:
+        """Reparte un bloque de filas entre las particiones y lo encola en sus procesos.
+
+        Su resultado se suma a ``stats`` o, si no se indica, a las estadísticas del cargador.
+        """
+        if rows.empty:
+            return
+        indices = partition_index(rows['v_num_documento'], self.workers)
+        for partition in range(self.workers):
+            part = rows[indices == partition]
+            if part.empty:
+                continue
+            future = self._executors[partition].submit(
+                _load_partition, part, self.audit_data, self.batch_size, self.upsert
+            )
+            self._pending[future] = (partition, part['fila'].tolist(), stats if stats is not None else self.stats)
+
+        # Limitar las porciones en vuelo para no acumular todo el archivo en memoria
+        while len(self._pending) > self.workers * self.max_pending:
+            done, _ = wait(list(self._pending), return_when=FIRST_COMPLETED)
+            self._collect(done)
+
+    def collect_finished(self) -> None:
+        """Incorpora las estadísticas de las porciones que ya terminaron."""
+        self._collect([future for future in self._pending if future.done()])
+
+    def finish(self) -> None:
+        """Espera a que todas las particiones terminen y suma sus estadísticas."""
+        done, _ = wait(list(self._pending))
+        self._collect(done)
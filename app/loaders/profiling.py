@@ -0,0 +1,185 @@
+# app/loaders/profiling.py
+import json
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger('data_loader')
+
+# Directorio donde se guarda el perfil JSON de cada importación
+PROFILE_DIR = os.getenv('IMPORT_PROFILE_DIR', os.path.join('data', 'profiles'))
+# Medir memoria con tracemalloc (se puede desactivar porque encarece las asignaciones)
+PROFILE_MEMORY = os.getenv('IMPORT_PROFILE_MEMORY', '1') != '0'
+
+class _Fase:
+    __slots__ = ('segundos', 'filas', 'llamadas', 'pico')
+
+    def __init__(self):
+        self.segundos = 0.0
+        self.filas = 0
+        self.llamadas = 0
+        self.pico = 0
+
+def _mb(value: int) -> float:
+    return round(value / (1024 * 1024), 2)
+
+def _por_segundo(filas: int, segundos: float) -> float:
+    return round(filas / segundos, 1) if segundos > 0 else 0.0
+
+class ImportProfiler:
+    """Acumula, por fase de la importación, tiempo, filas y pico de memoria.
+
+    Las fases pueden repetirse (una vez por bloque o lote) y sus valores se suman.
+    El pico de memoria es el máximo que reporta tracemalloc mientras la fase
+    estaba activa; si una fase se abre dentro de otra, su pico también cuenta
+    para la fase externa.
+    """
+
+    def __init__(self, nombre: str = '', memory: bool = PROFILE_MEMORY):
+        self.nombre = nombre
+        self.memory = memory
+        self.fases: Dict[str, _Fase] = {}
+        self._activas: List[_Fase] = []
+        self._inicio = None
+        self._fin = None
+        self._iniciado_en = None
+        self._started_tracing = False
+        self._pico_total = 0
+        # Perfiles de las particiones cargadas en otros procesos
+        self.particiones: Dict[str, Dict[str, Dict]] = {}
+
+    def start(self) -> 'ImportProfiler':
+        self._iniciado_en = datetime.now()
+        self._inicio = time.perf_counter()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def stop(self) -> None:
+        if self._fin is not None:
+            return
+        self._fin = time.perf_counter()
+        if self.memory and tracemalloc.is_tracing():
+            self._pico_total = max(self._pico_total, tracemalloc.get_traced_memory()[1])
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _fold_peak(self) -> None:
+        # Asignar el pico desde el último reinicio a las fases activas
+        if not (self.memory and tracemalloc.is_tracing()):
+            return
+        pico = tracemalloc.get_traced_memory()[1]
+        self._pico_total = max(self._pico_total, pico)
+        for fase in self._activas:
+            fase.pico = max(fase.pico, pico)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def phase(self, nombre: str, filas: int = 0) -> Iterator[_Fase]:
+        """Mide un tramo de la fase ``nombre``. Se puede sumar ``filas`` al objeto retornado."""
+        fase = self.fases.setdefault(nombre, _Fase())
+        fase.llamadas += 1
+        fase.filas += filas
+        self._fold_peak()
+        self._activas.append(fase)
+        inicio = time.perf_counter()
+        try:
+            yield fase
+        finally:
+            fase.segundos += time.perf_counter() - inicio
+            self._fold_peak()
+            self._activas.remove(fase)
+
+    def track(self, nombre: str, chunks: Iterable) -> Iterator:
+        """Envuelve un iterador de bloques midiendo cada lectura como la fase ``nombre``."""
+        iterator = iter(chunks)
+        while True:
+            with self.phase(nombre) as fase:
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    fase.llamadas -= 1
+                    return
+                fase.filas += len(chunk)
+            yield chunk
+
+    def merge_partition(self, nombre: str, profile: Dict) -> None:
+        """Acumula las fases de un perfil generado en otro proceso bajo la partición ``nombre``."""
+        fases = self.particiones.setdefault(nombre, {})
+        for fase, datos in profile['fases'].items():
+            actual = fases.setdefault(fase, {
+                'segundos': 0.0, 'llamadas': 0, 'filas': 0,
+                'filas_por_segundo': 0.0, 'memoria_pico_mb': None
+            })
+            actual['segundos'] = round(actual['segundos'] + datos['segundos'], 3)
+            actual['llamadas'] += datos['llamadas']
+            actual['filas'] += datos['filas']
+            actual['filas_por_segundo'] = _por_segundo(actual['filas'], actual['segundos'])
+            if datos['memoria_pico_mb'] is not None:
+                actual['memoria_pico_mb'] = max(actual['memoria_pico_mb'] or 0.0, datos['memoria_pico_mb'])
+
+    def as_dict(self, filas: int = 0) -> Dict:
+        fin = self._fin if self._fin is not None else time.perf_counter()
+        duracion = fin - self._inicio if self._inicio is not None else 0.0
+        profile = {
+            'archivo': self.nombre,
+            'iniciado': self._iniciado_en.isoformat() if self._iniciado_en else None,
+            'duracion_segundos': round(duracion, 3),
+            'filas': filas,
+            'filas_por_segundo': _por_segundo(filas, duracion),
+            'memoria_pico_mb': _mb(self._pico_total) if self.memory else None,
+            'fases': {
+                nombre: {
+                    'segundos': round(fase.segundos, 3),
+                    'llamadas': fase.llamadas,
+                    'filas': fase.filas,
+                    'filas_por_segundo': _por_segundo(fase.filas, fase.segundos),
+                    'memoria_pico_mb': _mb(fase.pico) if self.memory else None,
+                }
+                for nombre, fase in self.fases.items()
+            },
+        }
+        if self.particiones:
+            profile['particiones'] = self.particiones
+        return profile
+
+    def log_summary(self, profile: Dict) -> None:
+        lineas = [
+            f"- {nombre}: {fase['segundos']}s, {fase['filas']} filas, "
+            f"{fase['filas_por_segundo']} filas/s, pico {fase['memoria_pico_mb']} MB"
+            for nombre, fase in profile['fases'].items()
+        ]
+        logger.info(
+            f"Perfil de importación ({profile['duracion_segundos']}s, "
+            f"{profile['filas_por_segundo']} filas/s):\n" + "\n".join(lineas)
+        )
+
+def write_profile(profile: Dict, directory: str = PROFILE_DIR) -> Optional[str]:
+    """Guarda el perfil como JSON y retorna su ruta, o None si no se pudo escribir."""
+    try:
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.splitext(os.path.basename(profile.get('archivo') or 'importacion'))[0]
+        file_path = os.path.join(
+            directory, f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{base}.json"
+        )
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, ensure_ascii=False, indent=2)
+        return file_path
+    except OSError as e:
+        logger.warning(f"No se pudo guardar el perfil de la importación: {str(e)}")
+        return None
+
+@contextmanager
+def profile_phase(profiler: Optional[ImportProfiler], nombre: str, filas: int = 0) -> Iterator[Optional[_Fase]]:
+    """Como ``ImportProfiler.phase``, pero no mide nada si ``profiler`` es None."""
+    if profiler is None:
+        yield None
+        return
+    with profiler.phase(nombre, filas) as fase:
+        yield fase
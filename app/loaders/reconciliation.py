@@ -0,0 +1,152 @@
+# app/loaders/reconciliation.py
+import logging
+import os
+from typing import Dict, Iterable, Optional
+from sqlalchemy import Column, MetaData, String, Table, exists, func, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.models.persona import Persona
+from app.models.persona_trabajador import PersonaTrabajador
+
+logger = logging.getLogger('data_loader')
+
+# Modos de reconciliación de ``process_excel``
+RECONCILIAR_PREVIEW = 'preview'
+RECONCILIAR_APLICAR = 'aplicar'
+MODOS_RECONCILIACION = (RECONCILIAR_PREVIEW, RECONCILIAR_APLICAR)
+
+# Proporción máxima de trabajadores activos que se puede desactivar sin forzarlo;
+# protege de un extracto incompleto que dejaría sin vigencia a casi todos
+RECONCILE_MAX_RATIO = float(os.getenv('IMPORT_RECONCILE_MAX_RATIO', '0.2'))
+# Documentos por sentencia al copiar el extracto a la tabla temporal
+COPY_CHUNK_SIZE = 1000
+
+def documents_table(dialect_name: str) -> Table:
+    """Tabla temporal con los documentos del extracto, según el dialecto."""
+    is_mssql = dialect_name == 'mssql'
+    return Table(
+        '#stg_documentos' if is_mssql else 'stg_documentos',
+        MetaData(),
+        Column('v_num_documento', String(20), primary_key=True),
+        prefixes=[] if is_mssql else ['TEMPORARY'],
+    )
+
+class SnapshotReconciliation:
+    """Compara el extracto completo con los trabajadores activos.
+
+    Los documentos del extracto se copian a una tabla temporal y un anti-join
+    (``NOT EXISTS``) encuentra los trabajadores activos cuya persona ya no figura.
+    Debe usarse como context manager sobre una conexión que se mantenga abierta.
+    """
+
+    def __init__(self, conn: Connection):
+        self.conn = conn
+        self.table = documents_table(conn.dialect.name)
+
+    def __enter__(self) -> 'SnapshotReconciliation':
+        self.table.drop(self.conn, checkfirst=True)
+        self.table.create(self.conn)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        try:
+            self.table.drop(self.conn, checkfirst=True)
+        except Exception as e:
+            logger.warning(f"No se pudo eliminar la tabla de documentos: {str(e)}")
+
+    def copy(self, documentos: Iterable[str]) -> int:
+        documentos = sorted(set(documentos))
+        for start in range(0, len(documentos), COPY_CHUNK_SIZE):
+            self.conn.execute(
+                insert(self.table),
+                [{'v_num_documento': documento} for documento in documentos[start:start + COPY_CHUNK_SIZE]]
+            )
+        return len(documentos)
+
+    def _faltante(self):
+        # El trabajador falta si ninguna persona con su código figura en el extracto
+        return ~exists(
+            select(1)
+            .select_from(Persona)
+            .join(self.table, self.table.c.v_num_documento == Persona.v_num_documento)
+            .where(Persona.i_cod_persona == PersonaTrabajador.i_cod_persona)
+        )
+
+    def preview(self, sample_size: int = 10) -> Dict:
+        """Cuenta los trabajadores activos y los que se desactivarían, con una muestra de documentos."""
+        activos = self.conn.execute(
+            select(func.count()).select_from(PersonaTrabajador).where(PersonaTrabajador.i_est_registro == 1)
+        ).scalar()
+        a_desactivar = self.conn.execute(
+            select(func.count())
+            .select_from(PersonaTrabajador)
+            .where(PersonaTrabajador.i_est_registro == 1, self._faltante())
+        ).scalar()
+        ejemplos = self.conn.execute(
+            select(Persona.v_num_documento)
+            .join(PersonaTrabajador, PersonaTrabajador.i_cod_persona == Persona.i_cod_persona)
+            .where(PersonaTrabajador.i_est_registro == 1, self._faltante())
+            .order_by(Persona.v_num_documento)
+            .limit(sample_size)
+        ).scalars().all()
+        return {'activos': activos, 'a_desactivar': a_desactivar, 'ejemplos': ejemplos}
+
+    def apply(self, mod_data: dict) -> int:
+        """Desactiva en un único UPDATE los trabajadores activos que faltan en el extracto."""
+        result = self.conn.execute(
+            update(PersonaTrabajador)
+            .where(PersonaTrabajador.i_est_registro == 1, self._faltante())
+            .values(i_est_registro=0, **mod_data)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+def reconcile_snapshot(
+    db: Session,
+    documentos: Iterable[str],
+    mod_data: dict,
+    aplicar: bool = False,
+    max_ratio: Optional[float] = RECONCILE_MAX_RATIO
+) -> Dict:
+    """Desactiva (``i_est_registro = 0``) los trabajadores activos que no están en el extracto.
+
+    Siempre calcula primero la vista previa; con ``aplicar=False`` solo la retorna.
+    Si la proporción a desactivar supera ``max_ratio`` no se aplica nada (usar
+    ``max_ratio=None`` para forzarlo). ``mod_data`` son los campos de auditoría
+    de modificación.
+    """
+    with SnapshotReconciliation(db.connection()) as reconciliation:
+        documentos_extracto = reconciliation.copy(documentos)
+        resultado = {
+            'documentos_extracto': documentos_extracto,
+            **reconciliation.preview(),
+            'desactivados': 0,
+            'aplicado': False,
+            'motivo': None,
+        }
+        logger.info(
+            f"Reconciliación: {resultado['a_desactivar']} de {resultado['activos']} trabajadores "
+            f"activos no figuran en el extracto ({documentos_extracto} documentos)"
+        )
+
+        if not documentos_extracto:
+            resultado['motivo'] = "El extracto no contiene documentos"
+        elif aplicar and resultado['a_desactivar']:
+            ratio = resultado['a_desactivar'] / resultado['activos']
+            if max_ratio is not None and ratio > max_ratio:
+                resultado['motivo'] = (
+                    f"Se desactivaría el {ratio:.0%} de los trabajadores activos "
+                    f"(máximo permitido {max_ratio:.0%})"
+                )
+            else:
+                resultado['desactivados'] = reconciliation.apply(mod_data)
+                resultado['aplicado'] = True
+
+    if resultado['motivo']:
+        logger.error(f"Reconciliación no aplicada: {resultado['motivo']}")
+        db.rollback()
+    else:
+        db.commit()
+        if resultado['aplicado']:
+            logger.warning(f"Reconciliación: {resultado['desactivados']} trabajadores desactivados")
+    return resultado
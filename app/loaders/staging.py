@@ -0,0 +1,189 @@
+# app/loaders/staging.py
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+import pandas as pd
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table,
+    exists, func, insert, literal, null, select, update
+)
+from sqlalchemy.engine import Connection
+from app.loaders.master_data import MODEL_MAP, LOCK_HINT
+from app.loaders.profiling import ImportProfiler, profile_phase
+from app.loaders.validation import to_records
+from app.models.persona import Persona
+from app.models.persona_trabajador import PersonaTrabajador
+
+logger = logging.getLogger('data_loader')
+
+STAGING_COLUMNS = [
+    'fila', 'v_num_documento', 'v_des_nombres', 'v_des_apellidos', 'v_cod_empresa',
+    *MODEL_MAP, 't_fec_ingreso'
+]
+
+def staging_table(dialect_name: str) -> Table:
+    """Define la tabla temporal de staging según el dialecto.
+
+    En SQL Server las tablas temporales se nombran con ``#``; en el resto se usa
+    ``CREATE TEMPORARY TABLE``.
+    """
+    is_mssql = dialect_name == 'mssql'
+    return Table(
+        '#stg_importacion' if is_mssql else 'stg_importacion',
+        MetaData(),
+        Column('fila', Integer, nullable=False),
+        Column('v_num_documento', String(20), nullable=False),
+        Column('v_des_nombres', String(100), nullable=False),
+        Column('v_des_apellidos', String(100), nullable=False),
+        Column('v_cod_empresa', String(20)),
+        *[Column(data_type, String(100)) for data_type in MODEL_MAP],
+        Column('t_fec_ingreso', DateTime),
+        Column('i_es_nuevo', Integer, nullable=False, default=0),
+        prefixes=[] if is_mssql else ['TEMPORARY'],
+    )
+
+class StagingImport:
+    """Motor de importación por staging.
+
+    Las filas validadas se copian a una tabla temporal y, al final, un
+    ``INSERT ... SELECT`` por tabla destino resuelve los códigos de los datos
+    maestros y crea las personas y trabajadores que faltan dentro de la base.
+    Todo ocurre en la conexión recibida, que debe mantenerse durante la carga.
+    """
+
+    def __init__(self, conn: Connection, audit_data: dict):
+        self.conn = conn
+        self.audit_data = audit_data
+        self.table = staging_table(conn.dialect.name)
+        self.copiadas = 0
+
+    def __enter__(self) -> 'StagingImport':
+        self.table.drop(self.conn, checkfirst=True)
+        self.table.create(self.conn)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        try:
+            self.table.drop(self.conn, checkfirst=True)
+        except Exception as e:
+            logger.warning(f"No se pudo eliminar la tabla de staging: {str(e)}")
+
+    def _audit_columns(self) -> Dict:
+        return {
+            name: literal(value) if value is not None else null()
+            for name, value in self.audit_data.items()
+        }
+
+    def _code_of(self, data_type: str, name_column):
+        # Subconsulta escalar: evita duplicar filas si el catálogo repite nombres
+        model, _ = MODEL_MAP[data_type]
+        id_col = getattr(model, f'i_cod_{data_type}')
+        return (
+            select(func.min(id_col))
+            .where(model.v_des_nombre == name_column)
+            .scalar_subquery()
+        )
+
+    def copy(self, rows: pd.DataFrame) -> None:
+        """Copia al staging un bloque de filas validadas (salida de ``validate_rows``)."""
+        if rows.empty:
+            return
+        self.conn.execute(insert(self.table), to_records(rows[STAGING_COLUMNS]))
+        self.copiadas += len(rows)
+
+    def _insert_catalog(self, data_type: str) -> int:
+        model, _ = MODEL_MAP[data_type]
+        stg = self.table
+        audit = self._audit_columns()
+        nuevo = ~exists(
+            select(1)
+            .where(model.v_des_nombre == stg.c[data_type])
+            .with_hint(model, LOCK_HINT, 'mssql')
+        )
+
+        if data_type == 'area':
+            # Cada área nueva toma la unidad de su primera fila con unidad
+            primeras = (
+                select(stg.c.area, func.min(stg.c.fila).label('fila'))
+                .where(stg.c.area.is_not(None), stg.c.unidad.is_not(None), nuevo)
+                .group_by(stg.c.area)
+                .subquery()
+            )
+            source = (
+                select(primeras.c.area, self._code_of('unidad', stg.c.unidad), *audit.values())
+                .select_from(primeras.join(stg, stg.c.fila == primeras.c.fila))
+            )
+            columns = ['v_des_nombre', 'i_cod_unidad', *audit]
+        else:
+            nombres = (
+                select(stg.c[data_type].label('v_des_nombre'))
+                .where(stg.c[data_type].is_not(None), nuevo)
+                .distinct()
+                .subquery()
+            )
+            source = select(nombres.c.v_des_nombre, *audit.values())
+            columns = ['v_des_nombre', *audit]
+
+        return self.conn.execute(insert(model).from_select(columns, source)).rowcount
+
+    def merge(self, stats: Dict, profiler: Optional[ImportProfiler] = None) -> None:
+        """Crea en la base los datos maestros, personas y trabajadores que faltan."""
+        stg = self.table
+        audit = self._audit_columns()
+
+        with profile_phase(profiler, 'datos_maestros', self.copiadas):
+            for data_type in MODEL_MAP:
+                creados = self._insert_catalog(data_type)
+                logger.info(f"Procesados datos maestros de {data_type}: {creados} nuevos")
+
+        # Marcar las filas cuyas personas no existen
+        with profile_phase(profiler, 'consulta_existentes', self.copiadas):
+            self.conn.execute(
+                update(stg)
+                .values(i_es_nuevo=1)
+                .where(~exists(
+                    select(1)
+                    .where(Persona.v_num_documento == stg.c.v_num_documento)
+                    .with_hint(Persona, LOCK_HINT, 'mssql')
+                ))
+            )
+            nuevos = self.conn.execute(
+                select(func.count()).select_from(stg).where(stg.c.i_es_nuevo == 1)
+            ).scalar()
+
+        persona_columns = ['v_num_documento', 'v_des_nombres', 'v_des_apellidos', 'v_cod_empresa']
+        with profile_phase(profiler, 'insercion_persona', nuevos):
+            self.conn.execute(
+                insert(Persona).from_select(
+                    [*persona_columns, *audit],
+                    select(*[stg.c[col] for col in persona_columns], *audit.values())
+                    .where(stg.c.i_es_nuevo == 1)
+                )
+            )
+
+        cod_persona = (
+            select(Persona.i_cod_persona)
+            .where(Persona.v_num_documento == stg.c.v_num_documento)
+            .scalar_subquery()
+        )
+        with profile_phase(profiler, 'insercion_trabajador', nuevos):
+            self.conn.execute(
+                insert(PersonaTrabajador).from_select(
+                    [
+                        'i_cod_persona', *[f'i_cod_{data_type}' for data_type in MODEL_MAP],
+                        't_fec_ingreso', *audit
+                    ],
+                    select(
+                        cod_persona,
+                        *[self._code_of(data_type, stg.c[data_type]) for data_type in MODEL_MAP],
+                        func.coalesce(stg.c.t_fec_ingreso, literal(datetime.now())),
+                        *audit.values()
+                    )
+                    .where(stg.c.i_es_nuevo == 1)
+                )
+            )
+
+        stats['procesados'] += nuevos
+        stats['omitidos'] += self.copiadas - nuevos
+        if self.copiadas - nuevos:
+            logger.warning(f"{self.copiadas - nuevos} personas ya existen - Omitiendo")
@@ -0,0 +1,108 @@
+# app/loaders/validation.py
+import logging
+from typing import Dict, List, Set, Tuple
+import numpy as np
+import pandas as pd
+from app.loaders.master_data import MODEL_MAP, normalize_names
+
+logger = logging.getLogger('data_loader')
+
+# Motivos de rechazo que se cuentan como omitidos y no como errores
+MOTIVO_REPETIDO = "Documento repetido en el archivo"
+MOTIVOS_OMITIDOS = (MOTIVO_REPETIDO,)
+
+# Columnas obligatorias de la persona y el motivo de rechazo cuando faltan
+REQUIRED_FIELDS = {
+    'v_num_documento': "Número de documento es nulo",
+    'v_des_nombres': "Nombres es nulo",
+    'v_des_apellidos': "Primer apellido es nulo",
+}
+
+def check_null_values(df: pd.DataFrame, required_cols: list, sample_size: int = 5) -> None:
+    """Registra en el log la cantidad de valores nulos por columna requerida, con una muestra de filas."""
+    nulls = df[required_cols].isna()
+    counts = nulls.sum()
+    for col in counts[counts > 0].index:
+        null_rows = df.index[nulls[col]]
+        sample = df.loc[null_rows[:sample_size], 'ID de persona']
+        ejemplos = ', '.join(
+            f"{'No ID' if pd.isna(id_persona) else id_persona} (fila {idx + 1})"
+            for idx, id_persona in sample.items()
+        )
+        logger.warning(f"Columna {col} tiene {counts[col]} valores nulos. Ejemplos: {ejemplos}")
+
+def normalize_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza las columnas del Excel con operaciones vectorizadas."""
+    rows = pd.DataFrame(index=df.index)
+    rows['fila'] = df.index + 1
+    rows['v_num_documento'] = normalize_names(df['Numero documento'])
+    rows['v_des_nombres'] = normalize_names(df['Nombres'])
+    rows['v_des_apellidos'] = normalize_names(df['Primer apellido'])
+    rows['v_cod_empresa'] = df['ID de persona'].astype('string').str.zfill(8)
+    for data_type, (_, column) in MODEL_MAP.items():
+        rows[data_type] = normalize_names(df[column])
+    rows['t_fec_ingreso'] = pd.to_datetime(df['Fecha de ingreso'], errors='coerce', format='mixed')
+    return rows
+
+def validate_rows(df: pd.DataFrame, vistos: Set[str] | None = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Valida y normaliza un bloque del Excel en una sola pasada.
+
+    Retorna ``(limpias, rechazadas)``. Las rechazadas tienen las columnas ``fila``,
+    ``v_num_documento`` y ``motivo``. ``vistos`` acumula los documentos aceptados
+    cuando el archivo se valida en varios bloques.
+    """
+    vistos = set() if vistos is None else vistos
+    rows = normalize_rows(df)
+
+    motivo = pd.Series(pd.NA, index=rows.index, dtype='string')
+    for column, reason in REQUIRED_FIELDS.items():
+        motivo = motivo.mask(motivo.isna() & rows[column].isna(), reason)
+
+    repetidos = rows['v_num_documento'].duplicated() | rows['v_num_documento'].isin(vistos)
+    motivo = motivo.mask(motivo.isna() & repetidos & rows['v_num_documento'].notna(), MOTIVO_REPETIDO)
+
+    fechas_invalidas = df['Fecha de ingreso'].notna() & rows['t_fec_ingreso'].isna()
+    if fechas_invalidas.any():
+        ejemplos = ', '.join(rows.loc[fechas_invalidas, 'v_num_documento'].dropna().head(5))
+        logger.warning(
+            f"{int(fechas_invalidas.sum())} fechas de ingreso inválidas; se usará la fecha actual. "
+            f"Documentos: {ejemplos}"
+        )
+
+    rechazadas = rows.loc[motivo.notna(), ['fila', 'v_num_documento']].assign(motivo=motivo.dropna())
+    limpias = rows[motivo.isna()]
+    vistos.update(limpias['v_num_documento'])
+    return limpias, rechazadas
+
+def register_rejects(rechazadas: pd.DataFrame, stats: Dict) -> None:
+    """Suma las filas rechazadas a las estadísticas de la importación."""
+    omitidas = rechazadas['motivo'].isin(MOTIVOS_OMITIDOS)
+    stats['omitidos'] += int(omitidas.sum())
+    if omitidas.any():
+        logger.warning(f"{int(omitidas.sum())} documentos repetidos en el archivo - Omitiendo")
+
+    errores = rechazadas[~omitidas]
+    stats['errores'].extend(
+        f"Error en fila {fila}: {motivo}" for fila, motivo in zip(errores['fila'], errores['motivo'])
+    )
+
+def map_master_data(rows: pd.DataFrame, master_data: Dict) -> pd.DataFrame:
+    """Reemplaza los nombres de los datos maestros por sus códigos."""
+    mapped = rows.drop(columns=list(MODEL_MAP))
+    for data_type in MODEL_MAP:
+        mapped[f'i_cod_{data_type}'] = rows[data_type].map(master_data[data_type]).astype('Int64')
+    return mapped
+
+def to_records(frame: pd.DataFrame) -> List[dict]:
+    """Convierte el DataFrame en diccionarios con tipos de Python y None en lugar de nulos."""
+    columns = {}
+    for column in frame.columns:
+        series = frame[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            # numpy convierte datetime64[us] en objetos datetime de Python
+            values = series.astype('datetime64[us]').to_numpy().astype(object)
+        else:
+            values = np.array(series.astype(object), dtype=object)
+        values[series.isna().to_numpy()] = None
+        columns[column] = values
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
@@ -0,0 +1,334 @@
+# app/loaders/watcher.py
+"""Servicio que vigila una carpeta e importa los extractos de RR. HH. que se depositan en ella.
+
+Uso:
+    python -m app.loaders.watcher [--carpeta data/entrada] [--workers 2] [--una-vez]
+
+Cada archivo se toma cuando su tamaño deja de cambiar, se mueve a la carpeta de trabajo
+y se importa en un proceso separado. Al terminar se mueve a la carpeta de procesados
+o de fallidos junto con su reporte JSON.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import signal
+import socket
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from app.loaders.reconciliation import MODOS_RECONCILIACION
+
+logger = logging.getLogger('ingestion')
+
+# Carpeta donde el sistema de planillas deposita los extractos
+WATCH_DIR = os.getenv('IMPORT_WATCH_DIR', os.path.join('data', 'entrada'))
+# Carpeta con los archivos tomados que esperan o están en importación
+WORK_DIR = os.getenv('IMPORT_WATCH_WORK_DIR', os.path.join('data', 'en_proceso'))
+PROCESSED_DIR = os.getenv('IMPORT_WATCH_PROCESSED_DIR', os.path.join('data', 'procesados'))
+FAILED_DIR = os.getenv('IMPORT_WATCH_FAILED_DIR', os.path.join('data', 'fallidos'))
+# Importaciones simultáneas
+WATCH_WORKERS = int(os.getenv('IMPORT_WATCH_WORKERS', '2'))
+# Segundos entre revisiones de la carpeta
+WATCH_INTERVAL = float(os.getenv('IMPORT_WATCH_INTERVAL', '5'))
+# Segundos que el tamaño de un archivo debe mantenerse para considerarlo completo
+WATCH_STABLE_SECONDS = float(os.getenv('IMPORT_WATCH_STABLE_SECONDS', '10'))
+
+EXTENSIONES = ('.xlsx', '.xls')
+
+def _is_candidate(nombre: str) -> bool:
+    # Ignorar archivos temporales de Excel (~$...) y ocultos
+    return nombre.lower().endswith(EXTENSIONES) and not nombre.startswith(('~$', '.'))
+
+def _original_name(file_path: str) -> str:
+    # Los archivos tomados llevan el prefijo ``<uuid>_``, como los de ``spool_upload``
+    return os.path.basename(file_path).split('_', 1)[-1]
+
+class StableFileTracker:
+    """Detecta los archivos cuyo tamaño y fecha de modificación no cambian durante ``stable_seconds``."""
+
+    def __init__(self, stable_seconds: float = WATCH_STABLE_SECONDS):
+        self.stable_seconds = stable_seconds
+        self._vistos: Dict[str, Tuple[int, int, float]] = {}
+
+    def poll(self, directory: str) -> List[str]:
+        """Retorna las rutas de los archivos que ya terminaron de escribirse."""
+        now = time.monotonic()
+        listos, actuales = [], {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or not _is_candidate(entry.name):
+                    continue
+                try:
+                    info = entry.stat()
+                except OSError:
+                    continue
+                firma = (info.st_size, info.st_mtime_ns)
+                anterior = self._vistos.get(entry.path)
+                desde = anterior[2] if anterior and anterior[:2] == firma else now
+                actuales[entry.path] = (*firma, desde)
+                if now - desde >= self.stable_seconds:
+                    listos.append(entry.path)
+        # Olvidar los archivos que ya no están
+        self._vistos = actuales
+        return sorted(listos)
+
+    def forget(self, file_path: str) -> None:
+        self._vistos.pop(file_path, None)
+
+    def waiting(self) -> bool:
+        """Indica si en la última revisión quedaron archivos aún no tomados."""
+        return bool(self._vistos)
+
+class IngestionDaemon:
+    """Toma los extractos estables de ``watch_dir`` y los importa con hasta ``workers`` procesos.
+
+    Los archivos tomados pasan a ``work_dir``, de modo que al reiniciar el servicio
+    los que quedaron a medias se vuelven a encolar y continúan desde su punto de
+    reanudación. Un archivo cuyo contenido ya fue importado, o se está importando
+    desde otro origen (p. ej. la API), se mueve a procesados sin volver a cargarse.
+    Si la importación en curso es de este mismo servicio (otra copia del archivo o
+    una ejecución anterior que se detuvo), el archivo se queda en ``work_dir`` y se
+    reintenta en cada revisión hasta que esa importación termine o se considere
+    interrumpida.
+    """
+
+    def __init__(
+        self,
+        watch_dir: str = WATCH_DIR,
+        work_dir: str = WORK_DIR,
+        processed_dir: str = PROCESSED_DIR,
+        failed_dir: str = FAILED_DIR,
+        workers: int = WATCH_WORKERS,
+        interval: float = WATCH_INTERVAL,
+        stable_seconds: float = WATCH_STABLE_SECONDS,
+        reconcile: Optional[str] = None
+    ):
+        from app.services.import_job_service import ImportJobManager
+
+        self.watch_dir = watch_dir
+        self.work_dir = work_dir
+        self.processed_dir = processed_dir
+        self.failed_dir = failed_dir
+        self.workers = workers
+        self.interval = interval
+        self.reconcile = reconcile
+        self.tracker = StableFileTracker(stable_seconds)
+        self.job_manager = ImportJobManager(max_workers=workers)
+        # Ruta en la carpeta de trabajo -> (id del trabajo, hash del archivo)
+        self.en_curso: Dict[str, Tuple[str, str]] = {}
+        # Ruta en la carpeta de trabajo -> hash, de los archivos que esperan a otra importación propia
+        self.diferidos: Dict[str, str] = {}
+        self._stop = threading.Event()
+        for directory in (watch_dir, work_dir, processed_dir, failed_dir):
+            os.makedirs(directory, exist_ok=True)
+
+    def stop(self, *_) -> None:
+        """Deja de tomar archivos nuevos; las importaciones en curso terminan normalmente."""
+        if not self._stop.is_set():
+            logger.info("Deteniendo el servicio de ingesta; esperando las importaciones en curso")
+        self._stop.set()
+
+    def _audit_data(self) -> dict:
+        host = socket.gethostname()
+        return {
+            "v_ip_reg": socket.gethostbyname(host),
+            "v_ip_mod": socket.gethostbyname(host),
+            "v_host_reg": host,
+            "v_host_mod": host,
+            "v_usu_reg": "ingesta",
+            "v_usu_mod": "ingesta"
+        }
+
+    def _es_propia(self, importacion) -> bool:
+        # El último en registrar la importación figura en los campos de modificación
+        usuario = importacion.v_usu_mod or importacion.v_usu_reg
+        host = importacion.v_host_mod or importacion.v_host_reg
+        return usuario == "ingesta" and host == socket.gethostname()
+
+    def claim_ready_files(self) -> int:
+        """Mueve a la carpeta de trabajo los archivos que terminaron de escribirse."""
+        tomados = 0
+        for file_path in self.tracker.poll(self.watch_dir):
+            destino = os.path.join(self.work_dir, f"{uuid.uuid4().hex}_{os.path.basename(file_path)}")
+            try:
+                shutil.move(file_path, destino)
+            except OSError as e:
+                # Puede seguir abierto por quien lo escribe; se reintenta en la próxima revisión
+                logger.warning(f"No se pudo tomar {file_path}: {str(e)}")
+                continue
+            self.tracker.forget(file_path)
+            logger.info(f"Archivo tomado: {os.path.basename(file_path)}")
+            tomados += 1
+        return tomados
+
+    def _pending_files(self) -> List[str]:
+        with os.scandir(self.work_dir) as entries:
+            rutas = [
+                entry.path for entry in entries
+                if entry.is_file() and _is_candidate(entry.name) and entry.path not in self.en_curso
+            ]
+        # Los más antiguos primero
+        return sorted(rutas, key=os.path.getmtime)
+
+    def _start(self, file_path: str) -> None:
+        from app.loaders.database import SessionLocal
+        from app.repositories.importacion_repository import ImportacionRepository
+        from app.services.importacion_service import ImportacionService
+        from app.services.upload_service import file_sha256
+
+        nombre = _original_name(file_path)
+        file_hash = self.diferidos.get(file_path) or file_sha256(file_path)
+        db = SessionLocal()
+        try:
+            _, existing = ImportacionService(ImportacionRepository(db)).registrar(
+                file_hash, nombre, self._audit_data()
+            )
+            estado_existente = existing.v_est_importacion if existing else None
+            propia = existing is not None and self._es_propia(existing)
+        finally:
+            db.close()
+
+        if estado_existente in ('PENDIENTE', 'PROCESANDO') and propia:
+            # La importación es de este servicio: si falla o se interrumpe, este archivo
+            # debe poder reanudarla, por lo que se reintenta en la próxima revisión
+            if file_path not in self.diferidos:
+                logger.info(f"{nombre}: el mismo contenido se está importando en este servicio; se reintentará")
+            self.diferidos[file_path] = file_hash
+            return
+        self.diferidos.pop(file_path, None)
+        if estado_existente in ('PENDIENTE', 'PROCESANDO'):
+            # Otra importación del mismo contenido sigue en curso (p. ej. desde la API): se
+            # archiva con su reporte en lugar de reintentarlo en cada revisión
+            logger.info(f"{nombre}: el mismo contenido se está importando (estado: {estado_existente})")
+            self._archive(file_path, self.processed_dir, {
+                'archivo': nombre,
+                'hash': file_hash,
+                'estado': 'EN_CURSO',
+                'mensaje': f"El mismo contenido se está importando (estado: {estado_existente})",
+            })
+            return
+        if estado_existente:
+            logger.info(f"{nombre}: el contenido ya fue importado (estado: {estado_existente})")
+            self._archive(file_path, self.processed_dir, {
+                'archivo': nombre,
+                'hash': file_hash,
+                'estado': 'DUPLICADO',
+                'mensaje': f"El archivo ya fue importado (estado: {estado_existente})",
+            })
+            return
+
+        job_id = self.job_manager.submit(file_path, nombre, file_hash, self.reconcile)
+        self.en_curso[file_path] = (job_id, file_hash)
+        logger.info(f"{nombre}: importación encolada (trabajo {job_id})")
+
+    def start_pending(self) -> None:
+        """Encola los archivos de la carpeta de trabajo hasta completar ``workers`` importaciones."""
+        for file_path in self._pending_files():
+            if len(self.en_curso) >= self.workers or self._stop.is_set():
+                return
+            try:
+                self._start(file_path)
+            except Exception as e:
+                # P. ej. la base no responde: el archivo se queda en la carpeta de trabajo
+                logger.error(f"No se pudo encolar {_original_name(file_path)}: {str(e)}")
+
+    def collect_finished(self) -> None:
+        """Archiva los archivos cuyas importaciones terminaron, con su reporte."""
+        from app.services.import_job_service import ESTADOS_FINALES
+
+        for file_path, (job_id, file_hash) in list(self.en_curso.items()):
+            job = self.job_manager.get(job_id)
+            if job is None or job['estado'] not in ESTADOS_FINALES:
+                continue
+            del self.en_curso[file_path]
+            destino = self.processed_dir if job['estado'] == 'COMPLETADO' else self.failed_dir
+            logger.info(
+                f"{job['archivo']}: {job['estado']} - procesados {job['procesados']}, "
+                f"actualizados {job['actualizados']}, omitidos {job['omitidos']}, errores {job['errores']}"
+            )
+            self._archive(file_path, destino, {'hash': file_hash, **job})
+
+    def _archive(self, file_path: str, directory: str, reporte: Dict) -> None:
+        base = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{_original_name(file_path)}"
+        shutil.move(file_path, os.path.join(directory, base))
+        with open(os.path.join(directory, f"{base}.json"), 'w', encoding='utf-8') as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2, default=str)
+
+    def run_once(self) -> None:
+        self.collect_finished()
+        if not self._stop.is_set():
+            self.claim_ready_files()
+        self.start_pending()
+
+    def run(self, once: bool = False) -> None:
+        """Revisa la carpeta cada ``interval`` segundos hasta ``stop``.
+
+        Con ``once=True`` toma los archivos listos, espera sus importaciones y termina.
+        """
+        logger.info(f"Vigilando {os.path.abspath(self.watch_dir)} con {self.workers} importaciones simultáneas")
+        try:
+            while True:
+                self.run_once()
+                # Con ``once`` no se espera a que venzan las importaciones propias interrumpidas:
+                # sus archivos quedan en la carpeta de trabajo para la próxima ejecución
+                pendientes = [ruta for ruta in self._pending_files() if ruta not in self.diferidos]
+                if once and not (self.en_curso or self.tracker.waiting() or pendientes):
+                    break
+                if self._stop.is_set():
+                    if not self.en_curso:
+                        break
+                    time.sleep(self.interval)
+                else:
+                    self._stop.wait(self.interval)
+        finally:
+            self.job_manager.shutdown()
+            logger.info("Servicio de ingesta detenido")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.loaders.watcher",
+        description="Vigila una carpeta e importa los extractos Excel que se depositan en ella."
+    )
+    parser.add_argument("--carpeta", default=WATCH_DIR, help="Carpeta vigilada")
+    parser.add_argument("--en-proceso", default=WORK_DIR, help="Carpeta de los archivos tomados")
+    parser.add_argument("--procesados", default=PROCESSED_DIR, help="Carpeta de los archivos importados")
+    parser.add_argument("--fallidos", default=FAILED_DIR, help="Carpeta de los archivos que no se pudieron importar")
+    parser.add_argument("--workers", type=int, default=WATCH_WORKERS, help="Importaciones simultáneas")
+    parser.add_argument("--intervalo", type=float, default=WATCH_INTERVAL, help="Segundos entre revisiones")
+    parser.add_argument(
+        "--estable", type=float, default=WATCH_STABLE_SECONDS,
+        help="Segundos sin cambios de tamaño para considerar completo un archivo"
+    )
+    parser.add_argument(
+        "--reconciliar", choices=MODOS_RECONCILIACION,
+        help="Reconciliar los trabajadores activos con cada extracto importado"
+    )
+    parser.add_argument("--una-vez", action="store_true", help="Procesar los archivos presentes y terminar")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    daemon = IngestionDaemon(
+        watch_dir=args.carpeta,
+        work_dir=args.en_proceso,
+        processed_dir=args.procesados,
+        failed_dir=args.fallidos,
+        workers=args.workers,
+        interval=args.intervalo,
+        stable_seconds=args.estable,
+        reconcile=args.reconciliar
+    )
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    daemon.run(once=args.una_vez)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
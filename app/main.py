@@ -1,12 +1,16 @@
 # main.py
 from fastapi import FastAPI, Request
 from app.loaders.database import init_db
+from app.services.import_job_service import import_job_manager
+from app.services.password_service import password_hasher
+from app.services.loop_monitor import LOOP_MONITOR_ENABLED, LoopMonitorMiddleware, loop_monitor
 from app.routers import (
     auth,
     persona,
     persona_trabajador,
     registration,
-    excel
+    excel,
+    monitor
 )
 
 app = FastAPI(
@@ -21,10 +25,25 @@ app.include_router(persona.router)
 app.include_router(persona_trabajador.router)
 app.include_router(registration.router)
 app.include_router(excel.router)
+app.include_router(monitor.router)
+
+# Detector opcional de bloqueos del event loop por ruta
+if LOOP_MONITOR_ENABLED:
+    app.add_middleware(LoopMonitorMiddleware)
 
 @app.on_event("startup")
 async def startup_event():
     init_db()
+    # El proceso gestor de importaciones se inicia aquí y no en la primera carga
+    import_job_manager.start()
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    import_job_manager.shutdown()
+    password_hasher.shutdown()
+    await loop_monitor.stop()
 
 @app.get("/")
 async def root():
@@ -3,6 +3,8 @@ from app.models.base import Base
 from app.models.estructura_org import Unidad, Area, Puesto, Categoria
 from app.models.persona import Persona, PersonaLogin
 from app.models.persona_trabajador import PersonaTrabajador
+from app.models.importacion import ImportacionArchivo
+from app.models.refresh_token import RefreshToken
 
 __all__ = [
     'Base',
@@ -12,5 +14,7 @@ __all__ = [
     'Categoria',
     'Persona',
     'PersonaLogin',
-    'PersonaTrabajador'
+    'PersonaTrabajador',
+    'ImportacionArchivo',
+    'RefreshToken'
 ]
\ No newline at end of file
@@ -8,7 +8,7 @@ class Unidad(Base):
     __tablename__ = 'grietbx_unidad'
     
     i_cod_unidad = Column(Integer, primary_key=True, autoincrement=True)
-    v_des_nombre = Column(String(100), nullable=False)
+    v_des_nombre = Column(String(100), nullable=False, unique=True)
     
     # Campos de auditoría
     i_est_registro = Column(Integer, default=1)
@@ -30,7 +30,7 @@ class Area(Base):
     
     i_cod_area = Column(Integer, primary_key=True, autoincrement=True)
     i_cod_unidad = Column(Integer, ForeignKey('grietbx_unidad.i_cod_unidad'), nullable=False)
-    v_des_nombre = Column(String(100), nullable=False)
+    v_des_nombre = Column(String(100), nullable=False, unique=True)
     
     # Campos de auditoría
     i_est_registro = Column(Integer, default=1)
@@ -51,7 +51,7 @@ class Categoria(Base):
     __tablename__ = 'grietbx_categoria'
     
     i_cod_categoria = Column(Integer, primary_key=True, autoincrement=True)
-    v_des_nombre = Column(String(100), nullable=False)
+    v_des_nombre = Column(String(100), nullable=False, unique=True)
     
     # Campos de auditoría
     i_est_registro = Column(Integer, default=1)
@@ -71,7 +71,7 @@ class Puesto(Base):
     __tablename__ = 'grietbx_puesto'
     
     i_cod_puesto = Column(Integer, primary_key=True, autoincrement=True)
-    v_des_nombre = Column(String(100), nullable=False)
+    v_des_nombre = Column(String(100), nullable=False, unique=True)
     
     # Campos de auditoría
     i_est_registro = Column(Integer, default=1)
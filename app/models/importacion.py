@@ -0,0 +1,30 @@
+# app/models/importacion.py
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from app.models.base import Base
+
+class ImportacionArchivo(Base):
+    __tablename__ = 'griemvc_importacion'
+
+    i_cod_importacion = Column(Integer, primary_key=True, autoincrement=True)
+    v_hash_archivo = Column(String(64), nullable=False, unique=True)
+    v_nom_archivo = Column(String(255), nullable=False)
+    v_est_importacion = Column(String(20), nullable=False, default='PENDIENTE')
+    i_num_procesados = Column(Integer, default=0)
+    i_num_omitidos = Column(Integer, default=0)
+    i_num_errores = Column(Integer, default=0)
+
+    # Punto de reanudación: última fila confirmada y estadísticas hasta ella (JSON)
+    i_num_ult_fila = Column(Integer, default=0)
+    v_des_checkpoint = Column(Text)
+    t_fec_checkpoint = Column(DateTime)
+
+    # Campos de auditoría
+    i_est_registro = Column(Integer, default=1)
+    v_usu_reg = Column(String(50))
+    v_usu_mod = Column(String(50))
+    t_fec_reg = Column(DateTime)
+    t_fec_mod = Column(DateTime)
+    v_host_reg = Column(String(50))
+    v_host_mod = Column(String(50))
+    v_ip_reg = Column(String(50))
+    v_ip_mod = Column(String(50))
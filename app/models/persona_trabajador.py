@@ -15,6 +15,8 @@ class PersonaTrabajador(Base):
     i_cod_categoria = Column(Integer, ForeignKey('grietbx_categoria.i_cod_categoria'))
     n_imp_sueldo = Column(Numeric(10, 2))
     t_fec_ingreso = Column(DateTime, default=datetime.utcnow)
+    # Huella de los datos importados, para detectar cambios en cargas posteriores
+    v_huella_registro = Column(String(16))
     
     # Campos de auditoría
     i_est_registro = Column(Integer, default=1)
@@ -0,0 +1,27 @@
+# app/models/refresh_token.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from app.models.base import Base
+
+class RefreshToken(Base):
+    __tablename__ = 'griemvc_refresh_token'
+
+    i_cod_refresh = Column(Integer, primary_key=True, autoincrement=True)
+    i_cod_login = Column(Integer, ForeignKey('grietbc_persona_login.i_cod_login'), nullable=False, index=True)
+    # Solo se guarda el SHA-256 del token, nunca el token
+    v_hash_token = Column(String(64), nullable=False, unique=True)
+    # Cadena de rotación: todos los tokens emitidos desde un mismo inicio de sesión
+    v_cod_familia = Column(String(32), nullable=False, index=True)
+    t_fec_expira = Column(DateTime, nullable=False)
+    # Momento en que se canjeó por un token nuevo; un segundo canje revoca la familia
+    t_fec_uso = Column(DateTime)
+
+    # Campos de auditoría
+    i_est_registro = Column(Integer, default=1)
+    v_usu_reg = Column(String(50))
+    v_usu_mod = Column(String(50))
+    t_fec_reg = Column(DateTime)
+    t_fec_mod = Column(DateTime)
+    v_host_reg = Column(String(50))
+    v_host_mod = Column(String(50))
+    v_ip_reg = Column(String(50))
+    v_ip_mod = Column(String(50))
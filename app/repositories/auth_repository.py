@@ -1,4 +1,7 @@
 # app/repositories/auth_repository.py
+from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.loaders.database import SessionLocal
 from app.models.persona import Persona, PersonaLogin
 
@@ -15,4 +18,29 @@ class AuthRepository:
                 Persona.i_est_registro == 1
             )
             .first()
-        )
\ No newline at end of file
+        )
+
+class AsyncAuthRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_user_by_documento(self, documento: str) -> tuple[Persona, PersonaLogin] | None:
+        result = await self.db.execute(
+            select(Persona, PersonaLogin)
+            .join(PersonaLogin)
+            .filter(
+                Persona.v_num_documento == documento,
+                Persona.i_est_registro == 1
+            )
+        )
+        return result.first()
+
+    async def update_password_hash(self, login: PersonaLogin, hashed_password: str) -> None:
+        login.v_des_clave = hashed_password
+        login.t_fec_mod = datetime.now()
+        login.v_usu_mod = "system"
+        try:
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
@@ -0,0 +1,26 @@
+# app/repositories/importacion_repository.py
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models.importacion import ImportacionArchivo
+
+class ImportacionRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_hash(self, v_hash_archivo: str) -> Optional[ImportacionArchivo]:
+        return (
+            self.db.query(ImportacionArchivo)
+            .filter(ImportacionArchivo.v_hash_archivo == v_hash_archivo)
+            .first()
+        )
+
+    def create(self, importacion: ImportacionArchivo) -> ImportacionArchivo:
+        self.db.add(importacion)
+        self.db.commit()
+        self.db.refresh(importacion)
+        return importacion
+
+    def update(self, importacion: ImportacionArchivo) -> ImportacionArchivo:
+        self.db.commit()
+        self.db.refresh(importacion)
+        return importacion
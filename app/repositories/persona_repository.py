@@ -1,7 +1,8 @@
 # app/repositories/persona_repository.py
 from app.loaders.database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, select
 from typing import Optional, List
 from datetime import datetime
 from app.models.persona import Persona, PersonaLogin
@@ -101,4 +102,97 @@ class PersonaLoginRepository:
     def update(self, persona_login: PersonaLogin) -> PersonaLogin:
         self.db.commit()
         self.db.refresh(persona_login)
-        return persona_login
\ No newline at end of file
+        return persona_login
+
+class AsyncPersonaRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Persona]:
+        result = await self.db.execute(
+            select(Persona)
+            .filter(Persona.i_est_registro == 1)
+            .order_by(Persona.i_cod_persona)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_by_id(self, i_cod_persona: int) -> Optional[Persona]:
+        result = await self.db.execute(
+            select(Persona).filter(
+                and_(
+                    Persona.i_cod_persona == i_cod_persona,
+                    Persona.i_est_registro == 1
+                )
+            )
+        )
+        return result.scalars().first()
+
+    async def get_by_documento(self, v_num_documento: str) -> Optional[Persona]:
+        result = await self.db.execute(
+            select(Persona).filter(
+                and_(
+                    Persona.v_num_documento == v_num_documento,
+                    Persona.i_est_registro == 1
+                )
+            )
+        )
+        return result.scalars().first()
+
+    async def get_by_empresa(self, v_cod_empresa: str) -> List[Persona]:
+        result = await self.db.execute(
+            select(Persona)
+            .filter(
+                and_(
+                    Persona.v_cod_empresa == v_cod_empresa,
+                    Persona.i_est_registro == 1
+                )
+            )
+            .order_by(Persona.i_cod_persona)
+        )
+        return list(result.scalars().all())
+
+    async def create(self, persona: Persona) -> Persona:
+        self.db.add(persona)
+        await self.db.commit()
+        await self.db.refresh(persona)
+        return persona
+
+    async def update(self, persona: Persona) -> Persona:
+        await self.db.commit()
+        await self.db.refresh(persona)
+        return persona
+
+    async def delete(self, persona: Persona) -> Persona:
+        persona.i_est_registro = 0
+        await self.db.commit()
+        await self.db.refresh(persona)
+        return persona
+
+class AsyncPersonaLoginRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_persona(self, i_cod_persona: int) -> Optional[PersonaLogin]:
+        result = await self.db.execute(
+            select(PersonaLogin).filter(PersonaLogin.i_cod_persona == i_cod_persona)
+        )
+        return result.scalars().first()
+
+    async def get_by_correo(self, v_des_correo: str) -> Optional[PersonaLogin]:
+        result = await self.db.execute(
+            select(PersonaLogin).filter(PersonaLogin.v_des_correo == v_des_correo)
+        )
+        return result.scalars().first()
+
+    async def create(self, persona_login: PersonaLogin) -> PersonaLogin:
+        self.db.add(persona_login)
+        await self.db.commit()
+        await self.db.refresh(persona_login)
+        return persona_login
+
+    async def update(self, persona_login: PersonaLogin) -> PersonaLogin:
+        await self.db.commit()
+        await self.db.refresh(persona_login)
+        return persona_login
@@ -1,5 +1,6 @@
 # app/repositories/persona_trabajador_repository.py
-from sqlalchemy import and_
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from app.models.persona_trabajador import PersonaTrabajador
 from app.loaders.database import SessionLocal
@@ -57,4 +58,57 @@ class PersonaTrabajadorRepository:
         trabajador.i_est_registro = 0
         self.db.commit()
         self.db.refresh(trabajador)
-        return trabajador
\ No newline at end of file
+        return trabajador
+
+class AsyncPersonaTrabajadorRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[PersonaTrabajador]:
+        result = await self.db.execute(
+            select(PersonaTrabajador)
+            .filter(PersonaTrabajador.i_est_registro == 1)
+            .order_by(PersonaTrabajador.i_cod_trabajador)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_by_id(self, i_cod_trabajador: int) -> Optional[PersonaTrabajador]:
+        result = await self.db.execute(
+            select(PersonaTrabajador).filter(
+                and_(
+                    PersonaTrabajador.i_cod_trabajador == i_cod_trabajador,
+                    PersonaTrabajador.i_est_registro == 1
+                )
+            )
+        )
+        return result.scalars().first()
+
+    async def get_cod_persona(self, i_cod_persona: int) -> Optional[PersonaTrabajador]:
+        result = await self.db.execute(
+            select(PersonaTrabajador).filter(
+                and_(
+                    PersonaTrabajador.i_cod_persona == i_cod_persona,
+                    PersonaTrabajador.i_est_registro == 1
+                )
+            )
+        )
+        return result.scalars().first()
+
+    async def create(self, trabajador: PersonaTrabajador) -> PersonaTrabajador:
+        self.db.add(trabajador)
+        await self.db.commit()
+        await self.db.refresh(trabajador)
+        return trabajador
+
+    async def update(self, trabajador: PersonaTrabajador) -> PersonaTrabajador:
+        await self.db.commit()
+        await self.db.refresh(trabajador)
+        return trabajador
+
+    async def delete(self, trabajador: PersonaTrabajador) -> PersonaTrabajador:
+        trabajador.i_est_registro = 0
+        await self.db.commit()
+        await self.db.refresh(trabajador)
+        return trabajador
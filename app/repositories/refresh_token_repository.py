@@ -0,0 +1,66 @@
+# app/repositories/refresh_token_repository.py
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.persona import Persona, PersonaLogin
+from app.models.refresh_token import RefreshToken
+
+class AsyncRefreshTokenRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_hash(self, v_hash_token: str) -> Optional[RefreshToken]:
+        result = await self.db.execute(
+            select(RefreshToken).filter(RefreshToken.v_hash_token == v_hash_token)
+        )
+        return result.scalars().first()
+
+    async def get_user_by_login(self, i_cod_login: int) -> tuple[Persona, PersonaLogin] | None:
+        result = await self.db.execute(
+            select(Persona, PersonaLogin)
+            .join(PersonaLogin)
+            .filter(
+                PersonaLogin.i_cod_login == i_cod_login,
+                Persona.i_est_registro == 1
+            )
+        )
+        return result.first()
+
+    async def create(self, refresh_token: RefreshToken) -> RefreshToken:
+        self.db.add(refresh_token)
+        await self.db.commit()
+        return refresh_token
+
+    async def mark_used(self, i_cod_refresh: int, now: datetime) -> bool:
+        # Solo una petición puede canjear el token: la condición sobre t_fec_uso lo hace atómico
+        result = await self.db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.i_cod_refresh == i_cod_refresh,
+                RefreshToken.t_fec_uso.is_(None),
+                RefreshToken.i_est_registro == 1
+            )
+            .values(t_fec_uso=now, t_fec_mod=now)
+        )
+        return result.rowcount == 1
+
+    async def revoke_family(self, v_cod_familia: str, v_usu_mod: str, now: datetime) -> int:
+        result = await self.db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.v_cod_familia == v_cod_familia,
+                RefreshToken.i_est_registro == 1
+            )
+            .values(i_est_registro=0, v_usu_mod=v_usu_mod, t_fec_mod=now)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def delete_expired(self, i_cod_login: int, now: datetime) -> None:
+        await self.db.execute(
+            delete(RefreshToken).where(
+                RefreshToken.i_cod_login == i_cod_login,
+                RefreshToken.t_fec_expira < now
+            )
+        )
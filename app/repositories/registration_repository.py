@@ -1,7 +1,8 @@
 # app/repositories/registration_repository.py
 from pytest import Session
 from app.models.persona import PersonaLogin, Persona
-from sqlalchemy import and_
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.loaders.database import SessionLocal
 
 class RegistrationRepository:
@@ -38,4 +39,37 @@ class RegistrationRepository:
         self.db.add(persona_login)
         self.db.commit()
         self.db.refresh(persona_login)
-        return persona_login
\ No newline at end of file
+        return persona_login
+
+class AsyncRegistrationRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_persona_by_documento(self, documento: str) -> Persona:
+        result = await self.db.execute(
+            select(Persona).filter(
+                and_(
+                    Persona.v_num_documento == documento,
+                    Persona.i_est_registro == 1
+                )
+            )
+        )
+        return result.scalars().first()
+
+    async def get_existing_login(self, persona_id: int) -> PersonaLogin:
+        result = await self.db.execute(
+            select(PersonaLogin).filter(PersonaLogin.i_cod_persona == persona_id)
+        )
+        return result.scalars().first()
+
+    async def get_by_correo(self, correo: str) -> PersonaLogin:
+        result = await self.db.execute(
+            select(PersonaLogin).filter(PersonaLogin.v_des_correo == correo)
+        )
+        return result.scalars().first()
+
+    async def create_login(self, persona_login: PersonaLogin) -> PersonaLogin:
+        self.db.add(persona_login)
+        await self.db.commit()
+        await self.db.refresh(persona_login)
+        return persona_login
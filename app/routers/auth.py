@@ -1,18 +1,40 @@
 # app/routers/auth.py
+from typing import Optional
 from fastapi import APIRouter, Depends, Request
-from app.schemas.auth import LoginRequest, LoginResponse
-from app.repositories.auth_repository import AuthRepository
+from app.schemas.auth import LoginRequest, LoginResponse, RefreshRequest
+from app.repositories.auth_repository import AsyncAuthRepository
+from app.repositories.refresh_token_repository import AsyncRefreshTokenRepository
 from app.services.auth_service import AuthService
-from app.loaders.database import get_db
+from app.loaders.database import get_async_db
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
+def get_client_ip(request: Request) -> Optional[str]:
+    return request.client.host if request.client else None
+
+def get_auth_service(db) -> AuthService:
+    return AuthService(AsyncAuthRepository(db), AsyncRefreshTokenRepository(db))
+
 @router.post("/login", response_model=LoginResponse)
 async def login(
     request: Request,
     login_data: LoginRequest,
-    db = Depends(get_db)
+    db = Depends(get_async_db)
+):
+    return await get_auth_service(db).login(login_data, get_client_ip(request))
+
+@router.post("/refresh", response_model=LoginResponse)
+async def refresh(
+    request: Request,
+    refresh_data: RefreshRequest,
+    db = Depends(get_async_db)
+):
+    # Renueva el access token sin volver a verificar la contraseña
+    return await get_auth_service(db).refresh(refresh_data.refresh_token, get_client_ip(request))
+
+@router.post("/logout", response_model=LoginResponse)
+async def logout(
+    refresh_data: RefreshRequest,
+    db = Depends(get_async_db)
 ):
-    auth_repository = AuthRepository(db)
-    auth_service = AuthService(auth_repository)
-    return auth_service.login(login_data)
\ No newline at end of file
+    return await get_auth_service(db).logout(refresh_data.refresh_token)
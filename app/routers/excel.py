@@ -1,13 +1,75 @@
 # app/routers/excel.py
-from fastapi import APIRouter, UploadFile, File
+import asyncio
+import json
+from typing import List, Optional
+from fastapi import APIRouter, Request, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 import os
-from app.loaders.load_data import process_excel
+from app.loaders.database import SessionLocal
+from app.loaders.excel_reader import excel_inputs
+from app.loaders.reconciliation import MODOS_RECONCILIACION
+from app.repositories.importacion_repository import ImportacionRepository
+from app.schemas.excel import ImportJobResponse
+from app.services.import_job_service import import_job_manager, ESTADOS_FINALES
+from app.services.importacion_service import ImportacionService
+from app.services.upload_service import spool_upload
 
 router = APIRouter(prefix="/api/excel", tags=["excel"])
 
+def get_audit_data(request: Request) -> dict:
+    client_host = request.client.host if request.client else ""
+    return {
+        "v_ip_reg": client_host,
+        "v_ip_mod": client_host,
+        "v_host_reg": request.headers.get("host", ""),
+        "v_host_mod": request.headers.get("host", ""),
+        "v_usu_reg": request.headers.get("x-user-id", "system"),
+        "v_usu_mod": request.headers.get("x-user-id", "system")
+    }
+
+def invalid_reconcile_response(reconciliar: Optional[str]) -> Optional[dict]:
+    if reconciliar is None or reconciliar in MODOS_RECONCILIACION:
+        return None
+    return {
+        "success": False,
+        "message": f"Modo de reconciliación no válido. Valores permitidos: {', '.join(MODOS_RECONCILIACION)}"
+    }
+
+def registrar_importacion(file_hash: str, filename: str, audit_data: dict):
+    # Se ejecuta en el threadpool con su propia sesión: la consulta y el commit no
+    # bloquean el event loop y la conexión se libera antes de encolar la importación
+    with SessionLocal() as db:
+        return ImportacionService(ImportacionRepository(db)).registrar(file_hash, filename, audit_data)
+
+def descartar_importaciones(file_hashes: List[str], file_paths: List[str]) -> None:
+    # Una carga por lotes que falla a medias no debe dejar registros PENDIENTE
+    # que bloqueen nuevas subidas ni archivos huérfanos en el directorio de cargas
+    with SessionLocal() as db:
+        service = ImportacionService(ImportacionRepository(db))
+        for file_hash in file_hashes:
+            service.actualizar_estado(file_hash, 'ERROR')
+    for file_path in file_paths:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+async def get_job_or_404(job_id: str) -> dict:
+    job = await run_in_threadpool(import_job_manager.get, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Trabajo de importación no encontrado")
+    return job
+
 @router.post("/upload")
-async def upload_excel(file: UploadFile = File(...)):
+async def upload_excel(
+    request: Request,
+    file: UploadFile = File(...),
+    reconciliar: Optional[str] = Form(None)
+):
     try:
+        invalido = invalid_reconcile_response(reconciliar)
+        if invalido:
+            return invalido
+
         # Validar extensión
         if not file.filename.endswith(('.xlsx', '.xls')):
             return {
@@ -15,26 +77,153 @@ async def upload_excel(file: UploadFile = File(...)):
                 "message": "Formato no válido. Solo se permiten archivos Excel (.xlsx, .xls)"
             }
 
-        # Crear directorio si no existe
-        os.makedirs("data", exist_ok=True)
-        file_path = f"data/{file.filename}"
+        # Guardar archivo por bloques calculando su hash
+        file_path, file_hash = await spool_upload(file)
+
+        # Omitir archivos cuyo contenido ya fue importado
+        importacion, existing = await run_in_threadpool(
+            registrar_importacion, file_hash, file.filename, get_audit_data(request)
+        )
+        if existing:
+            os.remove(file_path)
+            return {
+                "success": True,
+                "message": f"El archivo ya fue importado (estado: {existing.v_est_importacion}). Se omite la importación",
+                "filename": file.filename,
+                "hash": file_hash,
+                "duplicado": True
+            }
 
-        # Guardar archivo
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        message = "Archivo recibido, importación en proceso"
+        if importacion.i_num_ult_fila:
+            message = f"Archivo recibido, la importación continúa desde la fila {importacion.i_num_ult_fila + 1}"
 
-        # Procesar Excel
-        process_excel(file_path)
+        # Encolar la importación en un proceso separado
+        job_id = await run_in_threadpool(
+            import_job_manager.submit, file_path, file.filename, file_hash, reconciliar, delete_file=True
+        )
 
         return {
             "success": True,
-            "message": "Archivo procesado correctamente",
-            "filename": file.filename
+            "message": message,
+            "filename": file.filename,
+            "hash": file_hash,
+            "duplicado": False,
+            "job_id": job_id
         }
 
     except Exception as e:
         return {
             "success": False,
             "message": f"Error al procesar archivo: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+@router.post("/upload-batch")
+async def upload_excel_batch(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    todas_las_hojas: bool = Form(False),
+    reconciliar: Optional[str] = Form(None)
+):
+    try:
+        invalido = invalid_reconcile_response(reconciliar)
+        if invalido:
+            return invalido
+
+        # Validar extensiones
+        invalidos = [file.filename for file in files if not file.filename.endswith(('.xlsx', '.xls'))]
+        if invalidos:
+            return {
+                "success": False,
+                "message": f"Formato no válido en {', '.join(invalidos)}. Solo se permiten archivos Excel (.xlsx, .xls)"
+            }
+
+        audit_data = get_audit_data(request)
+        rutas, nombres, hashes, duplicados = [], [], [], []
+        file_path = None
+        try:
+            for file in files:
+                file_path, file_hash = await spool_upload(file)
+                if file_hash in hashes:
+                    # El mismo contenido vino dos veces en la carga
+                    os.remove(file_path)
+                    duplicados.append({"filename": file.filename, "hash": file_hash, "estado": "REPETIDO"})
+                    continue
+
+                importacion, existing = await run_in_threadpool(
+                    registrar_importacion, file_hash, file.filename, audit_data
+                )
+                if existing:
+                    os.remove(file_path)
+                    duplicados.append({
+                        "filename": file.filename, "hash": file_hash, "estado": existing.v_est_importacion
+                    })
+                    continue
+                rutas.append(file_path)
+                nombres.append(file.filename)
+                hashes.append(file_hash)
+
+            if not rutas:
+                return {
+                    "success": True,
+                    "message": "Todos los archivos ya fueron importados. Se omite la importación",
+                    "duplicados": duplicados
+                }
+
+            entradas = await run_in_threadpool(excel_inputs, rutas, nombres, todas_las_hojas)
+
+            # Encolar una única importación con todas las hojas y archivos
+            job_id = await run_in_threadpool(
+                import_job_manager.submit_batch,
+                entradas, hashes, ", ".join(nombres), reconciliar, delete_files=True
+            )
+        except Exception:
+            # El archivo en curso puede haberse guardado sin llegar a registrarse
+            spooled = rutas + [file_path] if file_path and file_path not in rutas else rutas
+            await run_in_threadpool(descartar_importaciones, hashes, spooled)
+            raise
+
+        return {
+            "success": True,
+            "message": f"{len(rutas)} archivos recibidos ({len(entradas)} hojas), importación en proceso",
+            "archivos": nombres,
+            "hojas": [
+                {"filename": entrada["nombre"], "hoja": entrada["hoja"]} for entrada in entradas
+            ],
+            "duplicados": duplicados,
+            "job_id": job_id
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error al procesar archivos: {str(e)}"
+        }
+
+@router.get("/jobs/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(job_id: str):
+    job = await get_job_or_404(job_id)
+    return ImportJobResponse(
+        success=True,
+        message="Estado de la importación recuperado exitosamente",
+        data=job
+    )
+
+@router.get("/jobs/{job_id}/stream")
+async def stream_import_job(job_id: str):
+    await get_job_or_404(job_id)
+
+    async def events():
+        while True:
+            job = await run_in_threadpool(import_job_manager.get, job_id)
+            if job is None:
+                # El gestor se detuvo (p. ej. al apagar la API) y ya no conoce el trabajo
+                final = {'id': job_id, 'estado': 'NO_ENCONTRADO', 'mensaje': 'Trabajo de importación no encontrado'}
+                yield f"data: {json.dumps(final)}\n\n"
+                break
+            yield f"data: {json.dumps(job)}\n\n"
+            if job['estado'] in ESTADOS_FINALES:
+                break
+            await asyncio.sleep(1)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
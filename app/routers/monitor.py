@@ -0,0 +1,20 @@
+# app/routers/monitor.py
+from fastapi import APIRouter, Depends
+from app.services.loop_monitor import loop_monitor
+from app.services.token_dependency import validate_token
+
+router = APIRouter(prefix="/api/monitor", tags=["monitor"])
+
+@router.get("/event-loop")
+async def get_event_loop_report(token_data: dict = Depends(validate_token)):
+    if not loop_monitor.running:
+        return {
+            "success": False,
+            "message": "El monitor del event loop no está activo (LOOP_MONITOR=1)",
+            "data": loop_monitor.report()
+        }
+    return {
+        "success": True,
+        "message": "Reporte del event loop recuperado exitosamente",
+        "data": loop_monitor.report()
+    }
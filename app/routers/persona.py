@@ -1,15 +1,15 @@
 # app/routers/persona.py
 from datetime import datetime
 from fastapi import APIRouter, Depends, Request, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.persona import (
     PersonaCreate,
     PersonaUpdate,
     PersonaResponse,
 )
-from app.repositories.persona_repository import PersonaRepository, PersonaLoginRepository
+from app.repositories.persona_repository import AsyncPersonaRepository, AsyncPersonaLoginRepository
 from app.services.persona_service import PersonaService
-from app.loaders.database import get_db
+from app.loaders.database import get_async_db
 from app.services.token_dependency import validate_token
 
 router = APIRouter(prefix="/api/personas", tags=["personas"])
@@ -26,9 +26,9 @@ def get_audit_data(request: Request) -> dict:
         "f_fec_mod": datetime.now()
     }
 
-def get_services(db: Session = Depends(get_db)) -> PersonaService:
-    persona_repository = PersonaRepository(db)
-    persona_login_repository = PersonaLoginRepository(db)
+def get_services(db: AsyncSession = Depends(get_async_db)) -> PersonaService:
+    persona_repository = AsyncPersonaRepository(db)
+    persona_login_repository = AsyncPersonaLoginRepository(db)
     return PersonaService(persona_repository, persona_login_repository)
 
 @router.get("", response_model=PersonaResponse)
@@ -42,7 +42,9 @@ async def get_personas(
 ):
     print(f"Token Data: {token_data}")
     skip = (page - 1) * per_page
-    return service.get_personas_by_empresa(empresa) if empresa else service.get_personas(skip, per_page)
+    if empresa:
+        return await service.get_personas_by_empresa(empresa)
+    return await service.get_personas(skip, per_page)
 
 @router.get("/{persona_id}", response_model=PersonaResponse)
 async def get_persona(
@@ -50,7 +52,7 @@ async def get_persona(
     service: PersonaService = Depends(get_services),
     token_data: dict = Depends(validate_token)
 ):
-    return service.get_persona(persona_id)
+    return await service.get_persona(persona_id)
 
 @router.post("", response_model=PersonaResponse)
 async def create_persona(
@@ -59,7 +61,7 @@ async def create_persona(
     service: PersonaService = Depends(get_services),
     token_data: dict = Depends(validate_token)
 ):
-    return service.create_persona(persona, get_audit_data(request))
+    return await service.create_persona(persona, get_audit_data(request))
 
 @router.put("/{persona_id}", response_model=PersonaResponse)
 async def update_persona(
@@ -69,7 +71,7 @@ async def update_persona(
     service: PersonaService = Depends(get_services),
     token_data: dict = Depends(validate_token)
 ):
-    return service.update_persona(persona_id, persona, get_audit_data(request))
+    return await service.update_persona(persona_id, persona, get_audit_data(request))
 
 @router.delete("/{persona_id}", response_model=PersonaResponse)
 async def delete_persona(
@@ -78,4 +80,4 @@ async def delete_persona(
     service: PersonaService = Depends(get_services),
     token_data: dict = Depends(validate_token)
 ):
-    return service.delete_persona(persona_id, get_audit_data(request))
\ No newline at end of file
+    return await service.delete_persona(persona_id, get_audit_data(request))
\ No newline at end of file
@@ -1,12 +1,12 @@
 # app/routers/registration.py
 from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.registration import RegistrationRequest, RegistrationResponse, RegistrationVerifyRequest
-from app.repositories.registration_repository import RegistrationRepository
+from app.repositories.registration_repository import AsyncRegistrationRepository
 from app.services.email_service import EmailService
 from app.services.registration_service import RegistrationService
-from app.loaders.database import get_db
+from app.loaders.database import get_async_db
 
 router = APIRouter(prefix="/api/registro", tags=["registro"])
 email_service = EmailService()  
@@ -26,13 +26,13 @@ def get_audit_data(request: Request) -> dict:
 @router.post("", response_model=RegistrationResponse)
 async def register_initial(
     request: RegistrationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):    
     
-    registration_service = RegistrationService(RegistrationRepository(db))
+    registration_service = RegistrationService(AsyncRegistrationRepository(db))
 
     # Validar datos usando el servicio de registro
-    validation_result = registration_service.validate_registration(request)
+    validation_result = await registration_service.validate_registration(request)
     if not validation_result.success:
         return validation_result
     
@@ -56,7 +56,7 @@ async def register_initial(
 async def verificar_otp(
     verify_request: RegistrationVerifyRequest,  # Cambio de nombre para evitar conflicto
     request: Request,  # Nuevo parámetro para obtener datos del cliente
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Verificar OTP y obtener datos de registro
     stored_data = email_service.verify_otp(verify_request.correo, verify_request.otp)
@@ -72,8 +72,8 @@ async def verificar_otp(
 
     # Crear usuario con datos almacenados
     registration_request = RegistrationRequest(**stored_data)
-    registration_service = RegistrationService(RegistrationRepository(db))
-    registration_service.register(registration_request, audit_data)  # Pasamos audit_data
+    registration_service = RegistrationService(AsyncRegistrationRepository(db))
+    await registration_service.register(registration_request, audit_data)  # Pasamos audit_data
 
     return RegistrationResponse(
         success=True,
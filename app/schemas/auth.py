@@ -5,6 +5,9 @@ class LoginRequest(BaseModel):
     usuario: str = Field(..., description="Número de documento del usuario")
     contrasenia: str = Field(..., description="Contraseña del usuario")
 
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(..., description="Refresh token recibido al iniciar sesión o al renovar")
+
 class LoginResponse(BaseModel):
     success: bool
     message: str
@@ -0,0 +1,33 @@
+# app/schemas/excel.py
+from pydantic import BaseModel
+from typing import Optional
+
+class ImportJob(BaseModel):
+    id: str
+    archivo: str
+    estado: str
+    procesados: int = 0
+    actualizados: int = 0
+    omitidos: int = 0
+    errores: int = 0
+    primeros_errores: list[str] = []
+    filas_leidas: int = 0
+    total_filas: Optional[int] = None
+    filas_por_segundo: float = 0.0
+    eta_segundos: Optional[float] = None
+    creado: Optional[str] = None
+    iniciado: Optional[str] = None
+    finalizado: Optional[str] = None
+    mensaje: Optional[str] = None
+    # Tiempo, filas por segundo y pico de memoria por fase de la importación
+    perfil: Optional[dict] = None
+    # Estadísticas por hoja o archivo en las importaciones de varias entradas
+    archivos: list[dict] = []
+    # Trabajadores activos ausentes del extracto y cuántos se desactivaron
+    reconciliacion: Optional[dict] = None
+
+class ImportJobResponse(BaseModel):
+    success: bool
+    message: str
+    data: Optional[ImportJob] = None
+    error: Optional[dict] = None
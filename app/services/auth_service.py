@@ -1,27 +1,44 @@
 # app/services/auth_service.py
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
-from passlib.context import CryptContext
-from app.repositories.auth_repository import AuthRepository
+from app.repositories.auth_repository import AsyncAuthRepository
+from app.repositories.refresh_token_repository import AsyncRefreshTokenRepository
+from app.services.login_throttle import login_throttle
+from app.services.password_service import password_hasher
+from app.services.token_codec import get_token_codec
 from app.schemas.auth import LoginRequest, LoginResponse
 from app.models.persona import Persona, PersonaLogin
+from app.models.refresh_token import RefreshToken
 from dotenv import load_dotenv
+import hashlib
+import logging
 import os
+import secrets
+import uuid
 
 load_dotenv()
-SECRET_KEY = os.getenv('SECRET_KEY')
-ALGORITHM = os.getenv('ALGORITHM')
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Vigencia del refresh token; cada canje emite uno nuevo con la vigencia completa
+REFRESH_TOKEN_DAYS = int(os.getenv('REFRESH_TOKEN_DAYS', '7'))
+logger = logging.getLogger(__name__)
+
+def hash_refresh_token(refresh_token: str) -> str:
+    return hashlib.sha256(refresh_token.encode('utf-8')).hexdigest()
 
 class AuthService:
-    def __init__(self, auth_repository: AuthRepository):
+    def __init__(
+        self,
+        auth_repository: AsyncAuthRepository,
+        refresh_repository: Optional[AsyncRefreshTokenRepository] = None
+    ):
         self.auth_repository = auth_repository
+        self.refresh_repository = refresh_repository
     
-    def login(self, login_data: LoginRequest) -> LoginResponse:
-        user_data = self.auth_repository.get_user_by_documento(login_data.usuario)
+    async def login(self, login_data: LoginRequest, client_ip: Optional[str] = None) -> LoginResponse:
+        # Rechaza el exceso de intentos antes de consultar la base o ejecutar bcrypt
+        await login_throttle.check(login_data.usuario, client_ip)
+        user_data = await self.auth_repository.get_user_by_documento(login_data.usuario)
         
         if not user_data:
             return LoginResponse(
@@ -35,7 +52,8 @@ class AuthService:
         
         persona, login = user_data
         
-        if not self.verify_password(login_data.contrasenia, login.v_des_clave):
+        valid, new_hash = await self.verify_password(login_data.contrasenia, login.v_des_clave)
+        if not valid:
             return LoginResponse(
                 success=False,
                 message="Credenciales inválidas",
@@ -45,16 +63,112 @@ class AuthService:
                 }
             )
         
+        if new_hash:
+            # Hash con parámetros antiguos: se reemplaza sin afectar el inicio de sesión
+            try:
+                await self.auth_repository.update_password_hash(login, new_hash)
+            except Exception as e:
+                logger.warning(f"No se pudo actualizar el hash de la clave de {login.v_des_usuario}: {e}")
+
+        await login_throttle.success(login_data.usuario)
         token = self.create_jwt_token(persona, login)
+        data = {"token": token}
+        if self.refresh_repository is not None:
+            # Cada inicio de sesión abre una familia nueva de refresh tokens
+            data["refresh_token"] = await self.issue_refresh_token(login, uuid.uuid4().hex, client_ip)
         
         return LoginResponse(
             success=True,
             message="Inicio de sesión exitoso",
-            data={"token": token}
+            data=data
+        )
+
+    async def refresh(self, refresh_token: str, client_ip: Optional[str] = None) -> LoginResponse:
+        """Canjea un refresh token por un access token nuevo y otro refresh token de la misma familia.
+
+        Un token ya canjeado o revocado que vuelve a presentarse indica que fue
+        copiado: se revoca toda la familia y el usuario debe iniciar sesión otra vez.
+        """
+        now = datetime.now()
+        stored = await self.refresh_repository.get_by_hash(hash_refresh_token(refresh_token))
+        if stored is None or stored.t_fec_expira <= now:
+            return LoginResponse(
+                success=False,
+                message="Refresh token inválido",
+                error={
+                    "code": "AUTH007",
+                    "details": "El refresh token no existe o ha expirado. Por favor, vuelva a iniciar sesión"
+                }
+            )
+
+        # Un token revocado (logout) ya no tiene familia activa que revocar
+        reutilizado = stored.i_est_registro == 1 and not await self.refresh_repository.mark_used(
+            stored.i_cod_refresh, now
+        )
+        if reutilizado:
+            await self.refresh_repository.revoke_family(stored.v_cod_familia, "system", now)
+            logger.warning(f"Refresh token reutilizado; sesión {stored.v_cod_familia} revocada")
+        if stored.i_est_registro != 1 or reutilizado:
+            return LoginResponse(
+                success=False,
+                message="Sesión revocada",
+                error={
+                    "code": "AUTH008",
+                    "details": "El refresh token ya fue utilizado. Por favor, vuelva a iniciar sesión"
+                }
+            )
+
+        user_data = await self.refresh_repository.get_user_by_login(stored.i_cod_login)
+        if not user_data:
+            await self.refresh_repository.revoke_family(stored.v_cod_familia, "system", now)
+            return LoginResponse(
+                success=False,
+                message="Credenciales inválidas",
+                error={
+                    "code": "AUTH001",
+                    "details": "Usuario o contraseña incorrectos"
+                }
+            )
+
+        persona, login = user_data
+        return LoginResponse(
+            success=True,
+            message="Sesión renovada",
+            data={
+                "token": self.create_jwt_token(persona, login),
+                "refresh_token": await self.issue_refresh_token(login, stored.v_cod_familia, client_ip)
+            }
         )
+
+    async def logout(self, refresh_token: str) -> LoginResponse:
+        # Revoca la familia completa: ningún token derivado de esa sesión sigue sirviendo
+        stored = await self.refresh_repository.get_by_hash(hash_refresh_token(refresh_token))
+        if stored is not None:
+            await self.refresh_repository.revoke_family(stored.v_cod_familia, "system", datetime.now())
+        return LoginResponse(
+            success=True,
+            message="Sesión cerrada"
+        )
+
+    async def issue_refresh_token(self, login: PersonaLogin, familia: str, client_ip: Optional[str] = None) -> str:
+        # El token se entrega una sola vez; en la base queda solo su SHA-256
+        refresh_token = secrets.token_urlsafe(32)
+        now = datetime.now()
+        await self.refresh_repository.delete_expired(login.i_cod_login, now)
+        await self.refresh_repository.create(RefreshToken(
+            i_cod_login=login.i_cod_login,
+            v_hash_token=hash_refresh_token(refresh_token),
+            v_cod_familia=familia,
+            t_fec_expira=now + timedelta(days=REFRESH_TOKEN_DAYS),
+            i_est_registro=1,
+            v_usu_reg=login.v_des_usuario,
+            t_fec_reg=now,
+            v_ip_reg=client_ip
+        ))
+        return refresh_token
     
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await password_hasher.verify(plain_password, hashed_password)
     
     def create_jwt_token(self, persona: Persona, login: PersonaLogin) -> str:
         now = datetime.now(timezone.utc)
@@ -78,4 +192,4 @@ class AuthService:
         print("Expires at:", datetime.fromtimestamp(payload['exp']))
         print("Current UTC time:", datetime.now(timezone.utc))
         
-        return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
\ No newline at end of file
+        return get_token_codec().encode(payload)
\ No newline at end of file
@@ -0,0 +1,326 @@
+# app/services/import_job_service.py
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from app.services.importacion_service import IMPORT_HEARTBEAT_SECONDS
+
+ESTADOS_FINALES = ('COMPLETADO', 'ERROR')
+# Segundos que se conserva el estado de un trabajo terminado para consultarlo
+IMPORT_JOB_TTL_SECONDS = int(os.getenv('IMPORT_JOB_TTL_SECONDS', '3600'))
+
+logger = logging.getLogger(__name__)
+
+def _init_worker():
+    # El proceso hijo no debe reutilizar las conexiones heredadas del padre
+    from app.loaders.database import engine
+    engine.dispose(close=False)
+
+def _actualizar_importacion(file_hash: Optional[str], estado: str, stats: Optional[Dict] = None) -> None:
+    if not file_hash:
+        return
+    from app.loaders.database import SessionLocal
+    from app.repositories.importacion_repository import ImportacionRepository
+    from app.services.importacion_service import ImportacionService
+
+    db = SessionLocal()
+    try:
+        ImportacionService(ImportacionRepository(db)).actualizar_estado(file_hash, estado, stats)
+    finally:
+        db.close()
+
+def _registrar_actividad(file_hashes: List[str]) -> None:
+    from app.loaders.database import SessionLocal
+    from app.repositories.importacion_repository import ImportacionRepository
+    from app.services.importacion_service import ImportacionService
+
+    db = SessionLocal()
+    try:
+        service = ImportacionService(ImportacionRepository(db))
+        for file_hash in file_hashes:
+            service.registrar_actividad(file_hash)
+    finally:
+        db.close()
+
+def _resumen_entradas(archivos: List[Dict]) -> List[Dict]:
+    return [
+        {
+            'nombre': sub['nombre'],
+            'hoja': sub['hoja'],
+            'filas': sub['filas'],
+            'procesados': sub['procesados'],
+            'actualizados': sub['actualizados'],
+            'omitidos': sub['omitidos'],
+            'errores': len(sub['errores']),
+            'primeros_errores': sub['errores'][:10],
+            'error_fatal': sub['error_fatal'],
+        }
+        for sub in archivos
+    ]
+
+def _execute_job(
+    job_id: str,
+    jobs,
+    count_rows: Callable[[], Optional[int]],
+    run: Callable[[Callable[[Dict, int], None]], Dict],
+    file_hashes: List[str],
+    stats_by_hash: Callable[[Dict, str], Dict],
+    delete_files: Optional[List[str]] = None
+) -> None:
+    job = dict(jobs[job_id])
+    inicio = time.monotonic()
+    job.update({
+        'estado': 'PROCESANDO',
+        'iniciado': datetime.now().isoformat(),
+    })
+    try:
+        job['total_filas'] = count_rows()
+    except Exception:
+        job['total_filas'] = None
+    jobs[job_id] = job
+    ultima_actividad = time.monotonic()
+
+    def publish(stats: Dict, filas_leidas: int) -> None:
+        nonlocal ultima_actividad
+        elapsed = time.monotonic() - inicio
+        rate = filas_leidas / elapsed if elapsed > 0 else 0.0
+        total = job['total_filas']
+        job.update({
+            'procesados': stats['procesados'],
+            'actualizados': stats['actualizados'],
+            'omitidos': stats['omitidos'],
+            'errores': len(stats['errores']),
+            'primeros_errores': stats['errores'][:10],
+            'filas_leidas': filas_leidas,
+            'filas_por_segundo': round(rate, 1),
+            'eta_segundos': round(max(total - filas_leidas, 0) / rate, 1) if total and rate else None,
+        })
+        jobs[job_id] = job
+        if file_hashes and time.monotonic() - ultima_actividad >= IMPORT_HEARTBEAT_SECONDS:
+            # Sin esta marca una carga larga sin checkpoints parecería interrumpida
+            # y una nueva subida del mismo archivo iniciaría otra importación en paralelo
+            ultima_actividad = time.monotonic()
+            try:
+                _registrar_actividad(file_hashes)
+            except Exception as e:
+                logger.warning(f"No se pudo registrar la actividad de la importación {job_id}: {str(e)}")
+
+    try:
+        for file_hash in file_hashes:
+            _actualizar_importacion(file_hash, 'PROCESANDO')
+        stats = run(publish)
+        publish(stats, job['filas_leidas'])
+        # Una carga que no se pudo leer o se interrumpió queda reanudable
+        estado = 'ERROR' if stats.get('error_fatal') else 'COMPLETADO'
+        job.update({
+            'estado': estado,
+            'mensaje': stats.get('error_fatal'),
+            'eta_segundos': 0,
+            'perfil': stats.get('perfil'),
+            'archivos': _resumen_entradas(stats.get('archivos', [])),
+            'reconciliacion': stats.get('reconciliacion'),
+        })
+        for file_hash in file_hashes:
+            stats_archivo = stats_by_hash(stats, file_hash)
+            # Un archivo del lote que no se pudo leer queda en ERROR aunque el resto se cargue
+            _actualizar_importacion(
+                file_hash, 'ERROR' if stats_archivo.get('error_fatal') else estado, stats_archivo
+            )
+    except Exception as e:
+        job.update({'estado': 'ERROR', 'mensaje': str(e)})
+        for file_hash in file_hashes:
+            try:
+                _actualizar_importacion(file_hash, 'ERROR')
+            except Exception:
+                pass
+    # Las cargas guardadas en disco se borran también si la importación falla: para
+    # reanudarla se vuelve a subir el archivo, que se identifica por su hash
+    for file_path in delete_files or []:
+        try:
+            os.remove(file_path)
+        except OSError as e:
+            logger.warning(f"No se pudo eliminar {file_path}: {str(e)}")
+    job['finalizado'] = datetime.now().isoformat()
+    jobs[job_id] = job
+
+def run_import_job(
+    job_id: str,
+    file_path: str,
+    file_hash: Optional[str],
+    jobs,
+    reconcile: Optional[str] = None,
+    delete_file: bool = False
+) -> None:
+    """Ejecuta la importación en el proceso de trabajo y publica su avance en ``jobs``.
+
+    Con ``delete_file`` el archivo se elimina al terminar, como las cargas de la API.
+    """
+    from app.loaders.excel_reader import count_excel_rows
+    from app.loaders.load_data import process_excel
+
+    _execute_job(
+        job_id, jobs,
+        lambda: count_excel_rows(file_path),
+        lambda publish: process_excel(
+            file_path, progress_callback=publish, file_hash=file_hash, reconcile=reconcile
+        ),
+        [file_hash] if file_hash else [],
+        lambda stats, _: stats,
+        [file_path] if delete_file else []
+    )
+
+def run_import_batch_job(
+    job_id: str,
+    entradas: List[Dict],
+    file_hashes: List[Optional[str]],
+    jobs,
+    reconcile: Optional[str] = None,
+    delete_files: bool = False
+) -> None:
+    """Como ``run_import_job``, para varias hojas o archivos cargados en una sola importación.
+
+    ``file_hashes`` va en paralelo a las rutas distintas de ``entradas``; cada registro
+    de importación recibe las estadísticas de las hojas de su archivo.
+    """
+    from app.loaders.excel_reader import count_excel_rows
+    from app.loaders.load_data import process_excel_batch, combine_input_stats
+
+    rutas = list(dict.fromkeys(entrada['ruta'] for entrada in entradas))
+    ruta_por_hash = {file_hash: ruta for ruta, file_hash in zip(rutas, file_hashes) if file_hash}
+
+    def count_rows() -> Optional[int]:
+        conteos = [count_excel_rows(entrada['ruta'], entrada['hoja']) for entrada in entradas]
+        return None if any(conteo is None for conteo in conteos) else sum(conteos)
+
+    def stats_by_hash(stats: Dict, file_hash: str) -> Dict:
+        subtotales = [
+            sub for entrada, sub in zip(entradas, stats['archivos'])
+            if entrada['ruta'] == ruta_por_hash[file_hash]
+        ]
+        stats_archivo = combine_input_stats(subtotales)
+        errores_lectura = [sub['error_fatal'] for sub in subtotales if sub['error_fatal']]
+        stats_archivo['error_fatal'] = '; '.join(errores_lectura) or None
+        return stats_archivo
+
+    _execute_job(
+        job_id, jobs, count_rows,
+        lambda publish: process_excel_batch(entradas, progress_callback=publish, reconcile=reconcile),
+        list(ruta_por_hash),
+        stats_by_hash,
+        rutas if delete_files else []
+    )
+
+class ImportJobManager:
+    """Ejecuta las importaciones de Excel en procesos separados y guarda su avance.
+
+    El estado de los trabajos vive en el proceso que atiende la API, por lo que
+    las consultas deben llegar al mismo worker que recibió la carga. Los métodos
+    hacen llamadas bloqueantes al proceso gestor: desde el event loop se invocan
+    con ``run_in_threadpool``.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv('IMPORT_WORKERS', '1'))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._jobs = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Inicia el proceso gestor y el pool; la API lo llama al arrancar."""
+        with self._lock:
+            if self._executor is None:
+                self._manager = multiprocessing.Manager()
+                self._jobs = self._manager.dict()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker
+                )
+
+    def _prune_finished(self) -> None:
+        # Sin esto el diccionario compartido crece con cada importación
+        limite = datetime.now() - timedelta(seconds=IMPORT_JOB_TTL_SECONDS)
+        for job_id, job in self._jobs.items():
+            if job['finalizado'] and datetime.fromisoformat(job['finalizado']) < limite:
+                self._jobs.pop(job_id, None)
+
+    def _new_job(self, archivo: str) -> str:
+        self.start()
+        self._prune_finished()
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = {
+            'id': job_id,
+            'archivo': archivo,
+            'estado': 'PENDIENTE',
+            'procesados': 0,
+            'actualizados': 0,
+            'omitidos': 0,
+            'errores': 0,
+            'primeros_errores': [],
+            'filas_leidas': 0,
+            'total_filas': None,
+            'filas_por_segundo': 0.0,
+            'eta_segundos': None,
+            'creado': datetime.now().isoformat(),
+            'iniciado': None,
+            'finalizado': None,
+            'mensaje': None,
+            'perfil': None,
+            'archivos': [],
+            'reconciliacion': None,
+        }
+        return job_id
+
+    def submit(
+        self,
+        file_path: str,
+        filename: str,
+        file_hash: Optional[str] = None,
+        reconcile: Optional[str] = None,
+        delete_file: bool = False
+    ) -> str:
+        """Encola la importación del archivo y retorna el id del trabajo.
+
+        Si se indica ``file_hash``, el estado final se guarda en el registro de
+        importaciones de ese archivo. ``reconcile`` se pasa a ``process_excel``.
+        Con ``delete_file`` el archivo se elimina cuando la importación termina.
+        """
+        job_id = self._new_job(filename)
+        self._executor.submit(
+            run_import_job, job_id, file_path, file_hash, self._jobs, reconcile, delete_file
+        )
+        return job_id
+
+    def submit_batch(
+        self,
+        entradas: List[Dict],
+        file_hashes: List[Optional[str]],
+        nombre: str,
+        reconcile: Optional[str] = None,
+        delete_files: bool = False
+    ) -> str:
+        """Encola la importación conjunta de varias hojas o archivos y retorna el id del trabajo."""
+        job_id = self._new_job(nombre)
+        self._executor.submit(
+            run_import_batch_job, job_id, entradas, file_hashes, self._jobs, reconcile, delete_files
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        if self._jobs is None:
+            return None
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
+            self._executor = self._manager = self._jobs = None
+
+import_job_manager = ImportJobManager()
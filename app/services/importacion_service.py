@@ -0,0 +1,100 @@
+# app/services/importacion_service.py
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy.exc import IntegrityError
+from app.models.importacion import ImportacionArchivo
+from app.repositories.importacion_repository import ImportacionRepository
+
+# Minutos sin avance tras los que una importación en curso se considera interrumpida
+IMPORT_STALE_MINUTES = int(os.getenv('IMPORT_STALE_MINUTES', '30'))
+# Segundos entre las marcas de actividad que registra una importación en curso
+IMPORT_HEARTBEAT_SECONDS = int(os.getenv('IMPORT_HEARTBEAT_SECONDS', '60'))
+
+class ImportacionService:
+    def __init__(self, importacion_repository: ImportacionRepository):
+        self.importacion_repository = importacion_repository
+
+    def registrar(
+        self,
+        v_hash_archivo: str,
+        v_nom_archivo: str,
+        audit_data: dict
+    ) -> tuple[Optional[ImportacionArchivo], Optional[ImportacionArchivo]]:
+        """Registra un archivo pendiente de importar.
+
+        Retorna ``(importacion, None)`` si debe importarse, o ``(None, existente)``
+        si ese mismo contenido ya fue importado o se está importando. Las
+        importaciones fallidas o interrumpidas se vuelven a encolar y continúan
+        desde su último punto de reanudación.
+        """
+        existing = self.importacion_repository.get_by_hash(v_hash_archivo)
+        if existing and not self.es_reanudable(existing):
+            return None, existing
+
+        if existing:
+            # Un intento anterior falló o se interrumpió: se vuelve a importar
+            existing.v_nom_archivo = v_nom_archivo
+            existing.v_est_importacion = 'PENDIENTE'
+            existing.v_usu_mod = audit_data["v_usu_mod"]
+            existing.v_host_mod = audit_data["v_host_mod"]
+            existing.v_ip_mod = audit_data["v_ip_mod"]
+            existing.t_fec_mod = datetime.now()
+            return self.importacion_repository.update(existing), None
+
+        try:
+            importacion = self.importacion_repository.create(ImportacionArchivo(
+                v_hash_archivo=v_hash_archivo,
+                v_nom_archivo=v_nom_archivo,
+                v_est_importacion='PENDIENTE',
+                i_est_registro=1,
+                v_usu_reg=audit_data["v_usu_reg"],
+                v_host_reg=audit_data["v_host_reg"],
+                v_ip_reg=audit_data["v_ip_reg"],
+                t_fec_reg=datetime.now()
+            ))
+            return importacion, None
+        except IntegrityError:
+            # Otra carga concurrente registró el mismo contenido
+            self.importacion_repository.db.rollback()
+            return None, self.importacion_repository.get_by_hash(v_hash_archivo)
+
+    @staticmethod
+    def es_reanudable(importacion: ImportacionArchivo) -> bool:
+        """Indica si la importación falló o quedó en curso sin avanzar durante ``IMPORT_STALE_MINUTES``."""
+        if importacion.v_est_importacion == 'ERROR':
+            return True
+        if importacion.v_est_importacion not in ('PENDIENTE', 'PROCESANDO'):
+            return False
+        fechas = [
+            fecha for fecha in (
+                importacion.t_fec_checkpoint, importacion.t_fec_mod, importacion.t_fec_reg
+            ) if fecha is not None
+        ]
+        if not fechas:
+            return True
+        return datetime.now() - max(fechas) > timedelta(minutes=IMPORT_STALE_MINUTES)
+
+    def registrar_actividad(self, v_hash_archivo: str) -> None:
+        """Renueva ``t_fec_mod`` de una importación en curso para que no se considere interrumpida.
+
+        Las cargas sin punto de reanudación (staging, en paralelo, por lotes) no
+        actualizan ``t_fec_checkpoint``; el trabajo llama a este método mientras avanza.
+        """
+        importacion = self.importacion_repository.get_by_hash(v_hash_archivo)
+        if not importacion or importacion.v_est_importacion not in ('PENDIENTE', 'PROCESANDO'):
+            return
+        importacion.t_fec_mod = datetime.now()
+        self.importacion_repository.update(importacion)
+
+    def actualizar_estado(self, v_hash_archivo: str, estado: str, stats: Optional[Dict] = None) -> None:
+        importacion = self.importacion_repository.get_by_hash(v_hash_archivo)
+        if not importacion:
+            return
+        importacion.v_est_importacion = estado
+        if stats is not None:
+            importacion.i_num_procesados = stats['procesados']
+            importacion.i_num_omitidos = stats['omitidos']
+            importacion.i_num_errores = len(stats['errores'])
+        importacion.t_fec_mod = datetime.now()
+        self.importacion_repository.update(importacion)
@@ -0,0 +1,155 @@
+# app/services/login_throttle.py
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, Optional, Tuple
+from fastapi import HTTPException, status
+
+# Backend de los contadores: memory (por proceso) o redis (compartido entre workers)
+LOGIN_THROTTLE_BACKEND = os.getenv('LOGIN_THROTTLE_BACKEND', 'memory')
+LOGIN_THROTTLE_REDIS_URL = os.getenv('LOGIN_THROTTLE_REDIS_URL', 'redis://localhost:6379/0')
+# Intentos permitidos por usuario (número de documento) dentro de la ventana
+LOGIN_MAX_ATTEMPTS_USUARIO = int(os.getenv('LOGIN_MAX_ATTEMPTS_USUARIO', '5'))
+LOGIN_WINDOW_USUARIO = float(os.getenv('LOGIN_WINDOW_USUARIO', '300'))
+# Intentos permitidos por IP dentro de la ventana
+LOGIN_MAX_ATTEMPTS_IP = int(os.getenv('LOGIN_MAX_ATTEMPTS_IP', '20'))
+LOGIN_WINDOW_IP = float(os.getenv('LOGIN_WINDOW_IP', '60'))
+# Claves que conserva el backend en memoria antes de descartar las más antiguas
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv('LOGIN_THROTTLE_MAX_KEYS', '100000'))
+
+class MemoryThrottleBackend:
+    """Ventana deslizante en memoria: guarda el momento de cada intento admitido por clave."""
+
+    def __init__(self, max_keys: int = LOGIN_THROTTLE_MAX_KEYS):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        """Registra un intento si cabe en la ventana; retorna si se admitió y los segundos de espera."""
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                hits = self._hits[key] = deque()
+            while hits and hits[0] <= now - window:
+                hits.popleft()
+            if len(hits) >= limit:
+                # Con límite 0 no hay intentos registrados: se espera la ventana completa
+                return False, hits[0] + window - now if hits else window
+            hits.append(now)
+            self._hits.move_to_end(key)
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+        return True, 0.0
+
+    async def reset(self, key: str) -> None:
+        with self._lock:
+            self._hits.pop(key, None)
+
+class RedisThrottleBackend:
+    """Ventana deslizante en un sorted set de Redis, compartida por todos los workers.
+
+    Requiere el paquete ``redis``, que no forma parte de requirements.txt.
+    """
+
+    # Limpia la ventana, cuenta y registra el intento en una sola operación atómica
+    SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local window = tonumber(ARGV[2])
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+    if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+        local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+        return {0, math.ceil((tonumber(oldest[2]) + window - now) * 1000)}
+    end
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+    return {1, 0}
+    """
+
+    def __init__(self, url: str = LOGIN_THROTTLE_REDIS_URL):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError("LOGIN_THROTTLE_BACKEND=redis requiere el paquete redis (pip install redis)") from e
+        self.client = redis_asyncio.from_url(url)
+        self._script = self.client.register_script(self.SCRIPT)
+
+    async def hit(self, key: str, limit: int, window: float) -> Tuple[bool, float]:
+        admitido, espera_ms = await self._script(
+            keys=[key], args=[time.time(), window, limit, uuid.uuid4().hex]
+        )
+        return bool(admitido), espera_ms / 1000
+
+    async def reset(self, key: str) -> None:
+        await self.client.delete(key)
+
+def build_backend(name: str = LOGIN_THROTTLE_BACKEND):
+    if name == 'redis':
+        return RedisThrottleBackend()
+    if name == 'memory':
+        return MemoryThrottleBackend()
+    raise ValueError(f"LOGIN_THROTTLE_BACKEND desconocido: {name}")
+
+class LoginThrottle:
+    """Limita los intentos de inicio de sesión por usuario y por IP antes de consultar la base.
+
+    Cuenta todos los intentos admitidos, no solo los fallidos, para que una ráfaga
+    concurrente no pase completa antes de registrar sus fallos. Un inicio de sesión
+    exitoso reinicia el contador del usuario, pero no el de la IP.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        max_usuario: int = LOGIN_MAX_ATTEMPTS_USUARIO,
+        window_usuario: float = LOGIN_WINDOW_USUARIO,
+        max_ip: int = LOGIN_MAX_ATTEMPTS_IP,
+        window_ip: float = LOGIN_WINDOW_IP
+    ):
+        self._backend = backend
+        self.max_usuario = max_usuario
+        self.window_usuario = window_usuario
+        self.max_ip = max_ip
+        self.window_ip = window_ip
+        self.rechazados = 0
+
+    @property
+    def backend(self):
+        # Se crea al primer uso: la API importa el módulo aunque no use Redis
+        if self._backend is None:
+            self._backend = build_backend()
+        return self._backend
+
+    @staticmethod
+    def _usuario_key(usuario: str) -> str:
+        return f"login:usuario:{usuario.strip().lower()}"
+
+    async def check(self, usuario: str, client_ip: Optional[str] = None) -> None:
+        """Registra el intento o lanza 429 si el usuario o la IP superaron su límite."""
+        limites = [(self._usuario_key(usuario), self.max_usuario, self.window_usuario)]
+        if client_ip:
+            limites.insert(0, (f"login:ip:{client_ip}", self.max_ip, self.window_ip))
+        for key, limit, window in limites:
+            admitido, espera = await self.backend.hit(key, limit, window)
+            if not admitido:
+                self.rechazados += 1
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail={
+                        "success": False,
+                        "message": "Demasiados intentos",
+                        "error": {
+                            "code": "AUTH009",
+                            "details": "Demasiados intentos de inicio de sesión. Intente nuevamente más tarde"
+                        }
+                    },
+                    headers={"Retry-After": str(max(int(espera + 0.999), 1))}
+                )
+
+    async def success(self, usuario: str) -> None:
+        await self.backend.reset(self._usuario_key(usuario))
+
+login_throttle = LoginThrottle()
@@ -0,0 +1,174 @@
+# app/services/loop_monitor.py
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger('loop_monitor')
+
+# El monitor solo se activa con LOOP_MONITOR=1
+LOOP_MONITOR_ENABLED = os.getenv('LOOP_MONITOR', '0') == '1'
+# Retraso del event loop a partir del cual se considera bloqueado
+LOOP_MONITOR_THRESHOLD_MS = float(os.getenv('LOOP_MONITOR_THRESHOLD_MS', '100'))
+# Cada cuánto late el loop y revisa el hilo vigilante
+LOOP_MONITOR_INTERVAL_MS = float(os.getenv('LOOP_MONITOR_INTERVAL_MS', '50'))
+# Bloqueos recientes que se conservan con su pila
+LOOP_MONITOR_MAX_EVENTS = int(os.getenv('LOOP_MONITOR_MAX_EVENTS', '50'))
+# Líneas de la pila que se guardan por bloqueo
+STACK_DEPTH = 30
+
+FUERA_DE_PETICION = 'fuera de una petición'
+
+def _route_label(scope: dict) -> str:
+    route = scope.get('route')
+    path = route.path if route is not None else scope.get('path', '')
+    return f"{scope.get('method', '')} {path}".strip()
+
+class EventLoopMonitor:
+    """Mide el retraso del event loop y registra qué ruta lo bloqueó.
+
+    Una tarea del loop late cada ``interval_ms``; un hilo vigilante detecta cuándo
+    el latido se atrasa más de ``threshold_ms`` y, mientras el loop sigue bloqueado,
+    captura la pila del hilo del loop con ``sys._current_frames``. La ruta se
+    obtiene de la tarea en ejecución, registrada por ``LoopMonitorMiddleware``.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = LOOP_MONITOR_THRESHOLD_MS,
+        interval_ms: float = LOOP_MONITOR_INTERVAL_MS,
+        max_events: int = LOOP_MONITOR_MAX_EVENTS
+    ):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.eventos = deque(maxlen=max_events)
+        self.por_ruta: Counter = Counter()
+        self.lag_actual = 0.0
+        self.lag_maximo = 0.0
+        self.bloqueos = 0
+        # Tarea -> scope ASGI de la petición que atiende
+        self.scopes: Dict[asyncio.Task, dict] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._latido = 0.0
+        self._evento: Optional[dict] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat is not None
+
+    def start(self) -> None:
+        """Inicia el monitor; debe llamarse desde el event loop que se quiere vigilar."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._latido = time.monotonic()
+        self._stop.clear()
+        self._heartbeat = self._loop.create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name='loop-monitor', daemon=True)
+        self._watchdog.start()
+        logger.info(
+            f"Monitor del event loop activo (umbral {self.threshold * 1000:.0f} ms, "
+            f"latido {self.interval * 1000:.0f} ms)"
+        )
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._stop.set()
+        self._heartbeat.cancel()
+        try:
+            await self._heartbeat
+        except asyncio.CancelledError:
+            pass
+        self._heartbeat = None
+        self._watchdog.join(timeout=1)
+        self._watchdog = None
+
+    async def _beat(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            # Se mide desde el latido anterior (o desde ``start``): así también cuenta
+            # un bloqueo ocurrido antes de que la tarea llegara a ejecutarse
+            ahora = time.monotonic()
+            lag = max(ahora - self._latido - self.interval, 0.0)
+            self._latido = ahora
+            self.lag_actual = lag
+            self.lag_maximo = max(self.lag_maximo, lag)
+            with self._lock:
+                evento, self._evento = self._evento, None
+            if evento is not None:
+                # El bloqueo terminó: registrar su duración total
+                evento['bloqueo_ms'] = round(lag * 1000, 1)
+                logger.warning(f"Event loop bloqueado {evento['bloqueo_ms']} ms en {evento['ruta']}")
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval / 2):
+            retraso = time.monotonic() - self._latido - self.interval
+            if retraso > self.threshold and self._evento is None:
+                self._capture(retraso)
+
+    def _capture(self, retraso: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread)
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        scope = self.scopes.get(task) if task is not None else None
+        ruta = _route_label(scope) if scope is not None else FUERA_DE_PETICION
+        evento = {
+            'ruta': ruta,
+            'momento': datetime.now().isoformat(),
+            'bloqueo_ms': round(retraso * 1000, 1),
+            'pila': traceback.format_stack(frame)[-STACK_DEPTH:] if frame is not None else [],
+        }
+        with self._lock:
+            self._evento = evento
+            self.eventos.append(evento)
+            self.por_ruta[ruta] += 1
+            self.bloqueos += 1
+
+    def report(self) -> Dict:
+        with self._lock:
+            eventos = [dict(evento) for evento in reversed(self.eventos)]
+            por_ruta = dict(self.por_ruta.most_common())
+        return {
+            'habilitado': self.running,
+            'umbral_ms': round(self.threshold * 1000, 1),
+            'lag_actual_ms': round(self.lag_actual * 1000, 1),
+            'lag_maximo_ms': round(self.lag_maximo * 1000, 1),
+            'bloqueos': self.bloqueos,
+            'por_ruta': por_ruta,
+            'eventos': eventos,
+        }
+
+class LoopMonitorMiddleware:
+    """Middleware ASGI que asocia cada tarea con la petición que atiende."""
+
+    def __init__(self, app, monitor: Optional[EventLoopMonitor] = None):
+        self.app = app
+        self.monitor = monitor or loop_monitor
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not self.monitor.running:
+            await self.app(scope, receive, send)
+            return
+        task = asyncio.current_task()
+        self.monitor.scopes[task] = scope
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.monitor.scopes.pop(task, None)
+
+loop_monitor = EventLoopMonitor()
@@ -0,0 +1,90 @@
+# app/services/password_service.py
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+# Costo de bcrypt; los hashes con otro costo se vuelven a generar al iniciar sesión
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+# Procesos dedicados a bcrypt (0 usa hilos del mismo proceso)
+PASSWORD_WORKERS = int(os.getenv('PASSWORD_WORKERS', str(os.cpu_count() or 1)))
+# Operaciones en curso o en espera antes de responder 503
+PASSWORD_QUEUE_SIZE = int(os.getenv('PASSWORD_QUEUE_SIZE', str(max(PASSWORD_WORKERS, 1) * 8)))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_password(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    # Retorna si la clave es correcta y, si el hash está desactualizado, el nuevo hash
+    if not pwd_context.verify(password, hashed_password):
+        return False, None
+    if pwd_context.needs_update(hashed_password):
+        return True, pwd_context.hash(password)
+    return True, None
+
+class PasswordPoolSaturated(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "success": False,
+                "message": "Servicio ocupado",
+                "error": {
+                    "code": "AUTH006",
+                    "details": "Demasiadas solicitudes de autenticación. Intente nuevamente en unos segundos"
+                }
+            },
+            headers={"Retry-After": "1"}
+        )
+
+class PasswordHasher:
+    """Ejecuta bcrypt fuera del event loop, en un pool de procesos con cola acotada.
+
+    Cuando hay ``queue_size`` operaciones en curso o en espera, las siguientes se
+    rechazan de inmediato con 503 en lugar de acumularse y agotar el tiempo de
+    respuesta de todas.
+    """
+
+    def __init__(self, workers: int = PASSWORD_WORKERS, queue_size: int = PASSWORD_QUEUE_SIZE):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.pendientes = 0
+        self.rechazadas = 0
+        self._executor: Optional[Executor] = None
+
+    def _ensure_started(self) -> Executor:
+        if self._executor is None:
+            if self.workers > 0:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(thread_name_prefix='bcrypt')
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.pendientes >= self.queue_size:
+            self.rechazadas += 1
+            raise PasswordPoolSaturated()
+        executor = self._ensure_started()
+        self.pendientes += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        finally:
+            self.pendientes -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verifica la clave; si el hash usa parámetros antiguos retorna también el nuevo hash."""
+        return await self._run(_verify_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_hasher = PasswordHasher()
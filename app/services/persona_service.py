@@ -2,7 +2,7 @@
 from datetime import datetime, timezone
 from typing import Optional, List
 from fastapi import HTTPException
-from app.repositories.persona_repository import PersonaRepository, PersonaLoginRepository
+from app.repositories.persona_repository import AsyncPersonaRepository, AsyncPersonaLoginRepository
 from app.schemas.persona import (
     PersonaCreate, 
     PersonaUpdate, 
@@ -10,29 +10,26 @@ from app.schemas.persona import (
     PersonaLoginUpdate
 )
 from app.models.persona import Persona, PersonaLogin
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 class PersonaService:
     def __init__(
         self, 
-        persona_repository: PersonaRepository,
-        persona_login_repository: PersonaLoginRepository
+        persona_repository: AsyncPersonaRepository,
+        persona_login_repository: AsyncPersonaLoginRepository
     ):
         self.persona_repository = persona_repository
         self.persona_login_repository = persona_login_repository
     
-    def get_personas(self, skip: int = 0, limit: int = 100) -> PersonaResponse:
-        personas = self.persona_repository.get_all(skip, limit)
+    async def get_personas(self, skip: int = 0, limit: int = 100) -> PersonaResponse:
+        personas = await self.persona_repository.get_all(skip, limit)
         return PersonaResponse(
             success=True,
             message="Personas recuperadas exitosamente",
             data=personas
         )
     
-    def get_persona(self, i_cod_persona: int) -> PersonaResponse:
-        persona = self.persona_repository.get_by_id(i_cod_persona)
+    async def get_persona(self, i_cod_persona: int) -> PersonaResponse:
+        persona = await self.persona_repository.get_by_id(i_cod_persona)
         if not persona:
             return PersonaResponse(
                 success=False,
@@ -49,20 +46,20 @@ class PersonaService:
             data=persona
         )
 
-    def get_personas_by_empresa(self, v_cod_empresa: str) -> PersonaResponse:
-        personas = self.persona_repository.get_by_empresa(v_cod_empresa)
+    async def get_personas_by_empresa(self, v_cod_empresa: str) -> PersonaResponse:
+        personas = await self.persona_repository.get_by_empresa(v_cod_empresa)
         return PersonaResponse(
             success=True,
             message="Personas recuperadas exitosamente",
             data=personas
         )
     
-    def create_persona(
+    async def create_persona(
         self, 
         persona_data: PersonaCreate,
         audit_data: dict
     ) -> PersonaResponse:
-        existing_persona = self.persona_repository.get_by_documento(persona_data.v_num_documento)
+        existing_persona = await self.persona_repository.get_by_documento(persona_data.v_num_documento)
         if existing_persona:
             return PersonaResponse(
                 success=False,
@@ -85,7 +82,7 @@ class PersonaService:
             t_fec_reg=audit_data["t_fec_reg"]
         )
         
-        created_persona = self.persona_repository.create(new_persona)
+        created_persona = await self.persona_repository.create(new_persona)
         
         return PersonaResponse(
             success=True,
@@ -93,14 +90,14 @@ class PersonaService:
             data=created_persona
         )
     
-    def update_persona(
+    async def update_persona(
         self, 
         i_cod_persona: int, 
         persona_data: PersonaUpdate,
         audit_data: dict
     ) -> PersonaResponse:
         # Verificar si existe la persona
-        persona = self.persona_repository.get_by_id(i_cod_persona)
+        persona = await self.persona_repository.get_by_id(i_cod_persona)
         if not persona:
             return PersonaResponse(
                 success=False,
@@ -113,7 +110,7 @@ class PersonaService:
         
         # Verificar documento único de ser actualizado
         if persona_data.v_num_documento:
-            existing_persona = self.persona_repository.get_by_documento(persona_data.v_num_documento)
+            existing_persona = await self.persona_repository.get_by_documento(persona_data.v_num_documento)
             if existing_persona and existing_persona.i_cod_persona != i_cod_persona:
                 return PersonaResponse(
                     success=False,
@@ -140,7 +137,7 @@ class PersonaService:
         persona.v_ip_mod = audit_data["v_ip_mod"]
         persona.t_fec_mod = datetime.now(timezone.utc)
         
-        updated_persona = self.persona_repository.update(persona)
+        updated_persona = await self.persona_repository.update(persona)
         
         return PersonaResponse(
             success=True,
@@ -148,12 +145,12 @@ class PersonaService:
             data=updated_persona
         )
     
-    def delete_persona(
+    async def delete_persona(
         self, 
         i_cod_persona: int, 
         audit_data: dict
     ) -> PersonaResponse:
-        persona = self.persona_repository.get_by_id(i_cod_persona)
+        persona = await self.persona_repository.get_by_id(i_cod_persona)
         if not persona:
             return PersonaResponse(
                 success=False,
@@ -170,7 +167,7 @@ class PersonaService:
         persona.v_ip_mod = audit_data["v_ip_mod"]
         persona.t_fec_mod = datetime.utcnow()
         
-        self.persona_repository.delete(persona)
+        await self.persona_repository.delete(persona)
         
         return PersonaResponse(
             success=True,
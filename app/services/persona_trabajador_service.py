@@ -1,6 +1,6 @@
 # app/services/persona_trabajador_service.py
 from datetime import datetime, timezone
-from app.repositories.persona_trabajador_repository import PersonaTrabajadorRepository
+from app.repositories.persona_trabajador_repository import AsyncPersonaTrabajadorRepository
 from app.schemas.persona_trabajador import (
     PersonaTrabajadorCreate,
     PersonaTrabajadorUpdate,
@@ -9,19 +9,19 @@ from app.schemas.persona_trabajador import (
 from app.models.persona_trabajador import PersonaTrabajador
 
 class PersonaTrabajadorService:
-    def __init__(self, trabajador_repository: PersonaTrabajadorRepository):
+    def __init__(self, trabajador_repository: AsyncPersonaTrabajadorRepository):
         self.trabajador_repository = trabajador_repository
     
-    def get_trabajadores(self, skip: int = 0, limit: int = 100) -> PersonaTrabajadorResponse:
-        trabajadores = self.trabajador_repository.get_all(skip, limit)
+    async def get_trabajadores(self, skip: int = 0, limit: int = 100) -> PersonaTrabajadorResponse:
+        trabajadores = await self.trabajador_repository.get_all(skip, limit)
         return PersonaTrabajadorResponse(
             success=True,
             message="Trabajadores recuperados exitosamente",
             data=trabajadores
         )
     
-    def get_trabajador(self, i_cod_trabajador: int) -> PersonaTrabajadorResponse:
-        trabajador = self.trabajador_repository.get_by_id(i_cod_trabajador)
+    async def get_trabajador(self, i_cod_trabajador: int) -> PersonaTrabajadorResponse:
+        trabajador = await self.trabajador_repository.get_by_id(i_cod_trabajador)
         if not trabajador:
             return PersonaTrabajadorResponse(
                 success=False,
@@ -38,13 +38,13 @@ class PersonaTrabajadorService:
             data=trabajador
         )
     
-    def create_trabajador(
+    async def create_trabajador(
         self, 
         trabajador_data: PersonaTrabajadorCreate,
         audit_data: dict
     ) -> PersonaTrabajadorResponse:
         # Verificar si ya existe un trabajador para esta persona
-        existing_trabajador = self.trabajador_repository.get_by_persona(
+        existing_trabajador = await self.trabajador_repository.get_cod_persona(
             trabajador_data.i_cod_persona
         )
         
@@ -74,7 +74,7 @@ class PersonaTrabajadorService:
             v_ip_reg=audit_data["v_ip_reg"],
         )
         
-        created_trabajador = self.trabajador_repository.create(new_trabajador)
+        created_trabajador = await self.trabajador_repository.create(new_trabajador)
         
         return PersonaTrabajadorResponse(
             success=True,
@@ -82,13 +82,13 @@ class PersonaTrabajadorService:
             data=created_trabajador
         )
     
-    def update_trabajador(
+    async def update_trabajador(
         self,
         i_cod_trabajador: int,
         trabajador_data: PersonaTrabajadorUpdate,
         audit_data: dict
     ) -> PersonaTrabajadorResponse:
-        trabajador = self.trabajador_repository.get_by_id(i_cod_trabajador)
+        trabajador = await self.trabajador_repository.get_by_id(i_cod_trabajador)
         if not trabajador:
             return PersonaTrabajadorResponse(
                 success=False,
@@ -119,7 +119,7 @@ class PersonaTrabajadorService:
         trabajador.v_ip_mod = audit_data["v_ip_mod"]
         trabajador.t_fec_mod = datetime.utcnow()
         
-        updated_trabajador = self.trabajador_repository.update(trabajador)
+        updated_trabajador = await self.trabajador_repository.update(trabajador)
         
         return PersonaTrabajadorResponse(
             success=True,
@@ -127,12 +127,12 @@ class PersonaTrabajadorService:
             data=updated_trabajador
         )
     
-    def delete_trabajador(
+    async def delete_trabajador(
         self,
         i_cod_trabajador: int,
         audit_data: dict
     ) -> PersonaTrabajadorResponse:
-        trabajador = self.trabajador_repository.get_by_id(i_cod_trabajador)
+        trabajador = await self.trabajador_repository.get_by_id(i_cod_trabajador)
         if not trabajador:
             return PersonaTrabajadorResponse(
                 success=False,
@@ -149,7 +149,7 @@ class PersonaTrabajadorService:
         trabajador.v_ip_mod = audit_data["v_ip_mod"]
         trabajador.t_fec_mod = datetime.now(timezone.utc)
         
-        self.trabajador_repository.delete(trabajador)
+        await self.trabajador_repository.delete(trabajador)
         
         return PersonaTrabajadorResponse(
             success=True,
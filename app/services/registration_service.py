@@ -1,19 +1,16 @@
 # app/services/registration_service.py
-from datetime import datetime, timezone
-from passlib.context import CryptContext
-from app.repositories.registration_repository import RegistrationRepository
+from app.repositories.registration_repository import AsyncRegistrationRepository
 from app.schemas.registration import RegistrationRequest, RegistrationResponse
 from app.models.persona import PersonaLogin
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.services.password_service import password_hasher
 
 class RegistrationService:
-    def __init__(self, registration_repository: RegistrationRepository):
+    def __init__(self, registration_repository: AsyncRegistrationRepository):
         self.registration_repository = registration_repository
 
-    def validate_registration(self, registration_data: RegistrationRequest) -> RegistrationResponse:
+    async def validate_registration(self, registration_data: RegistrationRequest) -> RegistrationResponse:
         # Verificar si existe la persona
-        persona = self.registration_repository.get_persona_by_documento(
+        persona = await self.registration_repository.get_persona_by_documento(
             registration_data.documento
         )
         
@@ -28,7 +25,7 @@ class RegistrationService:
             )
         
         # Verificar si ya tiene login
-        existing_login = self.registration_repository.get_existing_login(
+        existing_login = await self.registration_repository.get_existing_login(
             persona.i_cod_persona
         )
         
@@ -43,7 +40,7 @@ class RegistrationService:
             )
             
         # Verificar si el correo ya está registrado
-        existing_email = self.registration_repository.get_by_correo(
+        existing_email = await self.registration_repository.get_by_correo(
             registration_data.correo
         )
         
@@ -62,12 +59,12 @@ class RegistrationService:
             message="Validación exitosa"
         )
     
-    def register(self, registration_data: RegistrationRequest, audit_data: dict) -> RegistrationResponse:
-        persona = self.registration_repository.get_persona_by_documento(
+    async def register(self, registration_data: RegistrationRequest, audit_data: dict) -> RegistrationResponse:
+        persona = await self.registration_repository.get_persona_by_documento(
             registration_data.documento
         )
         
-        hashed_password = pwd_context.hash(registration_data.contrasenia)
+        hashed_password = await password_hasher.hash(registration_data.contrasenia)
         new_login = PersonaLogin(
             i_cod_persona=persona.i_cod_persona,
             v_des_usuario=persona.v_num_documento,
@@ -81,7 +78,7 @@ class RegistrationService:
             v_ip_reg=audit_data["v_ip_reg"],
         )
         
-        self.registration_repository.create_login(new_login)
+        await self.registration_repository.create_login(new_login)
         
         return RegistrationResponse(
             success=True,
@@ -0,0 +1,142 @@
+# app/services/token_codec.py
+import os
+from typing import Dict, Optional
+import jwt as pyjwt
+from jose import ExpiredSignatureError, JWTError, jwk
+from jose import jwt as jose_jwt
+from dotenv import load_dotenv
+
+load_dotenv()
+# Librería JWT: jose (python-jose) o pyjwt; python -m app.benchmarks.token_codec compara ambas
+JWT_BACKEND = os.getenv('JWT_BACKEND', 'jose')
+ALGORITHM = os.getenv('ALGORITHM', 'HS512')
+SECRET_KEY = os.getenv('SECRET_KEY')
+# Algoritmos asimétricos (RS*, PS*, ES*): la clave privada solo en los nodos que emiten
+# tokens; los que solo validan necesitan la pública
+JWT_PRIVATE_KEY_FILE = os.getenv('JWT_PRIVATE_KEY_FILE')
+JWT_PUBLIC_KEY_FILE = os.getenv('JWT_PUBLIC_KEY_FILE')
+
+BACKENDS = ('jose', 'pyjwt')
+
+class TokenExpiredError(Exception):
+    pass
+
+class TokenInvalidError(Exception):
+    pass
+
+def _read_key(path: Optional[str]) -> Optional[str]:
+    if not path:
+        return None
+    with open(path, encoding='utf-8') as key_file:
+        return key_file.read()
+
+class TokenCodec:
+    """Firma y verifica JWT con la clave ya preparada.
+
+    La clave (bytes del secreto HMAC o la clave RSA/EC ya leída del PEM) se
+    construye una sola vez al crear el codec, no en cada ``encode``/``decode``.
+    ``decode`` exige ``exp`` y lo valida la librería.
+    """
+
+    name = ''
+
+    def __init__(self, algorithm: str, signing_key, verifying_key):
+        self.algorithm = algorithm
+        self._signing_key = self._prepare(signing_key) if signing_key is not None else None
+        self._verifying_key = self._prepare(verifying_key) if verifying_key is not None else None
+
+    def _prepare(self, key):
+        raise NotImplementedError
+
+    def encode(self, claims: Dict) -> str:
+        if self._signing_key is None:
+            raise TokenInvalidError(f"No hay clave privada para firmar con {self.algorithm} (JWT_PRIVATE_KEY_FILE)")
+        return self._encode(claims)
+
+    def _encode(self, claims: Dict) -> str:
+        raise NotImplementedError
+
+    def decode(self, token: str) -> Dict:
+        raise NotImplementedError
+
+class JoseTokenCodec(TokenCodec):
+    name = 'jose'
+
+    def _prepare(self, key):
+        return jwk.construct(key, self.algorithm)
+
+    def _encode(self, claims: Dict) -> str:
+        return jose_jwt.encode(claims, self._signing_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict:
+        try:
+            return jose_jwt.decode(
+                token,
+                self._verifying_key,
+                algorithms=[self.algorithm],
+                options={"require_exp": True}
+            )
+        except ExpiredSignatureError as e:
+            raise TokenExpiredError(str(e)) from e
+        except JWTError as e:
+            raise TokenInvalidError(str(e)) from e
+
+class PyJWTTokenCodec(TokenCodec):
+    name = 'pyjwt'
+
+    def __init__(self, algorithm: str, signing_key, verifying_key):
+        self._jwt = pyjwt.PyJWT()
+        self._algorithm = pyjwt.get_algorithm_by_name(algorithm)
+        super().__init__(algorithm, signing_key, verifying_key)
+
+    def _prepare(self, key):
+        return self._algorithm.prepare_key(key)
+
+    def _encode(self, claims: Dict) -> str:
+        return self._jwt.encode(claims, self._signing_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> Dict:
+        try:
+            return self._jwt.decode(
+                token,
+                self._verifying_key,
+                algorithms=[self.algorithm],
+                options={"require": ["exp"]}
+            )
+        except pyjwt.ExpiredSignatureError as e:
+            raise TokenExpiredError(str(e)) from e
+        except pyjwt.InvalidTokenError as e:
+            raise TokenInvalidError(str(e)) from e
+
+def build_codec(
+    backend: str = JWT_BACKEND,
+    algorithm: str = ALGORITHM,
+    secret_key: Optional[str] = None,
+    private_key: Optional[str] = None,
+    public_key: Optional[str] = None
+) -> TokenCodec:
+    """Crea el codec configurado; sin argumentos toma las claves del entorno."""
+    codecs = {'jose': JoseTokenCodec, 'pyjwt': PyJWTTokenCodec}
+    if backend not in codecs:
+        raise ValueError(f"JWT_BACKEND desconocido: {backend} (opciones: {', '.join(BACKENDS)})")
+
+    if algorithm.startswith('HS'):
+        secret_key = secret_key or SECRET_KEY
+        if not secret_key:
+            raise ValueError(f"{algorithm} requiere SECRET_KEY")
+        signing_key = verifying_key = secret_key
+    else:
+        signing_key = private_key or _read_key(JWT_PRIVATE_KEY_FILE)
+        verifying_key = public_key or _read_key(JWT_PUBLIC_KEY_FILE)
+        if verifying_key is None:
+            raise ValueError(f"{algorithm} requiere la clave pública (JWT_PUBLIC_KEY_FILE)")
+    return codecs[backend](algorithm, signing_key, verifying_key)
+
+_token_codec: Optional[TokenCodec] = None
+
+def get_token_codec() -> TokenCodec:
+    """Codec del proceso, creado al primer uso para no exigir claves a quien no usa tokens."""
+    global _token_codec
+    if _token_codec is None:
+        _token_codec = build_codec()
+    return _token_codec
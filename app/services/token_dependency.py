@@ -1,20 +1,14 @@
 # app/services/token_dependency.py
-from fastapi import Depends, Header, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import Header, HTTPException
 from typing import Optional
-from app.loaders.database import get_db
-from app.repositories.auth_repository import AuthRepository
-from app.services.token_service import TokenService
+from app.services.token_service import token_service
 
 async def validate_token(
-    authorization: Optional[str] = Header(None, description="Bearer token"),
-    db: Session = Depends(get_db)
+    authorization: Optional[str] = Header(None, description="Bearer token")
 ) -> dict:
-    print("Se está ejecutando la validación del token...")
+    # Solo verifica la firma y vigencia del JWT: no toma conexiones del pool
     if not authorization:
         raise HTTPException(status_code=401, detail="No se otorgó token de autenticación")
-        
+
     token = authorization.split(" ")[1] if authorization.startswith("Bearer ") else authorization
-    auth_repository = AuthRepository(db)
-    token_service = TokenService(auth_repository)
-    return token_service.validate_token(token)
\ No newline at end of file
+    return token_service.validate_token(token)
@@ -1,20 +1,71 @@
 # app/services/token_service.py
-from datetime import datetime, timezone
-from typing import Optional, Dict
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
 from fastapi import HTTPException, status
-from jose import ExpiredSignatureError, jwt, JWTError
-from app.repositories.auth_repository import AuthRepository
+from app.services.token_codec import TokenCodec, TokenExpiredError, TokenInvalidError, get_token_codec
 import os
-from datetime import datetime
-from dotenv import load_dotenv
+# Tokens decodificados que se conservan en memoria (0 desactiva la caché)
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', '1024'))
 
-load_dotenv()
-SECRET_KEY = os.getenv('SECRET_KEY')
-ALGORITHM = os.getenv('ALGORITHM')
+class TokenClaimsCache:
+    """Caché LRU acotada de claims ya verificados, indexada por el SHA-256 del token.
+
+    Cada entrada vence en el ``exp`` del token, así que un token vencido nunca se
+    sirve desde la caché y vuelve a pasar por la verificación completa.
+    """
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        if self.max_size <= 0:
+            return None
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            exp, payload = entry
+            if time.time() >= exp:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return dict(payload)
+
+    def put(self, token: str, payload: Dict) -> None:
+        exp = payload.get('exp')
+        if self.max_size <= 0 or not isinstance(exp, (int, float)):
+            return
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = (float(exp), dict(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
 
 class TokenService:
-    def __init__(self, auth_repository: AuthRepository):
-        self.auth_repository = auth_repository
+    def __init__(self, cache: Optional[TokenClaimsCache] = None, codec: Optional[TokenCodec] = None):
+        self.cache = cache if cache is not None else TokenClaimsCache()
+        self._codec = codec
+
+    @property
+    def codec(self) -> TokenCodec:
+        if self._codec is None:
+            self._codec = get_token_codec()
+        return self._codec
 
     def validate_token(self, token: str) -> Dict:
         if not token:
@@ -30,25 +81,18 @@ class TokenService:
                 }
             )
 
-        try:
-            # Decodificar el token con validación automática de expiración
-            payload = jwt.decode(
-                token, 
-                SECRET_KEY, 
-                algorithms=[ALGORITHM], 
-                options={"verify_exp": True}  # Habilitar validación del campo `exp`
-            )
+        # Token ya verificado y vigente: se evita decodificar y verificar la firma
+        cached = self.cache.get(token)
+        if cached is not None:
+            return cached
 
-            # Verificar la expiración manualmente usando UTC
-            now = datetime.now(timezone.utc)
-            exp = datetime.fromtimestamp(payload['exp'], tz=timezone.utc)
-
-            if now > exp:
-                raise ExpiredSignatureError("Token has expired")
-            
+        try:
+            # La librería verifica la firma y exige un `exp` vigente
+            payload = self.codec.decode(token)
+            self.cache.put(token, payload)
             return payload
-  
-        except ExpiredSignatureError:
+
+        except TokenExpiredError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail={
@@ -61,7 +105,7 @@ class TokenService:
                 }
             )
 
-        except JWTError:
+        except TokenInvalidError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail={
@@ -72,4 +116,6 @@ class TokenService:
                         "details": "Token de autenticación inválido"
                     }
                 }
-            )
\ No newline at end of file
+            )
+
+token_service = TokenService()
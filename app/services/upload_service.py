@@ -0,0 +1,40 @@
+# app/services/upload_service.py
+import hashlib
+import os
+import uuid
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+UPLOAD_DIR = os.path.join("data", "uploads")
+# Tamaño de cada bloque leído de la carga
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+async def spool_upload(file: UploadFile, directory: str = UPLOAD_DIR) -> tuple[str, str]:
+    """Guarda la carga en disco por bloques bajo una ruta única.
+
+    Retorna la ruta del archivo y su hash SHA-256, calculado mientras se escribe.
+    """
+    os.makedirs(directory, exist_ok=True)
+    filename = os.path.basename(file.filename or "archivo")
+    file_path = os.path.join(directory, f"{uuid.uuid4().hex}_{filename}")
+
+    sha256 = hashlib.sha256()
+    try:
+        with open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                sha256.update(chunk)
+                await run_in_threadpool(buffer.write, chunk)
+    except Exception:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+    return file_path, sha256.hexdigest()
+
+def file_sha256(file_path: str) -> str:
+    """Calcula el hash SHA-256 de un archivo en disco, leyéndolo por bloques."""
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            sha256.update(chunk)
+    return sha256.hexdigest()
@@ -0,0 +1,81 @@
+# app/test/conftest.py
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+# La aplicación crea su motor al importarse: la base SQLite de prueba se define antes.
+# Se sobrescribe siempre para no escribir nunca en la base configurada en el entorno.
+TEST_DIR = tempfile.mkdtemp(prefix='griesgos_test_')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+os.environ.pop('ASYNC_DATABASE_URL', None)
+os.environ['IMPORT_LOG_DIR'] = os.path.join(TEST_DIR, 'logs')
+os.environ['IMPORT_PROFILE_DIR'] = os.path.join(TEST_DIR, 'profiles')
+os.environ.setdefault('SECRET_KEY', 'clave-de-prueba-' * 5)
+
+import pandas as pd
+import pytest
+from sqlalchemy import delete
+import app.models  # noqa: F401  Registra todas las tablas en Base.metadata
+from app.loaders.database import SessionLocal, engine, init_db
+from app.loaders.load_data import REQUIRED_COLUMNS
+from app.loaders.master_data import MODEL_MAP, master_data_cache
+from app.models.base import Base
+
+def _fila(i: int, **cambios) -> dict:
+    """Fila válida del extracto de RR. HH.; ``cambios`` reemplaza columnas por su nombre en el Excel."""
+    fila = {
+        'ID de persona': 1000 + i,
+        'Numero documento': str(40000000 + i),
+        'Nombres': f'Nombre{i}',
+        'Primer apellido': f'Apellido{i}',
+        'Fecha de ingreso': datetime(2020, 1, 1) + timedelta(days=i),
+        MODEL_MAP['unidad'][1]: f'Unidad{i % 3}',
+        MODEL_MAP['categoria'][1]: f'Categoria{i % 2}',
+        MODEL_MAP['puesto'][1]: f'Puesto{i % 4}',
+        MODEL_MAP['area'][1]: f'Area{i % 5}',
+    }
+    fila.update(cambios)
+    return fila
+
+@pytest.fixture(scope='session', autouse=True)
+def test_database():
+    init_db()
+    yield engine
+    engine.dispose()
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+@pytest.fixture(autouse=True)
+def clean_tables(test_database):
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(delete(table))
+    # Los códigos en caché apuntan a filas que ya no existen
+    master_data_cache.clear()
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def fila():
+    return _fila
+
+@pytest.fixture
+def extracto(tmp_path):
+    """Escribe un Excel con las filas indicadas; ``hojas`` permite varias hojas con nombre."""
+    def crear(filas=None, nombre='extracto.xlsx', hojas=None):
+        ruta = tmp_path / nombre
+        hojas = hojas or {'Hoja1': filas}
+        with pd.ExcelWriter(ruta) as writer:
+            for hoja, contenido in hojas.items():
+                pd.DataFrame(contenido, columns=None if contenido else REQUIRED_COLUMNS).to_excel(
+                    writer, sheet_name=hoja, index=False
+                )
+        return str(ruta)
+    return crear
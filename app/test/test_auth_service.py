@@ -0,0 +1,95 @@
+# app/test/test_auth_service.py
+import asyncio
+import pytest
+from passlib.context import CryptContext
+from sqlalchemy import func, select
+from app.loaders.database import AsyncSessionLocal, SessionLocal
+from app.models.persona import Persona, PersonaLogin
+from app.models.refresh_token import RefreshToken
+from app.repositories.auth_repository import AsyncAuthRepository
+from app.repositories.refresh_token_repository import AsyncRefreshTokenRepository
+from app.schemas.auth import LoginRequest
+from app.services import auth_service
+from app.services.auth_service import AuthService
+from app.services.login_throttle import LoginThrottle, MemoryThrottleBackend
+from app.services.password_service import BCRYPT_ROUNDS, PasswordHasher
+
+DOCUMENTO = '40000001'
+CLAVE = 'clave-segura'
+
+@pytest.fixture
+def usuario(monkeypatch):
+    # bcrypt en hilos y contadores propios: la prueba no comparte el estado de la API
+    hasher = PasswordHasher(workers=0)
+    monkeypatch.setattr(auth_service, 'password_hasher', hasher)
+    monkeypatch.setattr(auth_service, 'login_throttle', LoginThrottle(MemoryThrottleBackend()))
+    with SessionLocal() as session:
+        persona = Persona(v_num_documento=DOCUMENTO, v_des_nombres='Ana', v_des_apellidos='Pérez', i_est_registro=1)
+        persona.login = PersonaLogin(
+            v_des_usuario=DOCUMENTO,
+            v_des_clave=CryptContext(schemes=["bcrypt"], bcrypt__rounds=BCRYPT_ROUNDS).hash(CLAVE),
+            i_est_registro=1
+        )
+        session.add(persona)
+        session.commit()
+    yield DOCUMENTO
+    hasher.shutdown()
+
+async def con_servicio(escenario):
+    async with AsyncSessionLocal() as db:
+        return await escenario(AuthService(AsyncAuthRepository(db), AsyncRefreshTokenRepository(db)))
+
+def iniciar_sesion(servicio: AuthService):
+    return servicio.login(LoginRequest(usuario=DOCUMENTO, contrasenia=CLAVE), '10.0.0.1')
+
+def tokens_activos() -> int:
+    with SessionLocal() as session:
+        return session.execute(
+            select(func.count()).select_from(RefreshToken).where(RefreshToken.i_est_registro == 1)
+        ).scalar()
+
+def test_refresh_rotates_token_within_family(usuario):
+    async def escenario(servicio):
+        login = await iniciar_sesion(servicio)
+        renovada = await servicio.refresh(login.data['refresh_token'])
+        return login, renovada
+
+    login, renovada = asyncio.run(con_servicio(escenario))
+
+    assert login.success
+    assert renovada.success
+    assert renovada.data['token']
+    assert renovada.data['refresh_token'] != login.data['refresh_token']
+    with SessionLocal() as session:
+        familias = session.execute(select(RefreshToken.v_cod_familia).distinct()).scalars().all()
+    assert len(familias) == 1
+
+def test_reused_refresh_token_revokes_family(usuario):
+    async def escenario(servicio):
+        login = await iniciar_sesion(servicio)
+        renovada = await servicio.refresh(login.data['refresh_token'])
+        # El token original se presenta otra vez, p. ej. desde una copia robada
+        reutilizada = await servicio.refresh(login.data['refresh_token'])
+        siguiente = await servicio.refresh(renovada.data['refresh_token'])
+        return reutilizada, siguiente
+
+    reutilizada, siguiente = asyncio.run(con_servicio(escenario))
+
+    assert reutilizada.error['code'] == 'AUTH008'
+    # También deja de servir el token legítimo emitido en la rotación
+    assert siguiente.error['code'] == 'AUTH008'
+    assert tokens_activos() == 0
+
+def test_logout_revokes_session_and_unknown_token_is_rejected(usuario):
+    async def escenario(servicio):
+        login = await iniciar_sesion(servicio)
+        await servicio.logout(login.data['refresh_token'])
+        tras_logout = await servicio.refresh(login.data['refresh_token'])
+        desconocido = await servicio.refresh('token-que-no-existe')
+        return tras_logout, desconocido
+
+    tras_logout, desconocido = asyncio.run(con_servicio(escenario))
+
+    assert tras_logout.error['code'] == 'AUTH008'
+    assert desconocido.error['code'] == 'AUTH007'
+    assert tokens_activos() == 0
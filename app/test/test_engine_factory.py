@@ -0,0 +1,73 @@
+# app/test/test_engine_factory.py
+import pytest
+from sqlalchemy import create_engine, event, make_url, text
+from sqlalchemy.pool import NullPool, QueuePool
+from app.loaders.engine_factory import (
+    SQLITE_MEMORY_DATABASE,
+    async_database_url,
+    create_app_engine,
+    database_url,
+    engine_options,
+    set_sqlite_begin,
+)
+
+def test_sqlite_memory_url_is_shared_between_connections(monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+
+    url = database_url()
+
+    assert url.database == SQLITE_MEMORY_DATABASE
+    assert url.query['mode'] == 'memory'
+    assert url.query['cache'] == 'shared'
+    assert engine_options(url)['poolclass'] is QueuePool
+
+def test_async_url_uses_async_driver_of_same_database(monkeypatch):
+    monkeypatch.delenv('ASYNC_DATABASE_URL', raising=False)
+
+    assert async_database_url(make_url('sqlite:////tmp/base.db')).drivername == 'sqlite+aiosqlite'
+    assert async_database_url(make_url('mssql+pyodbc://servidor/base')).drivername == 'mssql+aioodbc'
+    with pytest.raises(ValueError):
+        async_database_url(make_url('oracle://servidor/base'))
+
+    monkeypatch.setenv('ASYNC_DATABASE_URL', 'postgresql+asyncpg://otro/base')
+    assert async_database_url(make_url('sqlite:////tmp/base.db')).host == 'otro'
+
+def test_engine_options_follow_dialect_and_environment(monkeypatch):
+    monkeypatch.setenv('DB_POOL_SIZE', '12')
+    monkeypatch.setenv('DB_FAST_EXECUTEMANY', '0')
+
+    mssql = engine_options(make_url('mssql+pyodbc://servidor/base'))
+    postgres = engine_options(make_url('postgresql+asyncpg://servidor/base'))
+    aiosqlite = engine_options(make_url('sqlite+aiosqlite:////tmp/base.db'))
+
+    assert mssql['pool_size'] == 12
+    assert mssql['fast_executemany'] is False
+    assert 'use_insertmanyvalues' not in mssql
+    assert postgres['use_insertmanyvalues'] is True
+    assert aiosqlite['poolclass'] is NullPool
+    assert 'pool_size' not in aiosqlite
+
+def test_sqlite_engine_supports_savepoints_and_begin_mode(tmp_path):
+    engine = create_app_engine(f"sqlite:///{tmp_path / 'motor.db'}")
+    sentencias = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+
+    try:
+        assert set_sqlite_begin(engine, "BEGIN IMMEDIATE") == "BEGIN"
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (v INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+            nested = conn.begin_nested()
+            conn.execute(text("INSERT INTO t VALUES (2)"))
+            nested.rollback()
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT v FROM t")).scalars().all() == [1]
+        assert "BEGIN IMMEDIATE" in sentencias
+    finally:
+        engine.dispose()
+
+    # Un engine que no creó la fábrica no tiene sentencia BEGIN propia
+    assert set_sqlite_begin(create_engine('sqlite://'), "BEGIN IMMEDIATE") is None
@@ -0,0 +1,36 @@
+# app/test/test_excel_router.py
+import os
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app.loaders.database import SessionLocal
+from app.models.importacion import ImportacionArchivo
+from app.routers import excel
+from app.services.upload_service import UPLOAD_DIR
+
+def crear_cliente() -> TestClient:
+    app = FastAPI()
+    app.include_router(excel.router)
+    return TestClient(app)
+
+def test_failed_batch_upload_releases_registered_files(tmp_path, monkeypatch):
+    # Las cargas se guardan bajo una ruta relativa al directorio de trabajo
+    monkeypatch.chdir(tmp_path)
+
+    def fallar(*args, **kwargs):
+        raise ValueError("libro dañado")
+
+    monkeypatch.setattr(excel, 'excel_inputs', fallar)
+    archivos = [
+        ('files', ('uno.xlsx', b'contenido uno')),
+        ('files', ('dos.xlsx', b'contenido dos')),
+    ]
+
+    respuesta = crear_cliente().post('/api/excel/upload-batch', files=archivos)
+
+    assert respuesta.json()['success'] is False
+    with SessionLocal() as session:
+        estados = session.execute(select(ImportacionArchivo.v_est_importacion)).scalars().all()
+    # Ningún registro queda PENDIENTE bloqueando una nueva subida del mismo contenido
+    assert estados == ['ERROR', 'ERROR']
+    assert os.listdir(UPLOAD_DIR) == []
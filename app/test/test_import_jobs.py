@@ -0,0 +1,72 @@
+# app/test/test_import_jobs.py
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from app.loaders.database import SessionLocal
+from app.loaders.parallel import new_stats
+from app.models.importacion import ImportacionArchivo
+from app.repositories.importacion_repository import ImportacionRepository
+from app.services import import_job_service
+from app.services.importacion_service import ImportacionService
+
+AUDIT = {key: 'test' for key in ('v_ip_reg', 'v_ip_mod', 'v_host_reg', 'v_host_mod', 'v_usu_reg', 'v_usu_mod')}
+
+def importacion(file_hash: str) -> ImportacionArchivo:
+    with SessionLocal() as session:
+        return ImportacionRepository(session).get_by_hash(file_hash)
+
+def test_running_job_heartbeat_keeps_import_fresh(monkeypatch):
+    file_hash = 'b' * 64
+    with SessionLocal() as session:
+        ImportacionService(ImportacionRepository(session)).registrar(file_hash, 'extracto.xlsx', AUDIT)
+    monkeypatch.setattr(import_job_service, 'IMPORT_HEARTBEAT_SECONDS', 0)
+    reanudable_durante_carga = []
+
+    def run(publish):
+        # Una carga larga sin checkpoints: su última actividad quedó hace horas
+        with SessionLocal() as session:
+            session.execute(
+                update(ImportacionArchivo)
+                .where(ImportacionArchivo.v_hash_archivo == file_hash)
+                .values(t_fec_reg=datetime.now() - timedelta(hours=2), t_fec_mod=datetime.now() - timedelta(hours=2))
+            )
+            session.commit()
+        assert ImportacionService.es_reanudable(importacion(file_hash))
+        publish(new_stats(), 10)
+        reanudable_durante_carga.append(ImportacionService.es_reanudable(importacion(file_hash)))
+        return {**new_stats(), 'error_fatal': None}
+
+    jobs = {'job': {'id': 'job', 'filas_leidas': 0}}
+    import_job_service._execute_job('job', jobs, lambda: 10, run, [file_hash], lambda stats, _: stats)
+
+    assert reanudable_durante_carga == [False]
+    assert jobs['job']['estado'] == 'COMPLETADO'
+    assert importacion(file_hash).v_est_importacion == 'COMPLETADO'
+
+def test_job_deletes_spooled_upload_when_finished(fila, extracto):
+    ruta = extracto([fila(i) for i in range(5)])
+    jobs = {'job': {'id': 'job', 'filas_leidas': 0}}
+
+    import_job_service.run_import_job('job', ruta, None, jobs, delete_file=True)
+
+    assert jobs['job']['estado'] == 'COMPLETADO'
+    assert jobs['job']['procesados'] == 5
+    assert not os.path.exists(ruta)
+
+def test_manager_prunes_jobs_finished_before_ttl():
+    manager = import_job_service.ImportJobManager(max_workers=1)
+    manager.start()
+    try:
+        vencido = (datetime.now() - timedelta(seconds=import_job_service.IMPORT_JOB_TTL_SECONDS + 60)).isoformat()
+        manager._jobs['vencido'] = {'id': 'vencido', 'finalizado': vencido}
+        manager._jobs['reciente'] = {'id': 'reciente', 'finalizado': datetime.now().isoformat()}
+        manager._jobs['en_curso'] = {'id': 'en_curso', 'finalizado': None}
+
+        nuevo = manager._new_job('extracto.xlsx')
+
+        assert manager.get('vencido') is None
+        assert manager.get('reciente') is not None
+        assert manager.get('en_curso') is not None
+        assert manager.get(nuevo)['estado'] == 'PENDIENTE'
+    finally:
+        manager.shutdown()
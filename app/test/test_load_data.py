@@ -0,0 +1,189 @@
+# app/test/test_load_data.py
+import pytest
+from sqlalchemy import func, select, text
+from app.loaders.database import SessionLocal
+from app.loaders.excel_reader import excel_inputs
+from app.loaders.load_data import process_excel, process_excel_batch
+from app.loaders.master_data import MODEL_MAP
+from app.models.persona import Persona
+from app.models.importacion import ImportacionArchivo
+from app.models.persona_trabajador import PersonaTrabajador
+from app.repositories.importacion_repository import ImportacionRepository
+from app.services.importacion_service import ImportacionService
+
+AUDIT = {key: 'test' for key in ('v_ip_reg', 'v_ip_mod', 'v_host_reg', 'v_host_mod', 'v_usu_reg', 'v_usu_mod')}
+# Nombres distintos que genera la fixture ``fila`` por tipo de dato maestro
+MAESTROS_POR_TIPO = {'unidad': 3, 'categoria': 2, 'puesto': 4, 'area': 5}
+
+def consultar(statement):
+    # Sesión corta: en SQLite una lectura abierta bloquearía las escrituras del cargador
+    with SessionLocal() as session:
+        return session.execute(statement).scalar()
+
+def contar(model, *condiciones) -> int:
+    return consultar(select(func.count()).select_from(model).where(*condiciones))
+
+def test_batch_marks_only_unreadable_entry(fila, extracto):
+    ruta = extracto(hojas={
+        'Planilla': [fila(i) for i in range(10)],
+        'Notas': [{'Comentario': 'sin columnas del extracto'}],
+    })
+
+    stats = process_excel_batch(excel_inputs([ruta], todas_las_hojas=True), workers=1, parse_workers=2)
+
+    planilla, notas = stats['archivos']
+    assert planilla['error_fatal'] is None
+    assert planilla['procesados'] == 10
+    assert notas['error_fatal'].startswith('Columnas faltantes')
+    assert stats['error_fatal'] is None
+    assert contar(Persona) == 10
+
+@pytest.mark.parametrize('modo, activos', [('preview', 10), ('aplicar', 9)])
+def test_reconcile_deactivates_missing_workers(fila, extracto, modo, activos):
+    process_excel(extracto([fila(i) for i in range(10)], nombre='inicial.xlsx'), workers=1)
+
+    stats = process_excel(
+        extracto([fila(i) for i in range(1, 10)], nombre='extracto.xlsx'), reconcile=modo, workers=1
+    )
+
+    reconciliacion = stats['reconciliacion']
+    assert reconciliacion['a_desactivar'] == 1
+    assert reconciliacion['desactivados'] == 10 - activos
+    assert contar(PersonaTrabajador, PersonaTrabajador.i_est_registro == 1) == activos
+
+def test_batch_reconcile_skipped_when_sheet_has_missing_columns(fila, extracto):
+    process_excel(extracto([fila(i) for i in range(20)], nombre='inicial.xlsx'), workers=1)
+    # La segunda hoja renombró una columna: sus trabajadores no se leen pero siguen vigentes
+    renombradas = [fila(i) for i in range(19, 20)]
+    for registro in renombradas:
+        registro['Nombre'] = registro.pop('Nombres')
+    ruta = extracto(hojas={'E1': [fila(i) for i in range(19)], 'E2': renombradas}, nombre='lote.xlsx')
+
+    stats = process_excel_batch(
+        excel_inputs([ruta], todas_las_hojas=True), workers=1, reconcile='aplicar'
+    )
+
+    assert stats['archivos'][1]['error_fatal'].startswith('Columnas faltantes')
+    assert 'reconciliacion' not in stats
+    assert contar(PersonaTrabajador, PersonaTrabajador.i_est_registro == 1) == 20
+
+def test_reimport_is_idempotent(fila, extracto):
+    ruta = extracto([fila(i) for i in range(30)])
+
+    primera = process_excel(ruta, batch_size=10, workers=1)
+    segunda = process_excel(ruta, batch_size=10, workers=1)
+
+    assert primera['procesados'] == 30
+    assert segunda['procesados'] == 0
+    assert segunda['omitidos'] == 30
+    assert segunda['errores'] == []
+    assert contar(Persona) == 30
+    assert contar(PersonaTrabajador) == 30
+
+def test_master_data_created_once_per_name(fila, extracto):
+    process_excel(
+        extracto([fila(i) for i in range(30)], nombre='primero.xlsx'), batch_size=10, chunk_size=10, workers=1
+    )
+    process_excel(extracto([fila(i) for i in range(30, 40)], nombre='segundo.xlsx'), workers=1)
+
+    for data_type, (model, _) in MODEL_MAP.items():
+        assert contar(model) == MAESTROS_POR_TIPO[data_type]
+
+def test_dry_run_does_not_create_master_data(fila, extracto):
+    stats = process_excel(extracto([fila(i) for i in range(10)]), dry_run=True, workers=1)
+
+    assert stats['procesados'] == 10
+    assert contar(Persona) == 0
+    for model, _ in MODEL_MAP.values():
+        assert contar(model) == 0
+
+def test_upsert_updates_only_changed_rows(fila, extracto):
+    process_excel(extracto([fila(i) for i in range(10)], nombre='inicial.xlsx'), workers=1)
+    filas = [fila(i) for i in range(10)]
+    filas[3] = fila(3, Nombres='Renombrado')
+
+    stats = process_excel(extracto(filas, nombre='cambios.xlsx'), upsert=True, workers=1)
+
+    assert stats['actualizados'] == 1
+    assert stats['omitidos'] == 9
+    assert stats['procesados'] == 0
+    assert consultar(
+        select(Persona.v_des_nombres).where(Persona.v_num_documento == '40000003')
+    ) == 'Renombrado'
+
+def test_bisection_isolates_failing_row(db, fila, extracto):
+    ruta = extracto([fila(i) for i in range(20)])
+    # La base rechaza un único documento dentro de un lote que de otro modo es válido
+    db.execute(text(
+        "CREATE TRIGGER rechazar_documento BEFORE INSERT ON grietbc_persona "
+        "WHEN NEW.v_num_documento = '40000007' "
+        "BEGIN SELECT RAISE(ABORT, 'documento bloqueado'); END"
+    ))
+    db.commit()
+    try:
+        stats = process_excel(ruta, batch_size=20, workers=1)
+    finally:
+        db.execute(text("DROP TRIGGER rechazar_documento"))
+        db.commit()
+
+    assert stats['error_fatal'] is None
+    assert stats['procesados'] == 19
+    assert len(stats['errores']) == 1
+    assert stats['errores'][0].startswith("Error en fila 8:")
+    assert 'documento bloqueado' in stats['errores'][0]
+    assert contar(Persona) == 19
+    assert contar(PersonaTrabajador) == 19
+
+def test_staging_inserts_only_new_documents(fila, extracto):
+    process_excel(extracto([fila(i) for i in range(10)], nombre='inicial.xlsx'), workers=1)
+
+    stats = process_excel(extracto([fila(i) for i in range(15)], nombre='ampliado.xlsx'), staging=True, workers=1)
+
+    assert stats['error_fatal'] is None
+    assert stats['procesados'] == 5
+    assert contar(Persona) == 15
+    assert contar(PersonaTrabajador) == 15
+
+def test_partitioned_load_matches_serial_load(fila, extracto):
+    filas = [fila(i) for i in range(40)] + [fila(5)]
+
+    stats = process_excel(extracto(filas), batch_size=10, chunk_size=10, workers=2)
+
+    assert stats['error_fatal'] is None
+    assert stats['procesados'] == 40
+    assert stats['omitidos'] == 1
+    assert contar(Persona) == 40
+    assert contar(PersonaTrabajador) == 40
+
+def registrar(file_hash: str) -> ImportacionArchivo:
+    with SessionLocal() as session:
+        importacion, _ = ImportacionService(ImportacionRepository(session)).registrar(
+            file_hash, 'extracto.xlsx', AUDIT
+        )
+    return importacion
+
+def test_interrupted_load_resumes_from_checkpoint(fila, extracto):
+    ruta = extracto([fila(i) for i in range(50)])
+    file_hash = 'a' * 64
+    assert registrar(file_hash) is not None
+
+    def interrumpir(stats, total_filas):
+        if total_filas >= 20:
+            raise RuntimeError("proceso detenido")
+
+    interrumpida = process_excel(
+        ruta, batch_size=10, chunk_size=10, workers=1, file_hash=file_hash, progress_callback=interrumpir
+    )
+    assert interrumpida['error_fatal'] is not None
+    assert consultar(
+        select(ImportacionArchivo.i_num_ult_fila).where(ImportacionArchivo.v_hash_archivo == file_hash)
+    ) == 20
+    assert contar(Persona) == 20
+
+    reanudada = process_excel(ruta, batch_size=10, chunk_size=10, workers=1, file_hash=file_hash)
+
+    assert reanudada['error_fatal'] is None
+    # Las filas confirmadas no se vuelven a consultar: no aparecen como omitidas
+    assert reanudada['procesados'] == 50
+    assert reanudada['omitidos'] == 0
+    assert contar(Persona) == 50
@@ -0,0 +1,71 @@
+# app/test/test_login_throttle.py
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.repositories.auth_repository import AsyncAuthRepository
+from app.schemas.auth import LoginRequest
+from app.services import auth_service
+from app.services.auth_service import AuthService
+from app.services.login_throttle import LoginThrottle, MemoryThrottleBackend
+
+def throttle(**limites) -> LoginThrottle:
+    return LoginThrottle(MemoryThrottleBackend(), **{
+        'max_usuario': 2, 'window_usuario': 60, 'max_ip': 3, 'window_ip': 60, **limites
+    })
+
+def intentar(limitador: LoginThrottle, usuario: str, ip: str = '10.0.0.1'):
+    return asyncio.run(limitador.check(usuario, ip))
+
+def test_user_over_limit_gets_429_with_retry_after():
+    limitador = throttle()
+    intentar(limitador, '40000001')
+    # Los espacios alrededor del documento no lo convierten en otro usuario
+    intentar(limitador, ' 40000001 ', ip='10.0.0.2')
+
+    with pytest.raises(HTTPException) as error:
+        intentar(limitador, '40000001', ip='10.0.0.3')
+
+    assert error.value.status_code == 429
+    assert error.value.detail['error']['code'] == 'AUTH009'
+    assert 1 <= int(error.value.headers['Retry-After']) <= 60
+    assert limitador.rechazados == 1
+
+def test_success_resets_user_window_but_not_ip():
+    limitador = throttle()
+    intentar(limitador, '40000001')
+    intentar(limitador, '40000001')
+    asyncio.run(limitador.success('40000001'))
+
+    intentar(limitador, '40000001')
+
+    # La IP ya acumuló tres intentos admitidos
+    with pytest.raises(HTTPException):
+        intentar(limitador, '40000002')
+
+def test_ip_limit_applies_across_users():
+    limitador = throttle(max_ip=2)
+    intentar(limitador, '40000001')
+    intentar(limitador, '40000002')
+
+    with pytest.raises(HTTPException):
+        intentar(limitador, '40000003')
+    intentar(limitador, '40000003', ip='10.0.0.9')
+
+def test_memory_backend_bounds_tracked_keys():
+    backend = MemoryThrottleBackend(max_keys=2)
+    for clave in ('a', 'b', 'c'):
+        asyncio.run(backend.hit(clave, 1, 60))
+
+    # La clave más antigua se descartó y vuelve a admitirse
+    assert asyncio.run(backend.hit('a', 1, 60)) == (True, 0.0)
+    assert asyncio.run(backend.hit('c', 1, 60))[0] is False
+
+def test_throttled_login_does_not_reach_database(monkeypatch):
+    monkeypatch.setattr(auth_service, 'login_throttle', throttle(max_usuario=0))
+    # Sin sesión: cualquier consulta a la base fallaría
+    servicio = AuthService(AsyncAuthRepository(None))
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(servicio.login(LoginRequest(usuario='40000001', contrasenia='clave'), '10.0.0.1'))
+
+    assert error.value.status_code == 429
@@ -0,0 +1,46 @@
+# app/test/test_loop_monitor.py
+import asyncio
+import time
+import httpx
+from fastapi import FastAPI
+from app.services.loop_monitor import EventLoopMonitor, LoopMonitorMiddleware
+
+def bloquear_loop(segundos: float) -> None:
+    time.sleep(segundos)
+
+def crear_app(monitor: EventLoopMonitor) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(LoopMonitorMiddleware, monitor=monitor)
+
+    @app.get("/lento/{pausa}")
+    async def lento(pausa: float):
+        # Trabajo síncrono dentro de una ruta async: bloquea el event loop
+        bloquear_loop(pausa)
+        return {"ok": True}
+
+    return app
+
+def test_blocking_route_is_reported_with_its_stack():
+    monitor = EventLoopMonitor(threshold_ms=50, interval_ms=10)
+
+    async def escenario():
+        monitor.start()
+        try:
+            transport = httpx.ASGITransport(app=crear_app(monitor))
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                respuesta = await client.get("/lento/0.3")
+            # Dar tiempo al latido para medir la duración del bloqueo
+            await asyncio.sleep(0.1)
+        finally:
+            await monitor.stop()
+        return respuesta
+
+    assert asyncio.run(escenario()).status_code == 200
+
+    reporte = monitor.report()
+    assert reporte['bloqueos'] == 1
+    assert reporte['por_ruta'] == {'GET /lento/{pausa}': 1}
+    evento, = reporte['eventos']
+    assert evento['bloqueo_ms'] >= 250
+    assert any('bloquear_loop' in linea for linea in evento['pila'])
+    assert not monitor.running
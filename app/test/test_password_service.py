@@ -0,0 +1,36 @@
+# app/test/test_password_service.py
+import asyncio
+import pytest
+from passlib.context import CryptContext
+from app.services.password_service import BCRYPT_ROUNDS, PasswordHasher, PasswordPoolSaturated
+
+def test_hash_and_verify_in_pool():
+    hasher = PasswordHasher(workers=0)
+    try:
+        hashed = asyncio.run(hasher.hash('clave-segura'))
+
+        assert asyncio.run(hasher.verify('clave-segura', hashed)) == (True, None)
+        assert asyncio.run(hasher.verify('otra-clave', hashed)) == (False, None)
+    finally:
+        hasher.shutdown()
+
+def test_verify_rehashes_outdated_cost():
+    antiguo = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash('clave-segura')
+    hasher = PasswordHasher(workers=0)
+    try:
+        valida, nuevo_hash = asyncio.run(hasher.verify('clave-segura', antiguo))
+    finally:
+        hasher.shutdown()
+
+    assert valida
+    assert nuevo_hash.startswith(f"$2b${BCRYPT_ROUNDS:02d}$")
+
+def test_saturated_pool_rejects_with_503():
+    hasher = PasswordHasher(workers=0, queue_size=0)
+
+    with pytest.raises(PasswordPoolSaturated) as error:
+        asyncio.run(hasher.hash('clave-segura'))
+
+    assert error.value.status_code == 503
+    assert error.value.detail['error']['code'] == 'AUTH006'
+    assert hasher.rechazadas == 1
@@ -0,0 +1,62 @@
+# app/test/test_token_codec.py
+import time
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from app.services.token_codec import BACKENDS, TokenExpiredError, TokenInvalidError, build_codec
+
+SECRETO = 'secreto-de-prueba-' * 4
+
+def claims(segundos: int = 300) -> dict:
+    return {'sub': '40000001', 'exp': int(time.time()) + segundos}
+
+@pytest.fixture(scope='module')
+def claves_rsa():
+    privada = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    privada_pem = privada.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    publica_pem = privada.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return privada_pem, publica_pem
+
+@pytest.mark.parametrize('emisor', BACKENDS)
+@pytest.mark.parametrize('lector', BACKENDS)
+def test_tokens_are_interchangeable_between_backends(emisor, lector):
+    token = build_codec(emisor, 'HS512', secret_key=SECRETO).encode(claims())
+
+    assert build_codec(lector, 'HS512', secret_key=SECRETO).decode(token)['sub'] == '40000001'
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_expired_token_raises_expired_error(backend):
+    codec = build_codec(backend, 'HS512', secret_key=SECRETO)
+
+    with pytest.raises(TokenExpiredError):
+        codec.decode(codec.encode(claims(segundos=-10)))
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_tampered_or_unbounded_token_is_invalid(backend):
+    codec = build_codec(backend, 'HS512', secret_key=SECRETO)
+    otro = build_codec(backend, 'HS512', secret_key=SECRETO[::-1])
+
+    with pytest.raises(TokenInvalidError):
+        codec.decode(otro.encode(claims()))
+    with pytest.raises(TokenInvalidError):
+        codec.decode(codec.encode({'sub': '40000001'}))
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_rs256_verifies_with_public_key_only(backend, claves_rsa):
+    privada, publica = claves_rsa
+    emisor = build_codec(backend, 'RS256', private_key=privada, public_key=publica)
+    validador = build_codec(backend, 'RS256', public_key=publica)
+
+    assert validador.decode(emisor.encode(claims()))['sub'] == '40000001'
+    with pytest.raises(TokenInvalidError):
+        validador.encode(claims())
+
+def test_invalid_configuration_is_rejected():
+    with pytest.raises(ValueError):
+        build_codec('desconocido', 'HS512', secret_key=SECRETO)
+    with pytest.raises(ValueError):
+        build_codec('jose', 'RS256')
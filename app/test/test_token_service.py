@@ -0,0 +1,94 @@
+# app/test/test_token_service.py
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from app.services import token_dependency
+from app.services.token_codec import build_codec
+from app.services.token_service import TokenClaimsCache, TokenService
+
+SECRETO = 'secreto-de-prueba-' * 4
+
+@pytest.fixture
+def codec():
+    return build_codec('jose', 'HS512', secret_key=SECRETO)
+
+@pytest.fixture
+def servicio(codec, monkeypatch):
+    servicio = TokenService(TokenClaimsCache(max_size=2), codec)
+    servicio.decodificados = 0
+    decode = codec.decode
+
+    def contar_decode(token):
+        servicio.decodificados += 1
+        return decode(token)
+
+    monkeypatch.setattr(codec, 'decode', contar_decode)
+    return servicio
+
+def emitir(codec, segundos: int = 300, **claims) -> str:
+    return codec.encode({'sub': '40000001', 'exp': int(time.time()) + segundos, **claims})
+
+def codigo_error(error: pytest.ExceptionInfo) -> str:
+    return error.value.detail['error']['code']
+
+def test_valid_token_is_decoded_once_and_then_served_from_cache(servicio, codec):
+    token = emitir(codec)
+
+    primero = servicio.validate_token(token)
+    segundo = servicio.validate_token(token)
+
+    assert primero == segundo
+    assert primero['sub'] == '40000001'
+    assert servicio.decodificados == 1
+
+def test_cached_claims_are_copies(servicio, codec):
+    token = emitir(codec)
+    servicio.validate_token(token)['sub'] = 'modificado'
+
+    assert servicio.validate_token(token)['sub'] == '40000001'
+
+@pytest.mark.parametrize('token, codigo', [('', 'AUTH002'), ('no-es-un-jwt', 'AUTH005')])
+def test_missing_or_invalid_token_is_rejected(servicio, token, codigo):
+    with pytest.raises(HTTPException) as error:
+        servicio.validate_token(token)
+
+    assert error.value.status_code == 401
+    assert codigo_error(error) == codigo
+
+def test_expired_token_is_rejected(servicio, codec):
+    with pytest.raises(HTTPException) as error:
+        servicio.validate_token(emitir(codec, segundos=-10))
+
+    assert codigo_error(error) == 'AUTH004'
+
+def test_cache_never_serves_expired_claims():
+    cache = TokenClaimsCache(max_size=10)
+    cache.put('vencido', {'sub': '1', 'exp': time.time() - 1})
+    cache.put('sin-exp', {'sub': '2'})
+
+    assert cache.get('vencido') is None
+    assert cache.get('sin-exp') is None
+
+def test_cache_evicts_least_recently_used():
+    cache = TokenClaimsCache(max_size=2)
+    exp = time.time() + 300
+    cache.put('a', {'sub': 'a', 'exp': exp})
+    cache.put('b', {'sub': 'b', 'exp': exp})
+    cache.get('a')
+    cache.put('c', {'sub': 'c', 'exp': exp})
+
+    assert cache.get('b') is None
+    assert cache.get('a')['sub'] == 'a'
+    assert cache.get('c')['sub'] == 'c'
+
+def test_dependency_reads_bearer_header(servicio, codec, monkeypatch):
+    monkeypatch.setattr(token_dependency, 'token_service', servicio)
+    token = emitir(codec, rol='admin')
+
+    payload = asyncio.run(token_dependency.validate_token(f"Bearer {token}"))
+
+    assert payload['rol'] == 'admin'
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(token_dependency.validate_token(None))
+    assert error.value.status_code == 401
@@ -0,0 +1,105 @@
+# app/test/test_watcher.py
+import json
+import os
+import shutil
+import pytest
+from app.loaders.database import SessionLocal
+from app.loaders.watcher import IngestionDaemon, StableFileTracker
+from app.repositories.importacion_repository import ImportacionRepository
+from app.services.importacion_service import ImportacionService
+from app.services.upload_service import file_sha256
+
+OTRO_ORIGEN = {
+    'v_ip_reg': '10.0.0.1', 'v_ip_mod': '10.0.0.1', 'v_host_reg': 'api', 'v_host_mod': 'api',
+    'v_usu_reg': 'analista', 'v_usu_mod': 'analista',
+}
+
+@pytest.fixture
+def daemon(tmp_path):
+    carpetas = {nombre: str(tmp_path / nombre) for nombre in ('entrada', 'en_proceso', 'procesados', 'fallidos')}
+    servicio = IngestionDaemon(
+        watch_dir=carpetas['entrada'],
+        work_dir=carpetas['en_proceso'],
+        processed_dir=carpetas['procesados'],
+        failed_dir=carpetas['fallidos'],
+        workers=1,
+        interval=0.2,
+        stable_seconds=0
+    )
+    yield servicio
+    servicio.job_manager.shutdown()
+
+def tomar(daemon, ruta: str) -> str:
+    """Deja el extracto en la carpeta de trabajo como si el servicio ya lo hubiera tomado."""
+    destino = os.path.join(daemon.work_dir, f"0123abcd_{os.path.basename(ruta)}")
+    shutil.copy(ruta, destino)
+    return destino
+
+def registrar(ruta: str, audit_data: dict) -> str:
+    file_hash = file_sha256(ruta)
+    with SessionLocal() as session:
+        ImportacionService(ImportacionRepository(session)).registrar(file_hash, 'extracto.xlsx', audit_data)
+    return file_hash
+
+def reportes(directorio: str) -> list:
+    rutas = sorted(nombre for nombre in os.listdir(directorio) if nombre.endswith('.json'))
+    contenido = []
+    for nombre in rutas:
+        with open(os.path.join(directorio, nombre), encoding='utf-8') as f:
+            contenido.append(json.load(f))
+    return contenido
+
+def test_tracker_waits_until_file_stops_changing(tmp_path):
+    tracker = StableFileTracker(stable_seconds=60)
+    (tmp_path / 'extracto.xlsx').write_bytes(b'contenido')
+    (tmp_path / '~$extracto.xlsx').write_bytes(b'bloqueo de Excel')
+
+    assert tracker.poll(str(tmp_path)) == []
+    assert tracker.waiting()
+
+    tracker.stable_seconds = 0
+    assert tracker.poll(str(tmp_path)) == [str(tmp_path / 'extracto.xlsx')]
+
+def test_run_once_imports_and_archives_files(daemon, fila, extracto):
+    shutil.copy(extracto([fila(i) for i in range(5)]), os.path.join(daemon.watch_dir, 'extracto.xlsx'))
+
+    daemon.run(once=True)
+
+    assert os.listdir(daemon.work_dir) == []
+    reporte, = reportes(daemon.processed_dir)
+    assert reporte['estado'] == 'COMPLETADO'
+    assert reporte['procesados'] == 5
+
+def test_own_running_import_is_retried_until_it_finishes(daemon, fila, extracto):
+    ruta = tomar(daemon, extracto([fila(i) for i in range(5)]))
+    # Una ejecución anterior de este servicio se detuvo a medias hace poco
+    file_hash = registrar(ruta, daemon._audit_data())
+    with SessionLocal() as session:
+        ImportacionService(ImportacionRepository(session)).actualizar_estado(file_hash, 'PROCESANDO')
+
+    # Con --una-vez no se espera a que la importación propia venza
+    daemon.run(once=True)
+
+    assert os.path.exists(ruta)
+    assert daemon.diferidos == {ruta: file_hash}
+    assert os.listdir(daemon.processed_dir) == []
+
+    with SessionLocal() as session:
+        ImportacionService(ImportacionRepository(session)).actualizar_estado(file_hash, 'COMPLETADO')
+    daemon.start_pending()
+
+    assert not os.path.exists(ruta)
+    assert daemon.diferidos == {}
+    reporte, = reportes(daemon.processed_dir)
+    assert reporte['estado'] == 'DUPLICADO'
+
+def test_import_running_elsewhere_is_archived(daemon, fila, extracto):
+    ruta = tomar(daemon, extracto([fila(i) for i in range(5)]))
+    registrar(ruta, OTRO_ORIGEN)
+
+    daemon.start_pending()
+
+    assert not os.path.exists(ruta)
+    assert daemon.diferidos == {}
+    reporte, = reportes(daemon.processed_dir)
+    assert reporte['estado'] == 'EN_CURSO'
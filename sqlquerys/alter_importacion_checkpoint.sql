@@ -0,0 +1,15 @@
+-- Punto de reanudación de las importaciones del Excel de RR. HH.
+USE GRiesgosDB;
+GO
+
+IF COL_LENGTH('dbo.griemvc_importacion', 'i_num_ult_fila') IS NULL
+    ALTER TABLE dbo.griemvc_importacion ADD i_num_ult_fila INT NULL DEFAULT 0;
+GO
+
+IF COL_LENGTH('dbo.griemvc_importacion', 'v_des_checkpoint') IS NULL
+    ALTER TABLE dbo.griemvc_importacion ADD v_des_checkpoint NVARCHAR(MAX) NULL;
+GO
+
+IF COL_LENGTH('dbo.griemvc_importacion', 't_fec_checkpoint') IS NULL
+    ALTER TABLE dbo.griemvc_importacion ADD t_fec_checkpoint DATETIME NULL;
+GO
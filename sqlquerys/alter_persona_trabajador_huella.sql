@@ -0,0 +1,7 @@
+-- Huella de los datos importados desde el Excel de RR. HH. (modo upsert)
+USE GRiesgosDB;
+GO
+
+IF COL_LENGTH('dbo.griemvc_persona_trabajador', 'v_huella_registro') IS NULL
+    ALTER TABLE dbo.griemvc_persona_trabajador ADD v_huella_registro VARCHAR(16) NULL;
+GO
@@ -0,0 +1,34 @@
+-- Índices únicos sobre el nombre de los datos maestros que crea la importación del Excel de RR. HH.
+-- Impiden que dos importaciones concurrentes inserten el mismo nombre dos veces.
+USE GRiesgosDB;
+GO
+
+-- Nombres repetidos que hay que unificar antes de crear los índices (deben retornar vacío)
+SELECT 'grietbx_unidad' AS tabla, v_des_nombre, COUNT(*) AS cantidad
+FROM dbo.grietbx_unidad GROUP BY v_des_nombre HAVING COUNT(*) > 1
+UNION ALL
+SELECT 'grietbx_area', v_des_nombre, COUNT(*)
+FROM dbo.grietbx_area GROUP BY v_des_nombre HAVING COUNT(*) > 1
+UNION ALL
+SELECT 'grietbx_puesto', v_des_nombre, COUNT(*)
+FROM dbo.grietbx_puesto GROUP BY v_des_nombre HAVING COUNT(*) > 1
+UNION ALL
+SELECT 'grietbx_categoria', v_des_nombre, COUNT(*)
+FROM dbo.grietbx_categoria GROUP BY v_des_nombre HAVING COUNT(*) > 1;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ux_grietbx_unidad_v_des_nombre')
+    CREATE UNIQUE INDEX ux_grietbx_unidad_v_des_nombre ON dbo.grietbx_unidad (v_des_nombre);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ux_grietbx_area_v_des_nombre')
+    CREATE UNIQUE INDEX ux_grietbx_area_v_des_nombre ON dbo.grietbx_area (v_des_nombre);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ux_grietbx_puesto_v_des_nombre')
+    CREATE UNIQUE INDEX ux_grietbx_puesto_v_des_nombre ON dbo.grietbx_puesto (v_des_nombre);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ux_grietbx_categoria_v_des_nombre')
+    CREATE UNIQUE INDEX ux_grietbx_categoria_v_des_nombre ON dbo.grietbx_categoria (v_des_nombre);
+GO
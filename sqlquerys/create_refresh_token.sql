@@ -0,0 +1,27 @@
+-- Refresh tokens de la API: solo se guarda el SHA-256 de cada token
+USE GRiesgosDB;
+GO
+
+IF OBJECT_ID('dbo.griemvc_refresh_token', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.griemvc_refresh_token (
+        i_cod_refresh INT IDENTITY(1,1) PRIMARY KEY,
+        i_cod_login INT NOT NULL REFERENCES dbo.grietbc_persona_login (i_cod_login),
+        v_hash_token VARCHAR(64) NOT NULL UNIQUE,
+        v_cod_familia VARCHAR(32) NOT NULL,
+        t_fec_expira DATETIME NOT NULL,
+        t_fec_uso DATETIME NULL,
+        i_est_registro INT NULL DEFAULT 1,
+        v_usu_reg VARCHAR(50) NULL,
+        v_usu_mod VARCHAR(50) NULL,
+        t_fec_reg DATETIME NULL,
+        t_fec_mod DATETIME NULL,
+        v_host_reg VARCHAR(50) NULL,
+        v_host_mod VARCHAR(50) NULL,
+        v_ip_reg VARCHAR(50) NULL,
+        v_ip_mod VARCHAR(50) NULL
+    );
+    CREATE INDEX ix_griemvc_refresh_token_i_cod_login ON dbo.griemvc_refresh_token (i_cod_login);
+    CREATE INDEX ix_griemvc_refresh_token_v_cod_familia ON dbo.griemvc_refresh_token (v_cod_familia);
+END
+GO